@@ -0,0 +1,230 @@
+"""
+SQLite Classification Cache
+
+TransactionClassifier results are cached per pass (payee, category, classification)
+under the cache key built from the normalized description, payee and category. The
+cache used to be one JSON file rewritten in full after every miss; it is now a SQLite
+database with one row per (cache key, pass), so a lookup is an indexed read and a new
+result is a single INSERT. Writes are committed in batches (every
+CLASSIFIER_CACHE_COMMIT_EVERY results, and whenever flush() is called), and the
+database runs in WAL mode, so a crash loses at most the uncommitted tail instead of
+corrupting the whole cache.
+
+An existing transaction_cache.json next to the database is imported once on first open
+and renamed to transaction_cache.json.migrated.
+
+Keys start with the canonical description (see utils/description_key), so
+"AMZN MKTP US*2K1AB3" and "AMZN MKTP US*7Q9ZZ1" share one entry. When that recipe
+changes (KEY_VERSION), stored keys are rebuilt from their description, payee and
+category columns the next time the database is opened.
+
+Payee resolution depends only on the description, so high-confidence payee results are
+also published to a global cache shared by every client (PAYEE_CACHE_PATH, default
+data/cache/payee_cache.db; PAYEE_CACHE_DISABLED=1 turns it off).
+
+Usage:
+    from dataextractai.agents.classification_cache import ClassificationCache
+    cache = ClassificationCache("data/clients/acme/output/transaction_cache.db")
+    cache.put("amzn mktp us", "payee", {"payee": "Amazon", ...})
+    cache.get("amzn mktp us", "payee")
+    cache.flush()
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ..utils.description_key import KEY_VERSION, cache_key, canonical_description
+
+DEFAULT_COMMIT_EVERY = int(os.getenv("CLASSIFIER_CACHE_COMMIT_EVERY", "50"))
+DEFAULT_PAYEE_CACHE_PATH = os.getenv(
+    "PAYEE_CACHE_PATH", os.path.join("data", "cache", "payee_cache.db")
+)
+# Only results this certain are shared with other clients
+SHARED_PAYEE_CONFIDENCE = {"high"}
+# Number of "|"-joined key parts (description, payee, category) each pass uses
+PASS_KEY_PARTS = {"payee": 1, "category": 2, "classification": 3}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    cache_key TEXT NOT NULL,
+    pass_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    payee TEXT,
+    category TEXT,
+    result TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (cache_key, pass_type)
+);
+CREATE INDEX IF NOT EXISTS idx_results_description ON results (description);
+"""
+
+
+def payee_cache_key(description: str) -> str:
+    """Client-independent key for a description: its canonical form."""
+    return canonical_description(description)
+
+
+def split_cache_key(cache_key: str, pass_type: str) -> tuple:
+    """Split a cache key into (description, payee, category), padding with None."""
+    parts = cache_key.rsplit("|", PASS_KEY_PARTS.get(pass_type, 1) - 1)
+    parts += [None] * (3 - len(parts))
+    return tuple(parts[:3])
+
+
+class ClassificationCache:
+    """Per-pass transaction results stored in SQLite with batched commits."""
+
+    def __init__(
+        self,
+        db_path: str,
+        legacy_json_path: Optional[str] = None,
+        commit_every: int = None,
+    ):
+        self.db_path = db_path
+        self.commit_every = max(1, commit_every or DEFAULT_COMMIT_EVERY)
+        self._pending = 0
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # Several processes may share a cache file; wait for their write locks
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        if legacy_json_path and os.path.exists(legacy_json_path):
+            self.migrate_json(legacy_json_path)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+            self._rekey()
+
+    def get(self, cache_key: str, pass_type: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE cache_key = ? AND pass_type = ?",
+                (cache_key, pass_type),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def contains(self, cache_key: str, pass_type: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM results WHERE cache_key = ? AND pass_type = ?",
+                (cache_key, pass_type),
+            ).fetchone()
+        return row is not None
+
+    def put(self, cache_key: str, pass_type: str, result: Dict):
+        description, payee, category = split_cache_key(cache_key, pass_type)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    pass_type,
+                    description,
+                    payee,
+                    category,
+                    json.dumps(result),
+                    time.time(),
+                ),
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._commit()
+
+    def flush(self):
+        """Commit any buffered writes."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if self._pending:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _rekey(self):
+        """Rebuild stored keys with the current description_key recipe, once."""
+        rows = self._conn.execute(
+            "SELECT pass_type, description, payee, category, result, updated_at "
+            "FROM results ORDER BY updated_at DESC"
+        ).fetchall()
+        rekeyed = [
+            (
+                cache_key(description, payee, category),
+                pass_type,
+                canonical_description(description),
+                payee,
+                category,
+                result,
+                updated_at,
+            )
+            for pass_type, description, payee, category, result, updated_at in rows
+        ]
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+            # Rows are newest first, so the newest result wins a merged key
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rekeyed
+            )
+            self._conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+        if rows:
+            print(f"Re-keyed {len(rows)} cached results in {self.db_path}")
+
+    def migrate_json(self, json_path: str) -> int:
+        """
+        Import a legacy {cache_key: {pass_type: result}} JSON cache in one transaction,
+        then rename the file so it is not imported again. Returns the rows imported.
+        """
+        try:
+            with open(json_path, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not migrate classification cache {json_path}: {e}")
+            return 0
+        now = time.time()
+        rows = [
+            (key, pass_type, *split_cache_key(key, pass_type), json.dumps(result), now)
+            for key, passes in legacy.items()
+            if isinstance(passes, dict)
+            for pass_type, result in passes.items()
+        ]
+        with self._lock:
+            # Existing rows are newer than the legacy file; keep them
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        os.replace(json_path, json_path + ".migrated")
+        print(f"Migrated {len(rows)} cached results from {json_path}")
+        return len(rows)
+
+
+def payee_cache_disabled() -> bool:
+    return os.getenv("PAYEE_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+_payee_cache: Optional[ClassificationCache] = None
+_payee_cache_lock = threading.Lock()
+
+
+def get_payee_cache() -> Optional[ClassificationCache]:
+    """Return the process-wide cross-client payee cache, or None when disabled."""
+    global _payee_cache
+    if payee_cache_disabled():
+        return None
+    with _payee_cache_lock:
+        if _payee_cache is None:
+            _payee_cache = ClassificationCache(DEFAULT_PAYEE_CACHE_PATH)
+        return _payee_cache
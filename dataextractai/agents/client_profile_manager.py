@@ -3,9 +3,9 @@
 import os
 import json
 from typing import Dict, List, Optional
-from openai import OpenAI
 from dotenv import load_dotenv
 import logging
+from ..utils.llm_dispatcher import get_dispatcher
 
 load_dotenv()
 
@@ -23,7 +23,7 @@ class ClientProfileManager:
         self.client_name = client_name
         self.client_dir = os.path.join("data", "clients", client_name)
         self.profile_file = os.path.join(self.client_dir, "business_profile.json")
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.dispatcher = get_dispatcher()
 
     def create_or_update_profile(
         self,
@@ -88,7 +88,8 @@ Return the response as a JSON object with the following structure:
     "last_updated": "timestamp"
 }}"""
 
-        response = self.client.chat.completions.create(
+        response = self.dispatcher.call_sync(
+            "chat.completions.create",
             model=OPENAI_MODEL_PRECISE,  # Use precise model for profile enhancement
             messages=[
                 {
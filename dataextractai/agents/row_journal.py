@@ -0,0 +1,144 @@
+"""
+Row-Level Classification Journal
+
+TransactionClassifier used to be resumable only per pass: the pass files are written
+when a pass finishes for every row, so a crash near the end of a long pass lost the
+whole pass. Every row result is now also appended to a journal next to the pass files
+(<base_filename>_journal.jsonl, one JSON line per row and pass). Lines are flushed and
+fsync'ed in batches (every CLASSIFIER_JOURNAL_SYNC_EVERY results, at every pass
+checkpoint and on close), so a crash loses at most the unsynced tail.
+
+The first line records a fingerprint of the rows being classified (their descriptions
+and the model type). Re-running the same client and row range replays the journal:
+journaled results are applied without asking the LLM and work continues with the first
+row and pass missing from it. A journal whose fingerprint no longer matches, or one
+from a run that completed, is discarded. A torn last line from a crash is cut off on
+open.
+
+Usage:
+    from dataextractai.agents.row_journal import RowJournal
+    journal = RowJournal(path, fingerprint=RowJournal.fingerprint(descriptions, "fast"))
+    values = journal.get(row_idx, "payee")
+    if values is None:
+        values = classify(...)
+        journal.record(row_idx, "payee", values)
+    journal.close(completed=True)   # removes the journal once the run finished
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+DEFAULT_SYNC_EVERY = int(os.getenv("CLASSIFIER_JOURNAL_SYNC_EVERY", "20"))
+JOURNAL_FORMAT = 1
+
+
+class RowJournal:
+    """Append-only per-row, per-pass results with batched fsync."""
+
+    def __init__(self, path: str, fingerprint: str, sync_every: int = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.sync_every = max(1, sync_every or DEFAULT_SYNC_EVERY)
+        self._entries: Dict[tuple, Dict] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if not self._replay():
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(
+                    self._line({"format": JOURNAL_FORMAT, "fingerprint": fingerprint})
+                )
+                f.flush()
+                os.fsync(f.fileno())
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def fingerprint(descriptions: Iterable[str], model_type: str) -> str:
+        digest = hashlib.sha256(model_type.encode("utf-8"))
+        for description in descriptions:
+            digest.update(b"\0" + str(description).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _line(record: Dict) -> str:
+        return json.dumps(record, default=str) + "\n"
+
+    def _replay(self) -> bool:
+        """Load a matching journal, cutting off a torn tail. False if none is usable."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        good = 0
+        header = None
+        for raw in data.splitlines(keepends=True):
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            if header is None:
+                header = record
+                if (
+                    header.get("format") != JOURNAL_FORMAT
+                    or header.get("fingerprint") != self.fingerprint
+                ):
+                    print(f"\n[JOURNAL] Discarding stale journal {self.path}")
+                    return False
+            else:
+                self._entries[(record["row"], record["pass"])] = record["values"]
+            good += len(raw)
+        if header is None:
+            return False
+        if good < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        if self._entries:
+            print(
+                f"\n[JOURNAL] Replaying {len(self._entries)} row results from {self.path}"
+            )
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, row_idx: int, pass_type: str) -> Optional[Dict]:
+        return self._entries.get((row_idx, pass_type))
+
+    def contains(self, row_idx: int, pass_type: str) -> bool:
+        return (row_idx, pass_type) in self._entries
+
+    def record(self, row_idx: int, pass_type: str, values: Dict):
+        with self._lock:
+            self._entries[(row_idx, pass_type)] = values
+            self._file.write(
+                self._line({"row": row_idx, "pass": pass_type, "values": values})
+            )
+            self._pending += 1
+            if self._pending >= self.sync_every:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def sync(self):
+        """Make every recorded result durable."""
+        with self._lock:
+            self._sync()
+
+    def close(self, completed: bool = False):
+        """Sync and close; a completed run's journal is removed."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+        if completed:
+            os.remove(self.path)
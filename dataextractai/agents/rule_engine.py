@@ -0,0 +1,168 @@
+"""
+Deterministic Classification Rules
+
+Recurring merchants (payroll providers, utilities, SaaS subscriptions) make up a large
+share of rows and always resolve the same way, so TransactionClassifier matches them
+against compiled rules before any LLM pass. Each rule is a regex or a keyword list
+mapped to any of payee, category and classification; every field is resolved
+independently by the first matching rule that sets it, so one rule can name the payee
+while a broader one supplies the category. Only the fields no rule resolved are sent to
+the LLM.
+
+Matching is vectorized over the whole description column: one combined regex finds the
+rows any rule can match, then each rule's pattern runs (via pandas .str methods) only on
+those rows and only while a field it sets is still open. Patterns with capture groups
+(backreferences, named groups) are left out of the combined regex and matched on their
+own; a pattern that does not compile is logged and its rule skipped.
+
+Rules come from config.CLASSIFICATION_RULES plus optional per-client overrides in
+data/clients/<client>/classification_rules.yaml:
+
+    rules:
+      - name: landlord                    # client rules take precedence
+        keywords: ["ACME PROPERTIES"]
+        payee: "Acme Properties"
+        category: "Rent"
+        classification: "Business"
+      - name: dropbox                     # same name replaces the default rule
+        pattern: "\\bdropbox\\b"
+        payee: "Dropbox"
+        classification: "Personal"
+      - name: slack                       # disable a default rule
+        enabled: false
+
+Generic keyword lists (e.g. config.PERSONAL_EXPENSES) are not default rules: words such
+as "transfer" or "deposit" do not decide a classification for every client, so a client
+that wants them opts in with its own rule.
+
+Usage:
+    from dataextractai.agents.rule_engine import RuleEngine
+    engine = RuleEngine.for_client("acme")
+    matches = engine.match(df["description"])   # NaN where no rule applied
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+import yaml
+
+from ..utils.config import CLASSIFICATION_RULES
+
+RULE_FIELDS = ("payee", "category", "classification")
+
+
+class Rule:
+    """One compiled rule: a case-insensitive pattern and the fields it sets."""
+
+    def __init__(self, spec: Dict):
+        self.name = spec.get("name") or "unnamed"
+        if spec.get("pattern"):
+            pattern = spec["pattern"]
+        elif spec.get("keywords"):
+            # Whole-word keywords, so "mint" does not match "peppermint"
+            pattern = "|".join(
+                rf"(?<!\w){re.escape(k.lower())}(?!\w)" for k in spec["keywords"]
+            )
+        else:
+            raise ValueError(f"Rule {self.name} needs a pattern or keywords")
+        self.pattern = f"(?:{pattern})"
+        # Raises re.error for invalid patterns and for global inline flags such as
+        # "(?i)" that are only allowed at the start of the combined pattern
+        self.regex = re.compile(self.pattern, re.IGNORECASE)
+        self.values = {f: spec[f] for f in RULE_FIELDS if spec.get(f)}
+        if not self.values:
+            raise ValueError(f"Rule {self.name} sets none of {RULE_FIELDS}")
+
+
+class RuleEngine:
+    """Ordered rules matched column-wise against transaction descriptions."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        # Groups (backreferences, named groups) change meaning once patterns are
+        # joined, so such rules are matched on their own instead
+        combinable = [r for r in rules if r.regex.groups == 0]
+        self._standalone = [r for r in rules if r.regex.groups > 0]
+        self._any = None
+        if combinable:
+            try:
+                self._any = re.compile(
+                    "|".join(r.pattern for r in combinable), re.IGNORECASE
+                )
+            except re.error as e:
+                print(f"[WARN] Could not combine classification rules: {e}")
+                self._standalone = rules
+
+    @classmethod
+    def from_specs(cls, specs: List[Dict]) -> "RuleEngine":
+        rules = []
+        for spec in specs:
+            try:
+                rules.append(Rule(spec))
+            except (re.error, ValueError) as e:
+                print(f"[WARN] Skipping classification rule {spec.get('name')}: {e}")
+        return cls(rules)
+
+    @classmethod
+    def for_client(cls, client_name: Optional[str] = None) -> "RuleEngine":
+        """Default rules with the client's overrides placed first."""
+        client_specs = load_client_rules(client_name) if client_name else []
+        overridden = {s.get("name") for s in client_specs if s.get("name")}
+        specs = [s for s in client_specs if s.get("enabled", True)]
+        specs += [s for s in CLASSIFICATION_RULES if s["name"] not in overridden]
+        return cls.from_specs(specs)
+
+    def match(self, descriptions: pd.Series) -> pd.DataFrame:
+        """
+        Resolve rule fields for every description.
+
+        Returns:
+            DataFrame on the same index with payee/category/classification columns
+            (NaN where no rule applied) and <field>_rule columns naming the rule used.
+        """
+        columns = list(RULE_FIELDS) + [f"{f}_rule" for f in RULE_FIELDS]
+        result = pd.DataFrame(index=descriptions.index, columns=columns, dtype=object)
+        if not self.rules or descriptions.empty:
+            return result
+        text = descriptions.fillna("").astype(str)
+        mask = pd.Series(False, index=text.index)
+        if self._any is not None:
+            mask |= text.str.contains(self._any, regex=True)
+        for rule in self._standalone:
+            mask |= text.str.contains(rule.regex, regex=True)
+        candidates = text[mask]
+        for rule in self.rules:
+            if candidates.empty:
+                break
+            fields = list(rule.values)
+            needed = result.loc[candidates.index, fields].isna().any(axis=1)
+            subset = candidates[needed]
+            if subset.empty:
+                continue
+            hit = subset.index[subset.str.contains(rule.regex, regex=True)]
+            for field, value in rule.values.items():
+                rows = hit[result.loc[hit, field].isna()]
+                result.loc[rows, field] = value
+                result.loc[rows, f"{field}_rule"] = rule.name
+            # Rows with every field resolved need no further rules
+            resolved = (
+                result.loc[candidates.index, list(RULE_FIELDS)].notna().all(axis=1)
+            )
+            candidates = candidates[~resolved]
+        return result
+
+
+def load_client_rules(client_name: str) -> List[Dict]:
+    path = os.path.join("data", "clients", client_name, "classification_rules.yaml")
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            data = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"[WARN] Could not load classification rules from {path}: {e}")
+        return []
+    rules = data.get("rules", []) if isinstance(data, dict) else data
+    return [r for r in rules or [] if isinstance(r, dict)]
@@ -2,14 +2,17 @@
 
 import os
 import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, Optional, List
-from openai import OpenAI
 from dotenv import load_dotenv
+from ..utils.llm_dispatcher import get_dispatcher
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger("transaction_agents")
 
 # Model configurations
 MODELS = {
@@ -37,6 +40,10 @@ PERSONALITIES = {
 
 CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.8"))
 REVIEW_THRESHOLD = float(os.getenv("REVIEW_THRESHOLD", "0.6"))
+# Most of a client's transactions that may be escalated to the precise tier
+ESCALATION_BUDGET = float(os.getenv("CASCADE_ESCALATION_BUDGET", "0.3"))
+# Normalization and classification confidences further apart than this disagree
+CONFIDENCE_GAP = float(os.getenv("CASCADE_CONFIDENCE_GAP", "0.3"))
 
 
 class TransactionNormalizationAgent:
@@ -85,7 +92,8 @@ Return a JSON object with the following fields:
 - original_context: Key details from original
 - questions: Any questions about unclear elements"""
 
-        response = client.chat.completions.create(
+        response = get_dispatcher().call_sync(
+            "chat.completions.create",
             model=self.model,
             messages=[
                 {"role": "system", "content": self.system_prompt},
@@ -150,7 +158,8 @@ Return a JSON object with the following fields:
 - reasoning: Detailed explanation
 - questions: Any questions that would help clarify"""
 
-        response = client.chat.completions.create(
+        response = get_dispatcher().call_sync(
+            "chat.completions.create",
             model=self.model,
             messages=[
                 {"role": "system", "content": self.system_prompt},
@@ -164,59 +173,198 @@ Return a JSON object with the following fields:
         return result, confidence
 
 
+def _run_agents(
+    model_type: str, description: str, client_context: Dict
+) -> Tuple[Dict, Dict]:
+    """Run normalization then classification with one model tier."""
+    normalization = TransactionNormalizationAgent(model_type)
+    classification = BusinessClassificationAgent(model_type)
+
+    start = time.perf_counter()
+    norm_result, norm_conf = normalization.normalize_transaction(description)
+    class_result, class_conf = classification.classify_transaction(
+        norm_result, client_context
+    )
+
+    confidence = min(norm_conf, class_conf)
+    result = {
+        **norm_result,
+        **class_result,
+        "normalization_confidence": norm_conf,
+        "classification_confidence": class_conf,
+        "overall_confidence": confidence,
+        "needs_review": confidence < CONFIDENCE_THRESHOLD,
+        "model_type": model_type,
+        "latency": time.perf_counter() - start,
+    }
+    return result, class_result
+
+
+def escalation_reason(result: Dict) -> Optional[str]:
+    """Why a fast-tier result should be re-run on the precise tier, or None."""
+    if result["overall_confidence"] < CONFIDENCE_THRESHOLD:
+        return "low_confidence"
+    if result.get("classification") == "Needs Review":
+        return "needs_review"
+    if not result.get("payee") or not result.get("category"):
+        return "missing_fields"
+    gap = abs(result["normalization_confidence"] - result["classification_confidence"])
+    if gap > CONFIDENCE_GAP:
+        return "confidence_disagreement"
+    return None
+
+
+class CascadeRouter:
+    """
+    Routes transactions fast tier first and escalates to the precise tier only when
+    the fast result is unsure, within a per-client budget. Tracks the escalation
+    rate and the precise-tier time saved on rows that were not escalated.
+    """
+
+    def __init__(self, escalation_budget: float = None):
+        self.escalation_budget = (
+            ESCALATION_BUDGET if escalation_budget is None else escalation_budget
+        )
+        self._clients: Dict[str, Dict] = {}
+        self._precise_latency = 0.0
+        self._precise_runs = 0
+        self._lock = threading.Lock()
+
+    def _client(self, client_id: str) -> Dict:
+        return self._clients.setdefault(
+            client_id,
+            {"transactions": 0, "escalated": 0, "over_budget": 0, "reasons": {}},
+        )
+
+    def admit(self, client_id: str, reason: Optional[str]) -> bool:
+        """Count one fast-tier result; True if it may be escalated."""
+        with self._lock:
+            stats = self._client(client_id)
+            stats["transactions"] += 1
+            if reason is None:
+                return False
+            stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+            if stats["escalated"] >= self.escalation_budget * stats["transactions"]:
+                stats["over_budget"] += 1
+                return False
+            stats["escalated"] += 1
+            return True
+
+    def record_precise(self, latency: float):
+        with self._lock:
+            self._precise_latency += latency
+            self._precise_runs += 1
+
+    def stats(self, client_id: str = None) -> Dict:
+        """Escalation rate and estimated precise-tier seconds saved."""
+        with self._lock:
+            clients = (
+                [self._clients.get(client_id, {})]
+                if client_id
+                else list(self._clients.values())
+            )
+            transactions = sum(c.get("transactions", 0) for c in clients)
+            escalated = sum(c.get("escalated", 0) for c in clients)
+            over_budget = sum(c.get("over_budget", 0) for c in clients)
+            avg_precise = (
+                self._precise_latency / self._precise_runs
+                if self._precise_runs
+                else None
+            )
+        return {
+            "transactions": transactions,
+            "escalated": escalated,
+            "over_budget": over_budget,
+            "escalation_rate": (
+                round(escalated / transactions, 4) if transactions else 0.0
+            ),
+            "avg_precise_latency": avg_precise,
+            "latency_saved": (
+                round(avg_precise * (transactions - escalated), 2)
+                if avg_precise is not None
+                else None
+            ),
+        }
+
+    def log_summary(self):
+        for client_id in list(self._clients):
+            stats = self.stats(client_id)
+            logger.info(
+                f"[{client_id}] escalated {stats['escalated']}/{stats['transactions']} "
+                f"({stats['escalation_rate']:.1%}, {stats['over_budget']} over budget); "
+                f"precise-tier time saved: {stats['latency_saved']}s"
+            )
+
+
+_cascade_router: Optional[CascadeRouter] = None
+_cascade_router_lock = threading.Lock()
+
+
+def get_cascade_router() -> CascadeRouter:
+    """Return the process-wide cascade router."""
+    global _cascade_router
+    with _cascade_router_lock:
+        if _cascade_router is None:
+            _cascade_router = CascadeRouter()
+        return _cascade_router
+
+
 def process_transaction(
     description: str,
     client_context: Dict,
     model_type: str = "fast",
     use_precise_for_review: bool = True,
     compare_models: bool = False,
+    client_id: str = None,
+    router: CascadeRouter = None,
 ) -> Dict:
-    """Process a transaction through both agents with confidence scoring."""
+    """
+    Process a transaction through both agents with confidence scoring.
+
+    With model_type="fast" the fast tier runs first and the precise tier only when
+    the fast result has low confidence or inconsistent fields, and the client's
+    escalation budget allows it. compare_models=True still runs both tiers.
+    """
+    if compare_models:
+        return _compare_models(description, client_context)
+
+    if model_type != "fast":
+        result, _ = _run_agents(model_type, description, client_context)
+        result["precise_review_used"] = model_type == "precise"
+        return result
+
+    router = router or get_cascade_router()
+    client_id = client_id or client_context.get("client_name") or "default"
+    result, _ = _run_agents("fast", description, client_context)
+    reason = escalation_reason(result)
+    result["escalation_reason"] = reason
+    result["precise_review_used"] = False
+    # Count every fast-tier result, even when escalation is switched off
+    if not router.admit(client_id, reason if use_precise_for_review else None):
+        return result
+
+    precise, _ = _run_agents("precise", description, client_context)
+    router.record_precise(precise["latency"])
+    precise["escalation_reason"] = reason
+    precise["precise_review_used"] = True
+    precise["fast_result"] = result
+    return precise
+
+
+def _compare_models(description: str, client_context: Dict) -> Dict:
+    """Run both tiers on a transaction and report how they differ."""
     results = {}
 
-    # Process with fast model
-    fast_normalization = TransactionNormalizationAgent("fast")
-    fast_classification = BusinessClassificationAgent("fast")
-
-    fast_norm_result, fast_norm_conf = fast_normalization.normalize_transaction(
-        description
-    )
-    fast_class_result, fast_class_conf = fast_classification.classify_transaction(
-        fast_norm_result, client_context
-    )
-
-    fast_confidence = min(fast_norm_conf, fast_class_conf)
-    results["fast"] = {
-        **fast_norm_result,
-        **fast_class_result,
-        "overall_confidence": fast_confidence,
-        "needs_review": fast_confidence < CONFIDENCE_THRESHOLD,
-        "model_type": "fast",
-    }
-
-    # Process with precise model
-    precise_normalization = TransactionNormalizationAgent("precise")
-    precise_classification = BusinessClassificationAgent("precise")
-
-    precise_norm_result, precise_norm_conf = (
-        precise_normalization.normalize_transaction(description)
-    )
-    precise_class_result, precise_class_conf = (
-        precise_classification.classify_transaction(precise_norm_result, client_context)
-    )
-
-    precise_confidence = min(precise_norm_conf, precise_class_conf)
-    results["precise"] = {
-        **precise_norm_result,
-        **precise_class_result,
-        "overall_confidence": precise_confidence,
-        "needs_review": precise_confidence < CONFIDENCE_THRESHOLD,
-        "model_type": "precise",
-    }
-
-    # If not comparing models, return the appropriate result based on model_type
-    if not compare_models:
-        return results[model_type]
+    # The fast and precise chains are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fast_future = pool.submit(_run_agents, "fast", description, client_context)
+        precise_future = pool.submit(
+            _run_agents, "precise", description, client_context
+        )
+        results["fast"], fast_class_result = fast_future.result()
+        results["precise"], precise_class_result = precise_future.result()
+    fast_confidence = results["fast"]["overall_confidence"]
+    precise_confidence = results["precise"]["overall_confidence"]
 
     # Add comparison metadata
     results["comparison"] = {
@@ -8,13 +8,22 @@ This module implements the AI-based transaction classification system using a th
 
 The classifier uses the client's business profile for context and can suggest new categories
 when needed. It also provides reasoning for all classifications.
+
+With batch_size > 1 (or CLASSIFIER_BATCH_SIZE), each pass sends several transactions per
+request and validates every returned item on its own; only failed items are re-sent.
+With one transaction per request the passes run as a per-row pipeline instead: a row's
+category request starts as soon as its payee is known, and its classification as soon
+as its category is, with CLASSIFIER_STAGE_WORKERS rows in progress per pass.
 """
 
 import os
 import json
+import threading
+import time
 import pandas as pd
-from typing import Dict, List, Optional
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+from pydantic import ValidationError
 from ..utils.config import (
     ASSISTANTS_CONFIG,
     PROMPTS,
@@ -22,32 +31,249 @@ from ..utils.config import (
     CLASSIFICATIONS,
 )
 from .client_profile_manager import ClientProfileManager
+from .row_journal import RowJournal
+from .rule_engine import RuleEngine
+from .classification_cache import (
+    SHARED_PAYEE_CONFIDENCE,
+    ClassificationCache,
+    get_payee_cache,
+    payee_cache_key,
+)
+from ..utils.description_key import cache_key, cache_keys
+from ..utils.llm_dispatcher import get_dispatcher
+from ..utils.single_flight import SingleFlight
+from ..utils.table_store import write_table
 from ..models.ai_responses import (
     PayeeResponse,
     CategoryResponse,
     ClassificationResponse,
 )
 
+PAYEE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "payee": {
+            "type": "string",
+            "description": "The identified payee/merchant name",
+        },
+        "confidence": {
+            "type": "string",
+            "enum": ["high", "medium", "low"],
+            "description": "Confidence level in the identification",
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "Explanation of the identification",
+        },
+    },
+    "required": ["payee", "confidence", "reasoning"],
+    "additionalProperties": False,
+}
+
+CATEGORY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {
+            "type": "string",
+            "description": "The assigned category",
+        },
+        "confidence": {
+            "type": "string",
+            "enum": ["high", "medium", "low"],
+            "description": "Confidence level in the assignment",
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "Explanation of the assignment",
+        },
+        "suggested_new_category": {
+            "type": "string",
+            "description": "Suggested new category if needed",
+        },
+        "new_category_reasoning": {
+            "type": "string",
+            "description": "Explanation for the new category",
+        },
+    },
+    "required": [
+        "category",
+        "confidence",
+        "reasoning",
+        "suggested_new_category",
+        "new_category_reasoning",
+    ],
+    "additionalProperties": False,
+}
+
+CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "classification": {
+            "type": "string",
+            "enum": [
+                "Business",
+                "Personal",
+                "Mixed",
+                "Unclassified",
+            ],
+            "description": "The transaction classification (must be one of: Business, Personal, Mixed, or Unclassified)",
+        },
+        "confidence": {
+            "type": "string",
+            "enum": ["high", "medium", "low"],
+            "description": "Confidence level in the classification",
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "Explanation of the classification",
+        },
+        "tax_implications": {
+            "type": "string",
+            "description": "Tax implications of the classification",
+        },
+    },
+    "required": [
+        "classification",
+        "confidence",
+        "reasoning",
+        "tax_implications",
+    ],
+    "additionalProperties": False,
+}
+
+# Response model, per-item schema and schema name for each pass
+PASS_SPECS = {
+    "payee": (PayeeResponse, PAYEE_SCHEMA, "payee_response"),
+    "category": (CategoryResponse, CATEGORY_SCHEMA, "category_response"),
+    "classification": (
+        ClassificationResponse,
+        CLASSIFICATION_SCHEMA,
+        "classification_response",
+    ),
+}
+
+PASS_ORDER = ["payee", "category", "classification"]
+PASS_LABELS = {
+    "payee": "payees",
+    "category": "categories",
+    "classification": "classifications",
+}
+# Output column -> response field, per pass
+PASS_COLUMNS = {
+    "payee": {
+        "payee": "payee",
+        "payee_confidence": "confidence",
+        "payee_reasoning": "reasoning",
+    },
+    "category": {
+        "category": "category",
+        "category_confidence": "confidence",
+        "category_reasoning": "reasoning",
+        "suggested_new_category": "suggested_new_category",
+        "new_category_reasoning": "new_category_reasoning",
+    },
+    "classification": {
+        "classification": "classification",
+        "classification_confidence": "confidence",
+        "classification_reasoning": "reasoning",
+        "tax_implications": "tax_implications",
+    },
+}
+# Response fields stored in the cache, per pass
+PASS_FIELDS = {
+    pass_type: list(columns.values()) for pass_type, columns in PASS_COLUMNS.items()
+}
+# Checkpoint file suffix and log label written after each pass
+PASS_CHECKPOINTS = {
+    "payee": ("payee_pass", "payee pass"),
+    "category": ("category_pass", "category pass"),
+    "classification": ("final", "final"),
+}
+
+# Transactions sent per request in batched mode (1 = one request per row)
+DEFAULT_BATCH_SIZE = int(os.getenv("CLASSIFIER_BATCH_SIZE", "1"))
+# Rows in progress at once in each pass of the per-row pipeline (batch_size 1)
+DEFAULT_STAGE_WORKERS = int(os.getenv("CLASSIFIER_STAGE_WORKERS", "8"))
+# Times a batch re-sends items whose results were missing or invalid
+BATCH_MAX_RETRIES = 2
+
+BATCH_INSTRUCTIONS = """Apply the instructions above to EACH transaction listed below.
+Return a JSON object with a "results" array containing exactly one object per
+transaction. Each object must include the transaction's "id" exactly as given, plus
+the fields described above."""
+
+
+def batch_schema(item_schema: Dict) -> Dict:
+    """Wrap a single-result JSON schema into a schema for an array of id'd results."""
+    item = json.loads(json.dumps(item_schema))
+    item["properties"] = {
+        "id": {"type": "integer", "description": "The transaction id"},
+        **item["properties"],
+    }
+    item["required"] = ["id"] + item["required"]
+    return {
+        "type": "object",
+        "properties": {"results": {"type": "array", "items": item}},
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+
+
+def _load_json_output(response) -> Dict:
+    """Parse a structured-output response, tolerating markdown code fences."""
+    response_text = response.output_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+    return json.loads(response_text.strip())
+
+
+def _normalize_classification(result: Dict) -> Dict:
+    # Ensure classification is properly capitalized
+    result["classification"] = str(result.get("classification", "")).capitalize()
+    if result["classification"] not in ["Business", "Personal", "Mixed"]:
+        result["classification"] = "Unclassified"
+    return result
+
 
 class TransactionClassifier:
-    def __init__(self, client_name: str, model_type: str = "fast"):
+    def __init__(
+        self,
+        client_name: str,
+        model_type: str = "fast",
+        batch_size: Optional[int] = None,
+        stage_workers: Optional[int] = None,
+    ):
         """Initialize the transaction classifier.
 
         Args:
             client_name: Name of the client whose transactions to classify
             model_type: Type of model to use ("fast" or "precise")
+            batch_size: Transactions per LLM request in each pass (default:
+                CLASSIFIER_BATCH_SIZE env var, or 1 for one request per row)
+            stage_workers: Rows in progress at once in each pass of the per-row
+                pipeline (default: CLASSIFIER_STAGE_WORKERS env var, or 8)
         """
         self.client_name = client_name
-        self.client = OpenAI()
+        self.dispatcher = get_dispatcher()
         self.profile_manager = ClientProfileManager(client_name)
         self.business_profile = self.profile_manager._load_profile()
         self.model_type = model_type
-
-        # Initialize cache
-        self.cache_file = os.path.join(
-            "data", "clients", client_name, "output", "transaction_cache.json"
+        self.batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        self.stage_workers = max(1, stage_workers or DEFAULT_STAGE_WORKERS)
+        self.flights = SingleFlight()
+
+        # Initialize cache (imports a legacy transaction_cache.json on first use)
+        output_dir = os.path.join("data", "clients", client_name, "output")
+        self.cache_file = os.path.join(output_dir, "transaction_cache.db")
+        self.cache = ClassificationCache(
+            self.cache_file,
+            legacy_json_path=os.path.join(output_dir, "transaction_cache.json"),
         )
-        self.cache = self._load_cache()
+        # Payees resolved for any client, consulted before the LLM
+        self.payee_cache = get_payee_cache()
+        self.rule_engine = RuleEngine.for_client(client_name)
 
         # Use client's custom categories if available, otherwise use standard
         self.categories = (
@@ -59,63 +285,53 @@ class TransactionClassifier:
         # Get business context for AI prompts
         self.business_context = self._get_business_context()
 
-    def _load_cache(self) -> Dict:
-        """Load the transaction cache from file."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, "r") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading cache: {str(e)}")
-                return {}
-        return {}
-
-    def _save_cache(self) -> None:
-        """Save the transaction cache to file."""
-        try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, "w") as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            print(f"Error saving cache: {str(e)}")
-
     def _get_cache_key(
         self,
         description: str,
         payee: Optional[str] = None,
         category: Optional[str] = None,
     ) -> str:
-        """Generate a cache key for a transaction."""
-        # Normalize the description (remove extra spaces, convert to lowercase)
-        normalized_desc = " ".join(description.lower().split())
-
-        # Create a unique key based on the transaction details
-        key_parts = [normalized_desc]
-        if payee:
-            key_parts.append(payee.lower())
-        if category:
-            key_parts.append(category.lower())
-
-        return "|".join(key_parts)
+        """Generate a cache key for a transaction from its canonical description."""
+        return cache_key(description, payee, category)
 
     def _get_cached_result(self, cache_key: str, pass_type: str) -> Optional[Dict]:
         """Get a cached result for a transaction pass."""
-        if cache_key in self.cache and pass_type in self.cache[cache_key]:
+        result = self.cache.get(cache_key, pass_type)
+        if result is not None:
             print(
                 f"\n[CACHE HIT] Found cached {pass_type} result for transaction: {cache_key}"
             )
-            return self.cache[cache_key][pass_type]
-        return None
+            return result
+        if pass_type == "payee" and self.payee_cache is not None:
+            result = self.payee_cache.get(payee_cache_key(cache_key), "payee")
+            if result is not None:
+                print(f"\n[SHARED CACHE HIT] Found shared payee for: {cache_key}")
+                self.cache.put(cache_key, "payee", result)
+        return result
+
+    def _is_cached(self, cache_key: str, pass_type: str) -> bool:
+        """True when a pass result is available without calling the LLM."""
+        if self.cache.contains(cache_key, pass_type):
+            return True
+        return (
+            pass_type == "payee"
+            and self.payee_cache is not None
+            and self.payee_cache.contains(payee_cache_key(cache_key), "payee")
+        )
 
     def _cache_result(self, cache_key: str, pass_type: str, result: Dict) -> None:
         """Cache a result for a transaction pass."""
-        if cache_key not in self.cache:
-            self.cache[cache_key] = {}
-        self.cache[cache_key][pass_type] = result
+        self.cache.put(cache_key, pass_type, result)
         print(
             f"\n[CACHE MISS] Caching new {pass_type} result for transaction: {cache_key}"
         )
-        self._save_cache()
+        # Payees don't depend on the client, so confident ones are shared
+        if (
+            pass_type == "payee"
+            and self.payee_cache is not None
+            and result.get("confidence") in SHARED_PAYEE_CONFIDENCE
+        ):
+            self.payee_cache.put(payee_cache_key(cache_key), "payee", result)
 
     def _get_business_context(self) -> str:
         """Get formatted business context for AI prompts."""
@@ -157,11 +373,17 @@ class TransactionClassifier:
         end_row: Optional[int] = None,
         resume_from_pass: Optional[int] = None,
     ) -> pd.DataFrame:
-        """Process transactions one at a time through three passes:
+        """Process transactions through three passes (batch_size rows per request):
         1. Payee identification
         2. Category assignment
         3. Classification
 
+        With batch_size 1 each row flows through the passes on its own (see
+        _run_pipeline); batched passes run one after another. Either way a
+        checkpoint file is written as each pass completes for every row, and
+        every row result is journaled, so re-running the same rows after a crash
+        continues from the first row and pass that had not finished.
+
         Args:
             transactions_df: DataFrame containing transactions
             start_row: Optional starting row index (inclusive)
@@ -178,433 +400,559 @@ class TransactionClassifier:
             end_row = len(transactions_df)
 
         # Create output directory in client's folder
-        output_dir = os.path.join("data", "clients", self.client_name, "output")
+        output_dir = self._output_dir()
         os.makedirs(output_dir, exist_ok=True)
+        base_filename = self._base_filename(transactions_df, start_row, end_row)
+
+        # Initialize new columns if starting from beginning
+        if resume_from_pass is None or resume_from_pass == 1:
+            for columns in PASS_COLUMNS.values():
+                for column in columns:
+                    transactions_df[column] = None
+
+        # Resolve recurring merchants by rule; only the remaining fields go to the LLM
+        rows = range(start_row, end_row)
+        rule_matches = self.rule_engine.match(
+            transactions_df["description"].iloc[start_row:end_row]
+        ).set_axis(rows)
+        n_ruled = int(rule_matches["payee"].notna().sum())
+        print(f"\nRules resolved payees for {n_ruled}/{len(rows)} rows")
+
+        passes = PASS_ORDER[(resume_from_pass or 1) - 1 :]
+        # Row results of an interrupted run of the same rows are replayed from here
+        journal = RowJournal(
+            self.journal_path(transactions_df, start_row, end_row),
+            RowJournal.fingerprint(
+                transactions_df["description"].iloc[start_row:end_row],
+                self.model_type,
+            ),
+        )
+
+        def save_pass(pass_type: str) -> None:
+            journal.sync()
+            self._save_pass(pass_type, transactions_df, output_dir, base_filename)
+
+        completed = False
+        try:
+            if self.batch_size <= 1 and len(rows) > 0:
+                self._run_pipeline(
+                    transactions_df, rows, passes, rule_matches, save_pass, journal
+                )
+            else:
+                self._run_passes(
+                    transactions_df, rows, passes, rule_matches, save_pass, journal
+                )
+            completed = True
+        finally:
+            journal.close(completed=completed)
+
+        return transactions_df
 
-        # Generate output filename with row range
+    def _output_dir(self) -> str:
+        return os.path.join("data", "clients", self.client_name, "output")
+
+    def _base_filename(
+        self, transactions_df: pd.DataFrame, start_row: int, end_row: int
+    ) -> str:
+        """Output filename stem, with the row range when only some rows are run."""
         range_suffix = (
             f"_{start_row}-{end_row}"
             if start_row != 0 or end_row != len(transactions_df)
             else ""
         )
-        base_filename = f"{self.client_name}_classified_transactions{range_suffix}"
+        return f"{self.client_name}_classified_transactions{range_suffix}"
 
-        # Initialize new columns if starting from beginning
-        if resume_from_pass is None or resume_from_pass == 1:
-            transactions_df["payee"] = None
-            transactions_df["payee_confidence"] = None
-            transactions_df["payee_reasoning"] = None
-            transactions_df["category"] = None
-            transactions_df["category_confidence"] = None
-            transactions_df["category_reasoning"] = None
-            transactions_df["suggested_new_category"] = None
-            transactions_df["new_category_reasoning"] = None
-            transactions_df["classification"] = None
-            transactions_df["classification_confidence"] = None
-            transactions_df["classification_reasoning"] = None
-            transactions_df["tax_implications"] = None
-
-        # Pass 1: Process all payees
-        if resume_from_pass is None or resume_from_pass == 1:
-            print(f"\nPass 1: Processing payees for rows {start_row}-{end_row}...")
-            for row_idx in range(start_row, end_row):
-                print(f"\nProcessing transaction {row_idx + 1}/{end_row}...")
-                description = transactions_df.iloc[row_idx]["description"]
-                cache_key = self._get_cache_key(description)
+    def journal_path(
+        self,
+        transactions_df: pd.DataFrame,
+        start_row: Optional[int] = None,
+        end_row: Optional[int] = None,
+    ) -> str:
+        """Row journal of a run over these rows; it exists while one is unfinished."""
+        start_row = 0 if start_row is None else start_row
+        end_row = len(transactions_df) if end_row is None else end_row
+        return os.path.join(
+            self._output_dir(),
+            f"{self._base_filename(transactions_df, start_row, end_row)}_journal.jsonl",
+        )
 
-                try:
-                    # Check cache first
-                    cached_result = self._get_cached_result(cache_key, "payee")
-                    if cached_result:
-                        print("Using cached payee result")
-                        result = PayeeResponse(**cached_result)
-                    else:
-                        result = self._get_payee(description)
-                        # Cache the result
-                        self._cache_result(
-                            cache_key,
-                            "payee",
-                            {
-                                "payee": result.payee,
-                                "confidence": result.confidence,
-                                "reasoning": result.reasoning,
-                            },
-                        )
+    def _run_passes(
+        self,
+        transactions_df: pd.DataFrame,
+        rows: range,
+        passes: List[str],
+        rule_matches: pd.DataFrame,
+        save_pass: Callable[[str], None],
+        journal: RowJournal,
+    ) -> None:
+        """Run the passes one after another, each over every row.
+
+        Batched requests need a whole pass at a time, so batch_size > 1 runs here.
+        """
+        for pass_type in passes:
+            print(
+                f"\nPass {PASS_ORDER.index(pass_type) + 1}: Processing "
+                f"{PASS_LABELS[pass_type]} for rows {rows.start}-{rows.stop}..."
+            )
+            llm_rows = [
+                r
+                for r in self._llm_rows(pass_type, rule_matches, rows)
+                if not journal.contains(r, pass_type)
+            ]
+            prefetched = self._prefetch(pass_type, transactions_df, llm_rows)
+            for row_idx in rows:
+                print(f"\nProcessing transaction {row_idx + 1}/{rows.stop}...")
+                inputs = self._pass_inputs(pass_type, transactions_df.iloc[row_idx])
+                values = self._process_row(
+                    pass_type, row_idx, inputs, rule_matches, prefetched, journal
+                )
+                for column, value in values.items():
+                    transactions_df.at[row_idx, column] = value
+            save_pass(pass_type)
+
+    def _run_pipeline(
+        self,
+        transactions_df: pd.DataFrame,
+        rows: range,
+        passes: List[str],
+        rule_matches: pd.DataFrame,
+        save_pass: Callable[[str], None],
+        journal: RowJournal,
+    ) -> None:
+        """Run the passes as a per-row pipeline.
+
+        Each pass has its own pool of stage_workers threads. A row moves on to the
+        next pass as soon as its own result for the previous pass exists, so rows
+        are fully classified while others are still waiting on their payee. A
+        pass's checkpoint file is written once every row has finished that pass.
+        """
+        print(
+            f"\nPipelining {', '.join(PASS_LABELS[p] for p in passes)} for rows "
+            f"{rows.start}-{rows.stop} ({self.stage_workers} workers per pass)..."
+        )
+        lock = threading.Lock()
+        remaining = {pass_type: len(rows) for pass_type in passes}
+        finished = threading.Event()
+        errors: List[BaseException] = []
+        futures = []
+        started = time.perf_counter()
+        first_row_at = []
+        pools = {
+            pass_type: ThreadPoolExecutor(
+                max_workers=self.stage_workers, thread_name_prefix=pass_type
+            )
+            for pass_type in passes
+        }
 
-                    transactions_df.at[row_idx, "payee"] = result.payee
-                    transactions_df.at[row_idx, "payee_confidence"] = result.confidence
-                    transactions_df.at[row_idx, "payee_reasoning"] = result.reasoning
-                except Exception as e:
-                    print(f"Error processing payee for transaction {row_idx}: {str(e)}")
-                    transactions_df.at[row_idx, "payee"] = "Unknown Payee"
-                    transactions_df.at[row_idx, "payee_confidence"] = "low"
-                    transactions_df.at[row_idx, "payee_reasoning"] = (
-                        f"Error during processing: {str(e)}"
-                    )
-
-            # Save results after payee pass
-            payee_file = os.path.join(output_dir, f"{base_filename}_payee_pass.csv")
-            transactions_df.to_csv(payee_file, index=False)
-            print(f"\nSaved payee pass results to {payee_file}")
-
-        # Pass 2: Process all categories
-        if resume_from_pass is None or resume_from_pass <= 2:
-            print(f"\nPass 2: Processing categories for rows {start_row}-{end_row}...")
-            for row_idx in range(start_row, end_row):
-                print(f"\nProcessing transaction {row_idx + 1}/{end_row}...")
-                description = transactions_df.iloc[row_idx]["description"]
-                payee = transactions_df.iloc[row_idx]["payee"]
-                cache_key = self._get_cache_key(description, payee)
+        def submit(stage: int, row_idx: int, inputs: List[str]) -> None:
+            with lock:
+                if errors:
+                    return
+                futures.append(pools[passes[stage]].submit(run, stage, row_idx, inputs))
 
-                try:
-                    # Check cache first
-                    cached_result = self._get_cached_result(cache_key, "category")
-                    if cached_result:
-                        print("Using cached category result")
-                        result = CategoryResponse(**cached_result)
-                    else:
-                        result = self._get_category(description, payee)
-                        # Cache the result
-                        self._cache_result(
-                            cache_key,
-                            "category",
-                            {
-                                "category": result.category,
-                                "confidence": result.confidence,
-                                "reasoning": result.reasoning,
-                                "suggested_new_category": result.suggested_new_category,
-                                "new_category_reasoning": result.new_category_reasoning,
-                            },
-                        )
-
-                    transactions_df.at[row_idx, "category"] = result.category
-                    transactions_df.at[row_idx, "category_confidence"] = (
-                        result.confidence
-                    )
-                    transactions_df.at[row_idx, "category_reasoning"] = result.reasoning
-                    transactions_df.at[row_idx, "suggested_new_category"] = (
-                        result.suggested_new_category
-                    )
-                    transactions_df.at[row_idx, "new_category_reasoning"] = (
-                        result.new_category_reasoning
-                    )
-                except Exception as e:
-                    print(
-                        f"Error processing category for transaction {row_idx}: {str(e)}"
-                    )
-                    transactions_df.at[row_idx, "category"] = "Unclassified"
-                    transactions_df.at[row_idx, "category_confidence"] = "low"
-                    transactions_df.at[row_idx, "category_reasoning"] = (
-                        f"Error during processing: {str(e)}"
-                    )
-
-            # Save results after category pass
-            category_file = os.path.join(
-                output_dir, f"{base_filename}_category_pass.csv"
+        def run(stage: int, row_idx: int, inputs: List[str]) -> None:
+            # Any failure stops the pipeline; the caller re-raises it
+            try:
+                advance(stage, row_idx, inputs)
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+                finished.set()
+
+        def advance(stage: int, row_idx: int, inputs: List[str]) -> None:
+            pass_type = passes[stage]
+            values = self._process_row(
+                pass_type, row_idx, inputs, rule_matches, {}, journal
             )
-            transactions_df.to_csv(category_file, index=False)
-            print(f"\nSaved category pass results to {category_file}")
-
-        # Pass 3: Process all classifications
-        if resume_from_pass is None or resume_from_pass <= 3:
+            with lock:
+                for column, value in values.items():
+                    transactions_df.at[row_idx, column] = value
+                remaining[pass_type] -= 1
+                pass_done = remaining[pass_type] == 0
+                if stage == len(passes) - 1 and not first_row_at:
+                    first_row_at.append(time.perf_counter() - started)
+            print(f"[{pass_type}] transaction {row_idx + 1}/{rows.stop} done")
+            if stage + 1 < len(passes):
+                submit(stage + 1, row_idx, inputs + [values[pass_type]])
+            if pass_done:
+                with lock:
+                    try:
+                        save_pass(pass_type)
+                    except Exception as e:
+                        print(f"Error saving {pass_type} pass results: {str(e)}")
+                if stage == len(passes) - 1:
+                    finished.set()
+
+        # Read every row's inputs before any worker starts writing to the frame
+        seeds = [
+            (row_idx, self._pass_inputs(passes[0], transactions_df.iloc[row_idx]))
+            for row_idx in rows
+        ]
+        for row_idx, inputs in seeds:
+            submit(0, row_idx, inputs)
+        finished.wait()
+        if errors:
+            with lock:
+                for future in futures:
+                    future.cancel()
+        for pool in pools.values():
+            pool.shutdown()
+        if errors:
+            raise errors[0]
+        print(
+            f"\nPipeline: first row fully classified after {first_row_at[0]:.1f}s, "
+            f"all {len(rows)} rows after {time.perf_counter() - started:.1f}s"
+        )
+        flights = self.flights.stats()
+        if flights["coalesced"]:
             print(
-                f"\nPass 3: Processing classifications for rows {start_row}-{end_row}..."
+                f"Pipeline: {flights['coalesced']} duplicate requests joined one "
+                f"already in flight ({flights['calls']} sent)"
             )
-            for row_idx in range(start_row, end_row):
-                print(f"\nProcessing transaction {row_idx + 1}/{end_row}...")
-                description = transactions_df.iloc[row_idx]["description"]
-                payee = transactions_df.iloc[row_idx]["payee"]
-                category = transactions_df.iloc[row_idx]["category"]
-                cache_key = self._get_cache_key(description, payee, category)
 
-                try:
-                    # Check cache first
-                    cached_result = self._get_cached_result(cache_key, "classification")
-                    if cached_result:
-                        print("Using cached classification result")
-                        result = ClassificationResponse(**cached_result)
-                    else:
-                        result = self._get_classification(description, payee, category)
-                        # Cache the result
-                        self._cache_result(
-                            cache_key,
-                            "classification",
-                            {
-                                "classification": result.classification,
-                                "confidence": result.confidence,
-                                "reasoning": result.reasoning,
-                                "tax_implications": result.tax_implications,
-                            },
-                        )
-
-                    # Ensure classification is properly capitalized
-                    classification = result.classification.capitalize()
-                    if classification not in ["Business", "Personal", "Mixed"]:
-                        classification = "Unclassified"
-
-                    transactions_df.at[row_idx, "classification"] = classification
-                    transactions_df.at[row_idx, "classification_confidence"] = (
-                        result.confidence
-                    )
-                    transactions_df.at[row_idx, "classification_reasoning"] = (
-                        result.reasoning
-                    )
-                    transactions_df.at[row_idx, "tax_implications"] = (
-                        result.tax_implications
-                    )
-                except Exception as e:
-                    print(
-                        f"Error processing classification for transaction {row_idx}: {str(e)}"
-                    )
-                    transactions_df.at[row_idx, "classification"] = "Unclassified"
-                    transactions_df.at[row_idx, "classification_confidence"] = "low"
-                    transactions_df.at[row_idx, "classification_reasoning"] = (
-                        f"Error during processing: {str(e)}"
-                    )
-
-            # Save final results
-            final_file = os.path.join(output_dir, f"{base_filename}_final.csv")
-            transactions_df.to_csv(final_file, index=False)
-            print(f"\nSaved final results to {final_file}")
+    def _save_pass(
+        self,
+        pass_type: str,
+        transactions_df: pd.DataFrame,
+        output_dir: str,
+        base_filename: str,
+    ) -> None:
+        """Flush the caches and write a pass's checkpoint file."""
+        self.cache.flush()
+        if self.payee_cache is not None:
+            self.payee_cache.flush()
+        suffix, label = PASS_CHECKPOINTS[pass_type]
+        path = os.path.join(output_dir, f"{base_filename}_{suffix}.csv")
+        path = write_table(
+            transactions_df, path, export_csv=pass_type == PASS_ORDER[-1]
+        )
+        print(f"\nSaved {label} results to {path}")
 
-        return transactions_df
+    def _resolve(
+        self,
+        pass_type: str,
+        row_idx: int,
+        inputs: List[str],
+        rule_matches: pd.DataFrame,
+        prefetched: Dict,
+    ):
+        """Resolve one pass for a row: rules first, then the cache, then the LLM."""
+        result = self._rule_response(pass_type, rule_matches, row_idx)
+        if result is not None:
+            return result
+        cache_key = self._get_cache_key(*inputs)
+        cached_result = self._get_cached_result(cache_key, pass_type)
+        if cached_result:
+            print(f"Using cached {pass_type} result")
+            return PASS_SPECS[pass_type][0](**cached_result)
+        result = prefetched.pop(row_idx, None)
+        if result is not None:
+            self._cache_result(
+                cache_key,
+                pass_type,
+                {field: getattr(result, field) for field in PASS_FIELDS[pass_type]},
+            )
+            return result
+
+        def fetch():
+            # A flight for this key may have finished since the lookup above
+            cached_result = self.cache.get(cache_key, pass_type)
+            if cached_result:
+                return PASS_SPECS[pass_type][0](**cached_result)
+            result = self._get_single(pass_type, self._format_inputs(pass_type, inputs))
+            self._cache_result(
+                cache_key,
+                pass_type,
+                {field: getattr(result, field) for field in PASS_FIELDS[pass_type]},
+            )
+            return result
 
-    def _get_payee(self, description: str) -> PayeeResponse:
-        """Process a single description to identify payee."""
-        prompt = (
-            PROMPTS["get_payee"]
-            + f"\n\nBusiness Context:\n{self.business_context}\n\n"
-            + f"Process the following transaction:\n- {description}"
+        # Rows with the same key share one request while it is in flight
+        return self.flights.do((pass_type, cache_key), fetch)
+
+    def _process_row(
+        self,
+        pass_type: str,
+        row_idx: int,
+        inputs: List[str],
+        rule_matches: pd.DataFrame,
+        prefetched: Dict,
+        journal: Optional[RowJournal] = None,
+    ) -> Dict:
+        """Return the output column values of one pass for a row.
+
+        A result already in the journal is reused; a new one is journaled unless
+        it failed, so failed rows are retried when the run is resumed.
+        """
+        if journal is not None:
+            values = journal.get(row_idx, pass_type)
+            if values is not None:
+                return values
+        try:
+            result = self._resolve(pass_type, row_idx, inputs, rule_matches, prefetched)
+            values = {
+                column: getattr(result, field)
+                for column, field in PASS_COLUMNS[pass_type].items()
+            }
+            if pass_type == "classification":
+                # Ensure classification is properly capitalized
+                classification = values["classification"].capitalize()
+                if classification not in ["Business", "Personal", "Mixed"]:
+                    classification = "Unclassified"
+                values["classification"] = classification
+        except Exception as e:
+            print(f"Error processing {pass_type} for transaction {row_idx}: {str(e)}")
+            return {
+                pass_type: "Unknown Payee" if pass_type == "payee" else "Unclassified",
+                f"{pass_type}_confidence": "low",
+                f"{pass_type}_reasoning": f"Error during processing: {str(e)}",
+            }
+        if journal is not None:
+            journal.record(row_idx, pass_type, values)
+        return values
+
+    @staticmethod
+    def _llm_rows(pass_type: str, rule_matches: pd.DataFrame, rows: range) -> List[int]:
+        """Rows whose pass field no rule resolved."""
+        return [r for r in rows if pd.isna(rule_matches.at[r, pass_type])]
+
+    @staticmethod
+    def _rule_response(pass_type: str, rule_matches: pd.DataFrame, row_idx: int):
+        """Build a pass response from a matching rule, or None if no rule applied."""
+        value = rule_matches.at[row_idx, pass_type]
+        if pd.isna(value):
+            return None
+        reasoning = f"Matched rule '{rule_matches.at[row_idx, f'{pass_type}_rule']}'"
+        print(f"Using rule {pass_type} result")
+        if pass_type == "payee":
+            return PayeeResponse(payee=value, confidence="high", reasoning=reasoning)
+        if pass_type == "category":
+            return CategoryResponse(
+                category=value,
+                confidence="high",
+                reasoning=reasoning,
+                suggested_new_category=None,
+                new_category_reasoning=None,
+            )
+        return ClassificationResponse(
+            classification=value, confidence="high", reasoning=reasoning
         )
 
-        response = self.client.responses.create(
-            model=self._get_model(),
-            input=[
+    def _pass_inputs(self, pass_type: str, row) -> List[str]:
+        """Return the (description, payee, category) inputs a pass uses for a row."""
+        inputs = [row["description"]]
+        if pass_type in ("category", "classification"):
+            inputs.append(row["payee"])
+        if pass_type == "classification":
+            inputs.append(row["category"])
+        return inputs
+
+    def _format_transaction(self, pass_type: str, row) -> str:
+        """Format a row the same way the single-row prompts do."""
+        return self._format_inputs(pass_type, self._pass_inputs(pass_type, row))
+
+    @staticmethod
+    def _format_inputs(pass_type: str, inputs: List[str]) -> str:
+        if pass_type == "payee":
+            return f"{inputs[0]}"
+        if pass_type == "category":
+            return f"{inputs[0]} (Payee: {inputs[1]})"
+        return f"{inputs[0]} (Payee: {inputs[1]}, Category: {inputs[2]})"
+
+    def _request_kwargs(self, pass_type: str, prompt: str, batch: bool = False) -> Dict:
+        """Build responses.create arguments for a single-row or batched pass request."""
+        _, item_schema, schema_name = PASS_SPECS[pass_type]
+        return {
+            "model": self._get_model(),
+            "input": [
                 {
                     "role": "system",
                     "content": ASSISTANTS_CONFIG["AmeliaAI"]["instructions"],
                 },
                 {"role": "user", "content": prompt},
             ],
-            text={
+            "text": {
                 "format": {
                     "type": "json_schema",
-                    "name": "payee_response",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "payee": {
-                                "type": "string",
-                                "description": "The identified payee/merchant name",
-                            },
-                            "confidence": {
-                                "type": "string",
-                                "enum": ["high", "medium", "low"],
-                                "description": "Confidence level in the identification",
-                            },
-                            "reasoning": {
-                                "type": "string",
-                                "description": "Explanation of the identification",
-                            },
-                        },
-                        "required": ["payee", "confidence", "reasoning"],
-                        "additionalProperties": False,
-                    },
+                    "name": f"{schema_name}_batch" if batch else schema_name,
+                    "schema": batch_schema(item_schema) if batch else item_schema,
                     "strict": True,
                 }
             },
-        )
-
-        try:
-            response_text = response.output_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-            result = json.loads(response_text)
-            return PayeeResponse(**result)
-        except Exception as e:
-            print(f"Error parsing payee response: {str(e)}")
-            return PayeeResponse(
-                payee="Unknown Payee",
-                confidence="low",
-                reasoning=f"Error: {str(e)}",
-            )
+        }
 
-    def _get_category(self, description: str, payee: str) -> CategoryResponse:
-        """Process a single transaction to assign category."""
+    def _single_request(self, pass_type: str, transaction: str) -> Dict:
         prompt = (
-            PROMPTS["get_category"]
+            PROMPTS[f"get_{pass_type}"]
             + f"\n\nBusiness Context:\n{self.business_context}\n\n"
-            + f"Process the following transaction:\n- {description} (Payee: {payee})"
+            + f"Process the following transaction:\n- {transaction}"
         )
+        return self._request_kwargs(pass_type, prompt)
 
-        response = self.client.responses.create(
-            model=self._get_model(),
-            input=[
-                {
-                    "role": "system",
-                    "content": ASSISTANTS_CONFIG["AmeliaAI"]["instructions"],
-                },
-                {"role": "user", "content": prompt},
-            ],
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "category_response",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "category": {
-                                "type": "string",
-                                "description": "The assigned category",
-                            },
-                            "confidence": {
-                                "type": "string",
-                                "enum": ["high", "medium", "low"],
-                                "description": "Confidence level in the assignment",
-                            },
-                            "reasoning": {
-                                "type": "string",
-                                "description": "Explanation of the assignment",
-                            },
-                            "suggested_new_category": {
-                                "type": "string",
-                                "description": "Suggested new category if needed",
-                            },
-                            "new_category_reasoning": {
-                                "type": "string",
-                                "description": "Explanation for the new category",
-                            },
-                        },
-                        "required": [
-                            "category",
-                            "confidence",
-                            "reasoning",
-                            "suggested_new_category",
-                            "new_category_reasoning",
-                        ],
-                        "additionalProperties": False,
-                    },
-                    "strict": True,
-                }
-            },
+    def _batch_request(self, pass_type: str, transactions: Dict[int, str]) -> Dict:
+        lines = "\n".join(
+            f"- id {row_id}: {text}" for row_id, text in transactions.items()
+        )
+        prompt = (
+            PROMPTS[f"get_{pass_type}"]
+            + f"\n\nBusiness Context:\n{self.business_context}\n\n"
+            + BATCH_INSTRUCTIONS
+            + f"\n\nProcess the following transactions:\n{lines}"
         )
+        return self._request_kwargs(pass_type, prompt, batch=True)
 
-        try:
-            response_text = response.output_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-            result = json.loads(response_text)
-            return CategoryResponse(**result)
-        except Exception as e:
-            print(f"Error parsing category response: {str(e)}")
+    @staticmethod
+    def _fallback_response(pass_type: str, error: Exception):
+        if pass_type == "payee":
+            return PayeeResponse(
+                payee="Unknown Payee",
+                confidence="low",
+                reasoning=f"Error: {str(error)}",
+            )
+        if pass_type == "category":
             return CategoryResponse(
                 category="Unclassified",
                 confidence="low",
-                reasoning=f"Error: {str(e)}",
+                reasoning=f"Error: {str(error)}",
                 suggested_new_category=None,
                 new_category_reasoning=None,
             )
-
-    def _get_classification(
-        self, description: str, payee: str, category: str
-    ) -> ClassificationResponse:
-        """Process a single transaction to determine classification."""
-        prompt = (
-            PROMPTS["get_classification"]
-            + f"\n\nBusiness Context:\n{self.business_context}\n\n"
-            + f"Process the following transaction:\n- {description} (Payee: {payee}, Category: {category})"
-        )
-
-        response = self.client.responses.create(
-            model=self._get_model(),
-            input=[
-                {
-                    "role": "system",
-                    "content": ASSISTANTS_CONFIG["AmeliaAI"]["instructions"],
-                },
-                {"role": "user", "content": prompt},
-            ],
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "classification_response",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "classification": {
-                                "type": "string",
-                                "enum": [
-                                    "Business",
-                                    "Personal",
-                                    "Mixed",
-                                    "Unclassified",
-                                ],
-                                "description": "The transaction classification (must be one of: Business, Personal, Mixed, or Unclassified)",
-                            },
-                            "confidence": {
-                                "type": "string",
-                                "enum": ["high", "medium", "low"],
-                                "description": "Confidence level in the classification",
-                            },
-                            "reasoning": {
-                                "type": "string",
-                                "description": "Explanation of the classification",
-                            },
-                            "tax_implications": {
-                                "type": "string",
-                                "description": "Tax implications of the classification",
-                            },
-                        },
-                        "required": [
-                            "classification",
-                            "confidence",
-                            "reasoning",
-                            "tax_implications",
-                        ],
-                        "additionalProperties": False,
-                    },
-                    "strict": True,
-                }
-            },
+        return ClassificationResponse(
+            classification="Unclassified",
+            confidence="low",
+            reasoning=f"Error: {str(error)}",
+            tax_implications="Error during processing",
         )
 
+    def _parse_single(self, pass_type: str, response):
+        """Validate a single-row response, falling back to a low-confidence default."""
+        model = PASS_SPECS[pass_type][0]
         try:
-            response_text = response.output_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-            result = json.loads(response_text)
-            # Ensure classification is properly capitalized
-            result["classification"] = result["classification"].capitalize()
-            if result["classification"] not in ["Business", "Personal", "Mixed"]:
-                result["classification"] = "Unclassified"
-
-            return ClassificationResponse(**result)
+            result = _load_json_output(response)
+            if pass_type == "classification":
+                result = _normalize_classification(result)
+            return model(**result)
         except Exception as e:
-            print(f"Error parsing classification response: {str(e)}")
-            return ClassificationResponse(
-                classification="Unclassified",
-                confidence="low",
-                reasoning=f"Error: {str(e)}",
-                tax_implications="Error during processing",
+            print(f"Error parsing {pass_type} response: {str(e)}")
+            return self._fallback_response(pass_type, e)
+
+    def _parse_batch(self, pass_type: str, response, transactions: Dict[int, str]):
+        """Validate each item of a batched response.
+
+        Returns:
+            Dict mapping row id to a validated response model, for every item the
+            model returned correctly. Missing or invalid items are omitted.
+        """
+        model = PASS_SPECS[pass_type][0]
+        resolved = {}
+        for item in _load_json_output(response).get("results", []):
+            if not isinstance(item, dict):
+                continue
+            row_id = item.pop("id", None)
+            if row_id not in transactions or row_id in resolved:
+                continue
+            if pass_type == "classification":
+                item = _normalize_classification(item)
+            try:
+                resolved[row_id] = model(**item)
+            except ValidationError as e:
+                print(f"Invalid {pass_type} result for transaction {row_id}: {e}")
+        return resolved
+
+    def _prefetch(
+        self, pass_type: str, transactions_df: pd.DataFrame, rows: range
+    ) -> Dict:
+        """Resolve the uncached rows of a pass in batches through the dispatcher.
+
+        Rows sharing a cache key are requested once, batch_size at a time; items
+        whose result is missing or fails validation are re-queued (up to
+        BATCH_MAX_RETRIES times), and anything still unresolved is left to the
+        single-row request in the pass loop. With batch_size 1 rows run through
+        the pipeline instead, which makes its own single-row requests.
+
+        Returns:
+            Dict mapping row index to a validated response model.
+        """
+        # One request per unique cache key; its result is fanned out to every row
+        pending = {}
+        groups: Dict[str, List[int]] = {}
+        frame = transactions_df.iloc[list(rows)]
+        keys = cache_keys(
+            frame["description"],
+            frame["payee"] if pass_type != "payee" else None,
+            frame["category"] if pass_type == "classification" else None,
+        )
+        for row_idx, key in zip(rows, keys):
+            if key in groups:
+                groups[key].append(row_idx)
+                continue
+            if self._is_cached(key, pass_type):
+                continue
+            groups[key] = [row_idx]
+            pending[row_idx] = self._format_transaction(
+                pass_type, transactions_df.iloc[row_idx]
+            )
+        if not pending:
+            return {}
+        n_rows = sum(len(group) for group in groups.values())
+        if n_rows > len(pending):
+            print(
+                f"\n[{pass_type}] {n_rows} uncached rows share "
+                f"{len(pending)} unique transactions"
+            )
+        results = self._prefetch_unique(pass_type, pending)
+        for group in groups.values():
+            if group[0] in results:
+                for row_idx in group[1:]:
+                    results[row_idx] = results[group[0]]
+        return results
+
+    def _prefetch_unique(self, pass_type: str, pending: Dict[int, str]) -> Dict:
+        """Request results for {row index: formatted transaction} in batches."""
+        results = {}
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if not pending:
+                break
+            items = list(pending.items())
+            futures = {}
+            for i in range(0, len(items), self.batch_size):
+                chunk = dict(items[i : i + self.batch_size])
+                request = self._batch_request(pass_type, chunk)
+                futures[self.dispatcher.submit("responses.create", **request)] = chunk
+            print(
+                f"\n[BATCH] {pass_type}: sent {len(items)} transactions in "
+                f"{len(futures)} requests (attempt {attempt + 1})"
             )
+            failed = {}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    resolved = self._parse_batch(pass_type, future.result(), chunk)
+                except Exception as e:
+                    print(f"Error processing {pass_type} batch: {str(e)}")
+                    resolved = {}
+                results.update(resolved)
+                failed.update({k: v for k, v in chunk.items() if k not in resolved})
+            pending = failed
+        if pending:
+            print(
+                f"\n[BATCH] {len(pending)} {pass_type} results unresolved; "
+                "falling back to single-row requests"
+            )
+        return results
+
+    def _get_single(self, pass_type: str, transaction: str):
+        response = self.dispatcher.call_sync(
+            "responses.create", **self._single_request(pass_type, transaction)
+        )
+        return self._parse_single(pass_type, response)
 
     def test_structured_output(self) -> None:
         """Test that structured outputs are working correctly with a simple schema."""
         test_description = "Walmart Supercenter #1234 - Groceries"
 
-        response = self.client.responses.create(
+        response = self.dispatcher.call_sync(
+            "responses.create",
             model=self._get_model(),
             input=[
                 {
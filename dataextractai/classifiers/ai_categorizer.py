@@ -7,7 +7,6 @@ from time import sleep
 import re
 from typing import Optional
 import openai
-from openai import OpenAI
 from dataextractai.utils.config import (
     ASSISTANTS_CONFIG,
     CATEGORIES,
@@ -16,14 +15,13 @@ from dataextractai.utils.config import (
     PARSER_OUTPUT_PATHS,
     PROMPTS,
 )
+from dataextractai.utils.llm_dispatcher import get_dispatcher
 
 CLIENT_DIR = PARSER_INPUT_DIRS["client_info"]
 AMELIA_AI = ASSISTANTS_CONFIG["AmeliaAI"]
 DAVE_AI = ASSISTANTS_CONFIG["DaveAI"]
 GREG_AI = ASSISTANTS_CONFIG["GregAI"]
 
-client = OpenAI()
-
 
 def client_files(directory):
     """
@@ -116,7 +114,8 @@ def get_payee(ASSISTANT_CONFIG, desc):
 
     prompt = PROMPTS["get_payee"] + desc
 
-    response = client.chat.completions.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=ASSISTANT_CONFIG["model"],
         response_format={"type": "json_object"},
         messages=[
@@ -144,7 +143,8 @@ def get_category(ASSISTANT_CONFIG, desc):
 
     prompt = prompt + desc
 
-    response = client.chat.completions.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=ASSISTANT_CONFIG["model"],
         response_format={"type": "json_object"},
         messages=[
@@ -179,7 +179,8 @@ def get_classification(ASSISTANT_CONFIG, desc):
     # print(classify_prompt)
     #
 
-    response = client.chat.completions.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=ASSISTANT_CONFIG["model"],
         response_format={"type": "json_object"},
         messages=[
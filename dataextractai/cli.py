@@ -7,8 +7,15 @@ import glob
 import pandas as pd
 from io import StringIO
 from typing import Optional
-from .parsers.run_parsers import run_parsers
+from .parsers_core.autodiscover import autodiscover_parsers
+from .parsers_core.batch import (
+    DEFAULT_FILE_TIMEOUT,
+    detect_and_parse_files,
+    find_input_files,
+    output_to_records,
+)
 from .utils.transaction_normalizer import TransactionNormalizer
+from .utils.table_store import write_table
 from .agents.client_profile_manager import ClientProfileManager
 from .agents.transaction_classifier import TransactionClassifier
 import json
@@ -23,6 +30,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _client_dirs(client_name: str, config: dict) -> tuple:
+    """Client input and output directories, resolved like the other commands' paths."""
+    paths = get_current_paths({"client_name": client_name, **config})
+    input_dir = os.path.dirname(paths["input_dirs"]["client_info"])
+    output_dir = os.path.dirname(paths["output_paths"]["state"])
+    return input_dir, output_dir
+
+
 @click.group()
 def cli():
     """PDF extractor CLI."""
@@ -38,31 +53,70 @@ def cli():
     default=False,
     help="Dump raw extracted data for each statement file (default: False)",
 )
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Worker processes for parsing (default: number of CPUs)",
+)
+@click.option(
+    "--timeout",
+    type=int,
+    default=DEFAULT_FILE_TIMEOUT,
+    show_default=True,
+    help="Per-file parsing timeout in seconds",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse cached results for files parsed before (default: True)",
+)
 def parse(
     client_name: str,
     input_dir: Optional[str] = None,
     output_dir: Optional[str] = None,
     per_statement_raw: bool = False,
+    workers: Optional[int] = None,
+    timeout: int = DEFAULT_FILE_TIMEOUT,
+    cache: bool = True,
 ):
-    """Run parsers on PDF files. Optionally dump per-statement raw extracted data for debugging."""
+    """Run parsers on PDF and CSV files in parallel. Optionally dump per-statement raw extracted data for debugging."""
     try:
-        # Get client configuration
+        # Get client configuration and its default directories
         config = get_client_config(client_name)
+        default_input_dir, default_output_dir = _client_dirs(client_name, config)
+        input_dir = input_dir or default_input_dir
+        output_dir = output_dir or default_output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        autodiscover_parsers()
+        files = find_input_files(input_dir)
+        logger.info(f"Parsing {len(files)} files from {input_dir}")
+        results = detect_and_parse_files(
+            files, max_workers=workers, timeout=timeout, use_cache=cache
+        )
 
-        # Override paths if provided
-        if input_dir:
-            config["input_dir"] = input_dir
-        if output_dir:
-            config["output_dir"] = output_dir
-        # Ensure output_dir is always set
-        if "output_dir" not in config or not config["output_dir"]:
-            config["output_dir"] = "data/clients"
-
-        # Get current paths
-        paths = get_current_paths(config)
-
-        # Run parsers
-        run_parsers(client_name, config, dump_per_statement_raw=per_statement_raw)
+        # Group rows per parser into <parser>_output.csv for the normalize step
+        rows_by_parser = {}
+        for file_path, (parser_name, output) in zip(files, results):
+            for error in output.errors or []:
+                logger.error(f"{file_path}: {error}")
+            if parser_name is None:
+                continue
+            records = output_to_records(output, file_path)
+            rows_by_parser.setdefault(parser_name, []).extend(records)
+            if per_statement_raw:
+                raw_dir = os.path.join(output_dir, "raw_per_statement")
+                os.makedirs(raw_dir, exist_ok=True)
+                raw_name = os.path.splitext(os.path.basename(file_path))[0] + ".raw.csv"
+                pd.DataFrame(records).to_csv(
+                    os.path.join(raw_dir, raw_name), index=False
+                )
+        for parser_name, rows in rows_by_parser.items():
+            out_path = os.path.join(output_dir, f"{parser_name}_output.csv")
+            out_path = write_table(pd.DataFrame(rows), out_path)
+            logger.info(f"Wrote {len(rows)} rows to {out_path}")
         logger.info(f"Successfully processed PDF files for {client_name}")
 
     except Exception as e:
@@ -84,12 +138,18 @@ def parse(
     default=False,
     help="Print diagnostics after normalization: row counts, sample rows, and warnings if Django is using raw data. Also writes to diagnostics_summary.txt in the output directory.",
 )
+@click.option(
+    "--incremental/--full",
+    default=False,
+    help="Only normalize output files that are new or changed since the last run and merge them into the consolidated CSV (default: full rebuild)",
+)
 def normalize(
     client_name: str,
     input_dir: Optional[str] = None,
     output_dir: Optional[str] = None,
     per_statement: bool = True,
     diagnostics: bool = False,
+    incremental: bool = False,
 ):
     """Normalize and consolidate transaction data. Optionally dump per-statement normalized files. Use --diagnostics to print row counts, sample rows, and warnings. Also writes diagnostics to diagnostics_summary.txt."""
     try:
@@ -102,13 +162,11 @@ def normalize(
         if output_dir:
             config["output_dir"] = output_dir
         if "output_dir" not in config:
-            config["output_dir"] = os.path.join(
-                "data", "clients", client_name, "output"
-            )
+            config["output_dir"] = _client_dirs(client_name, config)[1]
 
         # Normalize transactions
         normalizer = TransactionNormalizer(
-            client_name, dump_per_statement=per_statement
+            client_name, dump_per_statement=per_statement, incremental=incremental
         )
         transactions_df = normalizer.normalize_transactions()
 
@@ -4,13 +4,13 @@ import questionary
 import click
 import os
 import json
-import pandas as pd
 from typing import Optional, List
 from .parsers.run_parsers import run_all_parsers
 from .utils.transaction_normalizer import TransactionNormalizer
 from .agents.client_profile_manager import ClientProfileManager
 from .agents.transaction_classifier import TransactionClassifier
 from .utils.config import get_client_config, get_current_paths
+from .utils.table_store import read_table, table_exists
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -199,14 +199,14 @@ def start_menu():
                     )
                 )
 
-                if not os.path.exists(normalized_file):
+                if not table_exists(normalized_file):
                     click.echo(
                         f"No normalized transactions found for client: {client_name}"
                     )
                     continue
 
                 # Read transactions
-                transactions_df = pd.read_csv(normalized_file)
+                transactions_df = read_table(normalized_file)
                 if transactions_df.empty:
                     click.echo(f"No transactions found in {normalized_file}")
                     continue
@@ -249,6 +249,12 @@ def start_menu():
                     client_name=client_name,
                     model_type=llm_mode,
                 )
+                if os.path.exists(
+                    classifier.journal_path(transactions_df, start_row, end_row)
+                ):
+                    click.echo(
+                        "Resuming an interrupted run of these rows from its journal"
+                    )
                 classified_df = classifier.process_transactions(
                     transactions_df,
                     start_row=start_row,
@@ -35,7 +35,7 @@ class CategoryResponse(BaseModel):
 class ClassificationResponse(BaseModel):
     """Response model for business/personal classification."""
 
-    classification: Literal["Business", "Personal", "Unclassified"] = Field(
+    classification: Literal["Business", "Personal", "Mixed", "Unclassified"] = Field(
         ..., description="Classification result"
     )
     confidence: Literal["high", "medium", "low"] = Field(
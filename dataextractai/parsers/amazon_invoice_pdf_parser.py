@@ -2,8 +2,8 @@ import re
 from typing import Optional, List
 from pathlib import Path
 from pydantic import BaseModel, Field
-import PyPDF2
 from dataextractai.parsers_core.base import BaseParser
+from dataextractai.parsers_core.document import DocumentText
 from dataextractai.parsers_core.models import (
     ParserOutput,
     TransactionRecord,
@@ -15,6 +15,12 @@ from dataextractai.parsers_core.registry import ParserRegistry
 class AmazonInvoicePDFParser(BaseParser):
     parser_name = "amazon_invoice_pdf"
     parser_version = "1.0"
+    # Markers are case-sensitive in can_parse, so index hits are verified
+    detection_signature = {
+        "file_types": [".pdf"],
+        "all_phrases": ["Final Details for Order", "Amazon.com order number"],
+        "verify": True,
+    }
 
     @staticmethod
     def to_iso_date(date_str: str) -> Optional[str]:
@@ -31,11 +37,10 @@ class AmazonInvoicePDFParser(BaseParser):
             return None
 
     @classmethod
-    def can_parse(cls, file_path: str, **kwargs) -> bool:
+    def can_parse(cls, file_path: str, document: DocumentText = None, **kwargs) -> bool:
         try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                text = reader.pages[0].extract_text() or ""
+            document = document or DocumentText.from_path(file_path)
+            text = document.page_text(0)
             return (
                 "Final Details for Order" in text and "Amazon.com order number" in text
             )
@@ -157,9 +162,7 @@ class AmazonInvoicePDFParser(BaseParser):
 
     @classmethod
     def parse_file(cls, file_path: str, **kwargs) -> ParserOutput:
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            text = "\n".join([p.extract_text() or "" for p in reader.pages])
+        text = DocumentText.from_path(file_path).text()
         # Extract top-level metadata
         order_placed_match = re.search(
             r"Order Placed: ([A-Za-z]+ \d{1,2}, \d{4})", text
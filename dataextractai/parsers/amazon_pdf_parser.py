@@ -2,6 +2,7 @@ import os
 import re
 from datetime import datetime
 from dataextractai.parsers_core.base import BaseParser
+from dataextractai.parsers_core.document import DocumentText
 from dataextractai.parsers_core.registry import ParserRegistry
 from dataextractai.parsers_core.models import (
     TransactionRecord,
@@ -10,7 +11,6 @@ from dataextractai.parsers_core.models import (
 )
 import math
 import numpy as np
-import PyPDF2
 
 
 class AmazonPDFParser(BaseParser):
@@ -21,15 +21,19 @@ class AmazonPDFParser(BaseParser):
     name = "amazon_pdf"
     description = "Parser for Amazon Orders PDF exports."
     file_types = [".pdf"]
+    # Markers are case-sensitive in can_parse, so index hits are verified
+    detection_signature = {
+        "file_types": [".pdf"],
+        "all_phrases": ["ORDER PLACED", "Amazon"],
+        "verify": True,
+    }
 
     @staticmethod
     def extract_text(input_path: str) -> str:
-        text = ""
-        with open(input_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        return "".join(
+            page_text + "\n"
+            for page_text in DocumentText.from_path(input_path).pages_text()
+        )
 
     @staticmethod
     def parse_amount(amount_str):
@@ -131,11 +135,10 @@ class AmazonPDFParser(BaseParser):
         return raw_data
 
     @classmethod
-    def can_parse(cls, file_path: str, **kwargs) -> bool:
+    def can_parse(cls, file_path: str, document: DocumentText = None, **kwargs) -> bool:
         try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                first_page_text = reader.pages[0].extract_text() or ""
+            document = document or DocumentText.from_path(file_path)
+            first_page_text = document.page_text(0)
             return ("ORDER PLACED" in first_page_text) and ("Amazon" in first_page_text)
         except Exception:
             return False
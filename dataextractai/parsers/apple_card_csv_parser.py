@@ -33,6 +33,10 @@ class AppleCardCSVParser(BaseParser):
     name = "apple_card_csv"
     description = "Parser for Apple Card CSV exports."
     file_types = [".csv"]
+    detection_signature = {
+        "file_types": [".csv"],
+        "headers": ["Transaction Date", "Clearing Date", "Description", "Amount (USD)"],
+    }
 
     @staticmethod
     def parse_amount(amount_str):
@@ -70,6 +70,19 @@ class CapitalOneCSVParser(BaseParser):
     name = "capitalone_csv"
     description = "Parser for CapitalOne credit card CSV transaction downloads."
     file_types = [".csv"]
+    detection_signature = {
+        "file_types": [".csv"],
+        "headers": [
+            "Transaction Date",
+            "Posted Date",
+            "Card No.",
+            "Description",
+            "Category",
+            "Debit",
+            "Credit",
+        ],
+        "exact_headers": True,
+    }
 
     REQUIRED_HEADERS = {
         "Transaction Date",
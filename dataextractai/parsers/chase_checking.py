@@ -22,9 +22,9 @@ ChaseChecking Parser: Statement date extraction pattern
 import os
 import re
 import pandas as pd
-from PyPDF2 import PdfReader
 from datetime import datetime
 from dataextractai.parsers_core.base import BaseParser
+from dataextractai.parsers_core.document import DocumentText
 from dataextractai.parsers_core.registry import ParserRegistry
 from dataextractai.utils.logger import get_logger
 from dataextractai.utils.utils import (
@@ -69,6 +69,12 @@ class ChaseCheckingParser(BaseParser):
         df = parser.normalize_data(raw)
     """
 
+    detection_signature = {
+        "file_types": [".pdf"],
+        "max_pages": 2,
+        "all_phrases": ["chase.com", "chase sapphire checking"],
+    }
+
     def parse_file(self, input_path: str, config=None):
         """
         Extract raw transaction data from a single PDF file and return a ParserOutput object.
@@ -78,7 +84,7 @@ class ChaseCheckingParser(BaseParser):
         original_filename = config.get("original_filename")
         meta = self.extract_metadata(input_path, original_filename=original_filename)
         statement_date = meta.get("statement_date")
-        pdf_reader = PdfReader(input_path)
+        page_texts = DocumentText.from_path(input_path).pages_text()
         transactions = []
         account_number = None
         date_re = re.compile(r"(\d{2}/\d{2})")
@@ -93,15 +99,13 @@ class ChaseCheckingParser(BaseParser):
 
         errors = []
         warnings = []
-        for page_num in range(len(pdf_reader.pages)):
-            text = pdf_reader.pages[page_num].extract_text()
+        for text in page_texts:
             if not account_number:
                 match = re.search(r"\b\d{12,}\b", text)
                 if match:
                     account_number = match.group(0)
-        for page_num in range(len(pdf_reader.pages)):
+        for page_num, text in enumerate(page_texts):
             try:
-                text = pdf_reader.pages[page_num].extract_text()
                 lines = text.split("\n")
                 clean_lines = [
                     l
@@ -273,15 +277,13 @@ class ChaseCheckingParser(BaseParser):
         return df
 
     @classmethod
-    def can_parse(cls, file_path: str, **kwargs) -> bool:
+    def can_parse(cls, file_path: str, document: DocumentText = None, **kwargs) -> bool:
         # Require both 'Chase.com' (or 'chase.com') and 'Chase Sapphire Checking' on first or second page
         try:
-            reader = PdfReader(file_path)
-            max_pages = min(2, len(reader.pages))
+            document = document or DocumentText.from_path(file_path)
             found_chase_com = False
             found_sapphire = False
-            for i in range(max_pages):
-                text = reader.pages[i].extract_text() or ""
+            for text in document.pages_text(max_pages=2):
                 text_lower = text.lower()
                 if "chase.com" in text_lower:
                     found_chase_com = True
@@ -374,9 +376,9 @@ class ChaseCheckingParser(BaseParser):
                     return None
             return None
 
-        reader = PdfReader(input_path)
-        first_page = reader.pages[0].extract_text()
-        all_text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        document = DocumentText.from_path(input_path)
+        first_page = document.page_text(0)
+        all_text = document.text()
         print(
             "\n[DEBUG] First page text (first 40 lines):\n"
             + "\n".join(first_page.split("\n")[:40])
@@ -396,7 +398,9 @@ class ChaseCheckingParser(BaseParser):
             # Use robust extraction from parser module
             statement_period_text = first_page
             # Try robust extraction for end date
-            robust_end = extract_statement_date_from_content(input_path)
+            robust_end = extract_statement_date_from_content(
+                input_path, document=document
+            )
             if robust_end:
                 period_end = robust_end
                 print(
@@ -20,6 +20,10 @@ class ChaseVisaCSVParser(BaseParser):
     name = "chase_visa_csv"
     description = "Parser for Chase Visa CSV exports."
     file_types = [".csv"]
+    detection_signature = {
+        "file_types": [".csv"],
+        "headers": ["Transaction Date", "Post Date", "Amount", "Description"],
+    }
 
     @staticmethod
     def parse_amount(amount_str):
@@ -12,11 +12,11 @@ python3 -m dataextractai.parsers.chase_visa
 import os
 import re
 import pandas as pd
-from PyPDF2 import PdfReader
 from datetime import datetime
 from typing import List, Dict, Any
 
 from ..parsers_core.base import BaseParser
+from ..parsers_core.document import DocumentText
 from ..parsers_core.registry import ParserRegistry
 from ..parsers_core.models import ParserOutput, TransactionRecord, StatementMetadata
 import argparse
@@ -27,7 +27,7 @@ class ChaseVisaParser(BaseParser):
     Parses Chase VISA PDF statements.
     """
 
-    def can_parse(self, file_path: str) -> bool:
+    def can_parse(self, file_path: str, document: DocumentText = None) -> bool:
         """
         Checks if the file is likely a Chase VISA PDF statement.
         A more robust implementation would check for specific keywords in the PDF.
@@ -42,16 +42,15 @@ class ChaseVisaParser(BaseParser):
         """
         Extracts transaction data from a Chase VISA PDF statement.
         """
-        pdf_reader = PdfReader(input_path)
+        page_texts = DocumentText.from_path(input_path).pages_text()
         transactions = []
         account_number = None
-        statement_date = self._extract_statement_date(pdf_reader)
+        statement_date = self._extract_statement_date(page_texts)
 
         date_re = re.compile(r"(\d{2}/\d{2})")
         number_re = re.compile(r"^-?[\d,]+\.\d{2}$")
 
-        for page in pdf_reader.pages:
-            text = page.extract_text() or ""
+        for text in page_texts:
             if not account_number:
                 account_number = self._extract_account_number(text)
 
@@ -119,10 +118,9 @@ class ChaseVisaParser(BaseParser):
             )
         return normalized_transactions
 
-    def _extract_statement_date(self, reader: PdfReader) -> str:
+    def _extract_statement_date(self, page_texts: List[str]) -> str:
         # A simplified date extraction
-        for page in reader.pages:
-            text = page.extract_text() or ""
+        for text in page_texts:
             match = re.search(r"Opening/Closing Date\s+[\d/]+\s+-\s+([\d/]+)", text)
             if match:
                 return datetime.strptime(match.group(1), "%m/%d/%y").strftime(
@@ -1,8 +1,8 @@
 import os
 import json
 import argparse
-import hashlib
 from dotenv import load_dotenv
+from dataextractai.parsers_core.document import compute_content_hash
 
 
 # Helper to robustly detect user data (with exclude/include terms)
@@ -141,16 +141,9 @@ def clean_extracted_fields(extracted_fields, label):
 
 
 def compute_file_hash(pdf_path):
-    BUF_SIZE = 65536
-    sha256 = hashlib.sha256()
+    # Same SHA-256 as the parse result cache keys, so hashes can be cross-referenced
     try:
-        with open(pdf_path, "rb") as f:
-            while True:
-                data = f.read(BUF_SIZE)
-                if not data:
-                    break
-                sha256.update(data)
-        return sha256.hexdigest()
+        return compute_content_hash(pdf_path)
     except Exception as e:
         print(f"[WARN] Could not compute file hash: {e}")
         return None
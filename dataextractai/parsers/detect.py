@@ -1,5 +1,6 @@
 import os
 from dataextractai.parsers_core.autodiscover import autodiscover_parsers
+from dataextractai.parsers_core.batch import detect_files
 from dataextractai.parsers_core.registry import ParserRegistry
 
 autodiscover_parsers()
@@ -13,11 +14,12 @@ def detect_parser_for_file(file_path):
     return ParserRegistry.detect_parser_for_file(file_path)
 
 
-def batch_detect_parsers(file_paths):
+def batch_detect_parsers(file_paths, max_workers=None):
     """
     Given a list of file paths, return a dict mapping each file to the detected parser name (or None).
+    Detection runs over a process pool (max_workers defaults to the CPU count).
     """
-    return ParserRegistry.batch_detect_parsers(file_paths)
+    return detect_files(file_paths, max_workers=max_workers)
 
 
 def _find_files_in_dir(directory, exts=(".pdf", ".csv")):
@@ -34,12 +36,15 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Detect the correct parser for files.")
     parser.add_argument("path", help="File or directory to scan")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
     args = parser.parse_args()
     path = args.path
     if os.path.isdir(path):
         files = _find_files_in_dir(path)
     else:
         files = [path]
-    results = batch_detect_parsers(files)
+    results = batch_detect_parsers(files, max_workers=args.workers)
     for fp, parser_name in results.items():
         print(f"{fp}: {parser_name}")
@@ -22,7 +22,6 @@ __description__ = (
 
 import os
 import re
-import pdfplumber
 import pandas as pd
 from datetime import datetime
 import logging
@@ -34,6 +33,8 @@ import numpy as np
 from typing import List, Dict, Any
 
 from dataextractai.parsers_core.base import BaseParser
+from dataextractai.parsers_core.batch import map_files
+from dataextractai.parsers_core.document import DocumentText, PDFPLUMBER
 from dataextractai.parsers_core.registry import ParserRegistry
 from dataextractai.parsers_core.models import (
     TransactionRecord,
@@ -612,46 +613,42 @@ def process_pdf(pdf_path):
     logger.info(f"Processing file: {pdf_path}")
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Extract text from all pages and combine
-            full_text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                logger.debug(f"Extracted text from page:\n{page_text}")
-                full_text += page_text + "\n"
-
-            # Extract statement information
-            statement_start_date, statement_end_date = extract_statement_date(full_text)
-            account_number = extract_account_number(full_text)
-
-            if not statement_start_date or not statement_end_date:
-                logger.error("Could not extract statement dates")
-                return []
-
-            if not account_number:
-                logger.warning("Could not extract account number")
-
-            # Extract different types of transactions
-            checks = extract_checks(full_text)
-            deposits = extract_deposits_credits(full_text)
-            withdrawals = extract_withdrawals_debits(full_text)
-
-            # Combine all transactions
-            all_transactions = []
-            all_transactions.extend(checks)
-            all_transactions.extend(deposits)
-            all_transactions.extend(withdrawals)
-
-            # Add statement information to each transaction
-            for transaction in all_transactions:
-                transaction["statement_start_date"] = statement_start_date
-                transaction["statement_end_date"] = statement_end_date
-                transaction["account_number"] = account_number
-                transaction["file_path"] = pdf_path
-
-            transactions = update_transaction_years(
-                all_transactions, statement_end_date
-            )
+        # Extract text from all pages and combine
+        full_text = ""
+        for page_text in DocumentText.from_path(pdf_path).pages_text(engine=PDFPLUMBER):
+            logger.debug(f"Extracted text from page:\n{page_text}")
+            full_text += page_text + "\n"
+
+        # Extract statement information
+        statement_start_date, statement_end_date = extract_statement_date(full_text)
+        account_number = extract_account_number(full_text)
+
+        if not statement_start_date or not statement_end_date:
+            logger.error("Could not extract statement dates")
+            return []
+
+        if not account_number:
+            logger.warning("Could not extract account number")
+
+        # Extract different types of transactions
+        checks = extract_checks(full_text)
+        deposits = extract_deposits_credits(full_text)
+        withdrawals = extract_withdrawals_debits(full_text)
+
+        # Combine all transactions
+        all_transactions = []
+        all_transactions.extend(checks)
+        all_transactions.extend(deposits)
+        all_transactions.extend(withdrawals)
+
+        # Add statement information to each transaction
+        for transaction in all_transactions:
+            transaction["statement_start_date"] = statement_start_date
+            transaction["statement_end_date"] = statement_end_date
+            transaction["account_number"] = account_number
+            transaction["file_path"] = pdf_path
+
+        transactions = update_transaction_years(all_transactions, statement_end_date)
 
     except Exception as e:
         logger.error(f"Error processing {pdf_path}: {e}")
@@ -660,27 +657,37 @@ def process_pdf(pdf_path):
     return transactions
 
 
-def process_all_pdfs(source_dir):
+def process_all_pdfs(source_dir, max_workers=None):
     """
     Process all PDFs in the source directory.
 
     Parameters:
     source_dir : str, the directory containing PDF files
+    max_workers : int, optional, worker processes (default: CPU count)
 
     Returns:
     list, a list of all transactions from all PDFs
     """
+    pdf_paths = [
+        os.path.join(source_dir, filename)
+        for filename in os.listdir(source_dir)
+        if filename.endswith(".pdf")
+    ]
+    logger.info(f"Processing {len(pdf_paths)} files from {source_dir}")
+
+    # Files are parsed in parallel; results keep directory listing order
     all_transactions = []
+    for transactions in map_files(
+        process_pdf, pdf_paths, on_error=_log_failed_pdf, max_workers=max_workers
+    ):
+        all_transactions.extend(transactions)
 
-    for filename in os.listdir(source_dir):
-        if filename.endswith(".pdf"):
-            pdf_path = os.path.join(source_dir, filename)
-            logger.info(f"Processing file: {filename}")
+    return all_transactions
 
-            transactions = process_pdf(pdf_path)
-            all_transactions.extend(transactions)
 
-    return all_transactions
+def _log_failed_pdf(pdf_path, message):
+    logger.error(f"Error processing {pdf_path}: {message}")
+    return []
 
 
 def _replace_nan_with_none(obj):
@@ -710,6 +717,11 @@ class FirstRepublicBankParser(BaseParser):
     description = (
         "Parser for First Republic Bank PDF statements. Extracts all transaction types."
     )
+    detection_signature = {
+        "file_types": [".pdf"],
+        "engine": PDFPLUMBER,
+        "all_phrases": ["firstrepublic.com"],
+    }
 
     def parse_file(self, input_path: str, config: dict = None) -> ParserOutput:
         """
@@ -717,8 +729,7 @@ class FirstRepublicBankParser(BaseParser):
         and returns a complete ParserOutput object.
         """
         try:
-            with pdfplumber.open(input_path) as pdf:
-                full_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+            full_text = DocumentText.from_path(input_path).text(engine=PDFPLUMBER)
         except Exception as e:
             return ParserOutput(errors=[f"Failed to read PDF {input_path}: {e}"])
 
@@ -886,10 +897,10 @@ class FirstRepublicBankParser(BaseParser):
             return None
 
     @classmethod
-    def can_parse(cls, file_path: str, **kwargs) -> bool:
+    def can_parse(cls, file_path: str, document: DocumentText = None, **kwargs) -> bool:
         try:
-            with pdfplumber.open(file_path) as pdf:
-                text = pdf.pages[0].extract_text() or ""
+            document = document or DocumentText.from_path(file_path)
+            text = document.page_text(0, engine=PDFPLUMBER)
             return "firstrepublic.com" in text.lower()
         except Exception:
             return False
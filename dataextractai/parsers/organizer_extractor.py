@@ -4,10 +4,10 @@ from typing import List, Dict, Any, Optional, Tuple
 from PyPDF2 import PdfReader, PdfWriter
 from pdf2image import convert_from_path
 from PIL import Image
+import fitz  # PyMuPDF
 import pytesseract
 from dotenv import load_dotenv
 import openai
-from openai import OpenAI
 import base64
 from rapidfuzz import fuzz, process
 from pydantic import BaseModel, RootModel
@@ -17,7 +17,18 @@ import datetime
 import shutil
 from logging.handlers import RotatingFileHandler
 import sys
+import threading
 from dataextractai.utils.ai import extract_structured_data_from_image
+from dataextractai.utils.llm_dispatcher import get_dispatcher
+from dataextractai.utils.page_scheduler import map_pages
+from dataextractai.parsers.prefilled_prefilter import (
+    TemplateStore,
+    detect_vendor,
+    score_page,
+)
+from dataextractai.utils.pdf_render import page_count, render_crop_png, render_pages
+from dataextractai.utils.stage_graph import StageGraph, artifact_digest
+from dataextractai.utils.vision_cache import get_vision_cache
 import re
 
 
@@ -182,7 +193,7 @@ class OrganizerExtractor:
     ------------------
     1. **TOC Extraction**: Extracts the PDF bookmarks (TOC) and resolves each entry to its page number.
     2. **Page Splitting**: Splits the PDF into single-page PDFs, saving each as `page_{N}.pdf` in the output directory.
-    3. **Thumbnail Generation**: Generates high-resolution PNG thumbnails for each page as `thumb_{N}.png`.
+    3. **Thumbnail Generation**: Renders each page as a small `thumb_{N}.png` (thumbnail_dpi) and a `page_{N}.png` (image_dpi) used for field crops.
     4. **TOC Inventory**: Links each TOC entry to its page and thumbnail, saving the inventory as `toc_inventory.json`.
     5. **Topic Index Extraction**:
        - Locates the Topic Index page visually.
@@ -209,6 +220,7 @@ class OrganizerExtractor:
     - `topic_index_merged.json`: Merged Topic Index and TOC (exact match).
     - `topic_index_merged_fuzzy.json`: Merged Topic Index and TOC (fuzzy match).
     - `topic_index_merged_llm.json`: **Final merged output** (LLM schema-based, recommended for integration).
+    - `stage_cache.json`: Memoized pipeline stages (keyed by PDF hash and stage config); delete it, or set STAGE_CACHE_DISABLED=1, to force a full re-run.
 
     Usage Example:
     --------------
@@ -220,11 +232,30 @@ class OrganizerExtractor:
     See the __main__ block for a full demo pipeline.
     """
 
-    def __init__(self, pdf_path: str, output_dir: str, thumbnail_dpi: int = 200):
+    def __init__(
+        self,
+        pdf_path: str,
+        output_dir: str,
+        thumbnail_dpi: int = 50,
+        image_dpi: int = 200,
+        save_label_crops: bool = False,
+        page_workers: int = None,
+    ):
         self.pdf_path = pdf_path
         self.output_dir = output_dir
+        # Thumbnails are for display; page images feed the label/field crops
         self.thumbnail_dpi = thumbnail_dpi
+        self.image_dpi = image_dpi
+        # Pages whose vision calls run at once (default ORGANIZER_PAGE_WORKERS)
+        self.page_workers = page_workers
+        # Label crops go to the vision call as in-memory PNGs; keep copies on disk
+        # (label_narrow/wide_page_N.png) only when debugging
+        self.save_label_crops = save_label_crops or os.getenv(
+            "ORGANIZER_SAVE_LABEL_CROPS", ""
+        ).lower() in ("1", "true", "yes")
         os.makedirs(self.output_dir, exist_ok=True)
+        # Memoized stage graphs by config path (see stage_graph())
+        self._stage_graphs = {}
         self.errors = []
         self.warnings = []
         load_dotenv()
@@ -271,13 +302,17 @@ class OrganizerExtractor:
             self.errors.append(f"TOC extraction failed: {e}")
         return toc
 
-    def split_pages(self) -> List[Dict[str, Any]]:
+    def split_pages(self, page_numbers=None) -> List[Dict[str, Any]]:
+        """Write page_N.pdf for every page, or only the given 1-based page_numbers."""
         pages_info = []
         try:
             reader = PdfReader(self.pdf_path)
-            for i, page in enumerate(reader.pages):
+            if page_numbers is None:
+                page_numbers = range(1, len(reader.pages) + 1)
+            for page_number in page_numbers:
+                i = page_number - 1
                 writer = PdfWriter()
-                writer.add_page(page)
+                writer.add_page(reader.pages[i])
                 page_pdf_path = os.path.join(self.output_dir, f"page_{i+1}.pdf")
                 with open(page_pdf_path, "wb") as f:
                     writer.write(f)
@@ -293,15 +328,22 @@ class OrganizerExtractor:
         return pages_info
 
     def generate_thumbnails_and_images(self, pages_info: List[Dict[str, Any]]):
+        """
+        Render thumb_N.png at thumbnail_dpi and page_N.png at image_dpi, one page at
+        a time across a worker pool. Images already newer than the PDF are reused.
+        """
         try:
-            images = convert_from_path(self.pdf_path, dpi=self.thumbnail_dpi)
-            for i, image in enumerate(images):
-                thumb_path = os.path.join(self.output_dir, f"thumb_{i+1}.png")
-                png_path = os.path.join(self.output_dir, f"page_{i+1}.png")
-                image.save(thumb_path, "PNG")
-                image.save(png_path, "PNG")
-                pages_info[i]["thumbnail_path"] = thumb_path
-                pages_info[i]["png_path"] = png_path
+            rendered = render_pages(
+                self.pdf_path,
+                self.output_dir,
+                {"thumb": self.thumbnail_dpi, "page": self.image_dpi},
+                page_numbers=[p["page_number"] for p in pages_info],
+                skip_existing=True,
+            )
+            for page in pages_info:
+                paths = rendered[page["page_number"]]
+                page["thumbnail_path"] = paths["thumb"]
+                page["png_path"] = paths["page"]
         except Exception as e:
             self.warnings.append(f"Thumbnail/image generation failed: {e}")
 
@@ -309,13 +351,14 @@ class OrganizerExtractor:
         from PyPDF2 import PdfReader
 
         reader = PdfReader(self.pdf_path)
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text() or ""
+        for page in pages_info:
+            i = page["page_number"] - 1
+            text = reader.pages[i].extract_text() or ""
             fname = f"page_{i+1}.txt"
             fpath = os.path.join(self.output_dir, fname)
             with open(fpath, "w") as f:
                 f.write(text)
-            pages_info[i]["raw_text_file"] = fpath
+            page["raw_text_file"] = fpath
         logging.info(f"Extracted raw text for {len(pages_info)} pages.")
 
     def write_toc_inventory(self, toc, path=None):
@@ -335,31 +378,15 @@ class OrganizerExtractor:
         - Run the all-fields manifest extraction (with LLM/vision extraction)
         - Always produce both a raw manifest (all_fields_manifest.json) and a cleaned manifest (all_fields_manifest_cleaned.json) in the output directory
         - Return the cleaned manifest path as part of the result
+        Stages already cached in output_dir for this PDF and config are reused.
 
         Usage:
             extractor = OrganizerExtractor(pdf_path, output_dir)
             result = extractor.extract()
             print("Cleaned manifest at:", result["cleaned_manifest_path"])
         """
-        toc = self.extract_toc()
-        pages_info = self.split_pages()
-        self.generate_thumbnails_and_images(pages_info)
-        self.extract_raw_text_per_page(pages_info)
-        # Link TOC entries to page and thumbnail paths
-        for entry in toc:
-            page_num = entry.get("page_number")
-            if page_num:
-                entry["pdf_path"] = os.path.join(
-                    self.output_dir, f"page_{page_num}.pdf"
-                )
-                entry["thumbnail_path"] = os.path.join(
-                    self.output_dir, f"thumb_{page_num}.png"
-                )
-            else:
-                entry["pdf_path"] = None
-                entry["thumbnail_path"] = None
-        # Write valid JSON TOC inventory
-        self.write_toc_inventory(toc)
+        toc = self.stage_graph().run("toc")
+        pages_info = self.pages_info()
         # --- Always run the all-fields manifest extraction and cleaning step ---
         manifest_result = self.extract_all_fields_manifest()
         cleaned_manifest_path = os.path.join(
@@ -484,53 +511,58 @@ class OrganizerExtractor:
             "The description is the text to the right of the form code. "
             "Return the result as a JSON array."
         )
-        merged_pairs = []
-        client = OpenAI(api_key=self.openai_api_key)
+        # Submit every column at once; results are merged back in column order
+        dispatcher = get_dispatcher()
+        futures = []
         for col_path in col_paths:
             with open(col_path, "rb") as img_file:
                 img_bytes = img_file.read()
-                img_b64 = base64.b64encode(img_bytes).decode("utf-8")
-                image_content = {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{img_b64}"},
-                }
-                try:
-                    response = client.chat.completions.create(
-                        model=self.openai_model_ocr,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a helpful assistant that extracts structured data from images.",
-                            },
-                            {
-                                "role": "user",
-                                "content": [
-                                    {"type": "text", "text": prompt},
-                                    image_content,
-                                ],
-                            },
+            img_b64 = base64.b64encode(img_bytes).decode("utf-8")
+            image_content = {
+                "type": "image_url",
+                "image_url": {"url": f"data:image/png;base64,{img_b64}"},
+            }
+            future = dispatcher.submit(
+                "chat.completions.create",
+                model=self.openai_model_ocr,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a helpful assistant that extracts structured data from images.",
+                    },
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            image_content,
                         ],
-                        max_tokens=1024,
-                        temperature=0.0,
-                    )
-                    import re
-                    import ast
+                    },
+                ],
+                max_tokens=1024,
+                temperature=0.0,
+            )
+            futures.append((col_path, future))
+        merged_pairs = []
+        for col_path, future in futures:
+            try:
+                response = future.result()
+                import ast
 
-                    content = response.choices[0].message.content
-                    match = re.search(r"\[.*?\]", content, re.DOTALL)
-                    if match:
+                content = response.choices[0].message.content
+                match = re.search(r"\[.*?\]", content, re.DOTALL)
+                if match:
+                    try:
+                        pairs = json.loads(match.group(0))
+                    except Exception:
                         try:
-                            pairs = json.loads(match.group(0))
+                            pairs = ast.literal_eval(match.group(0))
                         except Exception:
-                            try:
-                                pairs = ast.literal_eval(match.group(0))
-                            except Exception:
-                                pairs = []
-                    else:
-                        pairs = []
-                    merged_pairs.extend(pairs)
-                except Exception as e:
-                    self.errors.append(f"Vision API call failed for {col_path}: {e}")
+                            pairs = []
+                else:
+                    pairs = []
+                merged_pairs.extend(pairs)
+            except Exception as e:
+                self.errors.append(f"Vision API call failed for {col_path}: {e}")
         if save_json:
             save_path = os.path.join(self.output_dir, "topic_index_pairs_vision.json")
             with open(save_path, "w") as f:
@@ -662,13 +694,11 @@ class OrganizerExtractor:
         Use GPT-4o to match each {form_code, description} to the best TOC entry (title/page/pdf_path/thumbnail_path).
         Save the merged result as topic_index_merged_llm.json.
         """
-        import openai
         import os
         import json
         from dotenv import load_dotenv
 
         load_dotenv()
-        api_key = os.getenv("OPENAI_API_KEY")
         model = os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
         if topic_index_path is None:
             topic_index_path = os.path.join(
@@ -686,8 +716,8 @@ class OrganizerExtractor:
             "If no good match, leave page_number/pdf_path/thumbnail_path/matched_title as null. "
             f"\n\nTopic Index:\n{json.dumps(topic_index)}\n\nTOC Inventory:\n{json.dumps(toc)}"
         )
-        client = openai.OpenAI(api_key=api_key)
-        completion = client.chat.completions.parse(
+        completion = get_dispatcher().call_sync(
+            "chat.completions.parse",
             model=model,
             messages=[{"role": "user", "content": prompt}],
             response_format=MergedList,
@@ -772,485 +802,675 @@ class OrganizerExtractor:
                 json.dump(output, f, indent=2)
         return output
 
-    def extract_all_fields_manifest(self, config_path=None, page_numbers=None):
+    def _extract_page_label(self, pdf_doc, page_number, label_crop, wide_label_crop):
         """
-        Robustly extract all fields for each page using fallback logic:
-        1. Try narrow crop (Vision LLM)
-        2. If no config match, try wide crop (Vision LLM)
-        3. If still no match, try raw PDF text (for special pages)
-        For standard forms, map label through gold standard to get form ID.
-        For special pages, match unique phrases in raw text.
-        Log which fallback was used.
-        Only process the specified page_numbers if provided.
-        Handles split-column (Form 1) logic for correct extraction.
-        Supports config-driven prompt_override and unique_search_key for robust fallback.
+        Vision-extract a page's form label from the narrow label crop, falling back
+        to the wide crop. Returns label, label_source, crop_used and crop_img_path;
+        errors lists vision calls that failed (such results are not cached).
         """
-        import json
-        from dataextractai.utils.ai import extract_structured_data_from_image
-        from PIL import Image
-        import os
-
-        # Always extract raw text for all pages before processing
-        print("[DEBUG] Extracting raw PDF text for all pages...")
-        self.extract_raw_text_per_page(self.split_pages())
-        print("[DEBUG] Raw PDF text extraction complete.")
-
-        # Load config
-        if config_path is None:
-            config_path = os.path.join(
-                os.path.dirname(__file__), "special_page_configs.json"
-            )
-        with open(config_path, "r") as f:
-            config = json.load(f)
-        default_fields = config.get("default", {})
-        label_crop = default_fields.get("Form_Label", {}).get("crop")
-        # Use Wide_Form_Label if present
-        wide_label_crop = None
-        if config["default"].get("Wide_Form_Label"):
-            wide_label_crop = config["default"]["Wide_Form_Label"]["crop"]
-        pages_info = self.split_pages()
-        self.generate_thumbnails_and_images(pages_info)
-        self.extract_raw_text_per_page(pages_info)
-        # Now filter pages_info if page_numbers is provided
-        if page_numbers is not None:
-            page_numbers_set = set(page_numbers)
-            pages_info = [p for p in pages_info if p["page_number"] in page_numbers_set]
-        manifest = []
-        for page in pages_info:
-            print(
-                f"[DEBUG] Page {page['page_number']}: initial state: label=None, label_source=None, extraction_method=None"
-            )
-            extracted_fields = (
-                {}
-            )  # Always initialize at the top of the loop to avoid NameError
-            page_number = page["page_number"]
-            page_image_path = page.get("png_path") or page.get("thumbnail_file")
-            if not page_image_path:
-                print(
-                    f"[WARNING] Page {page_number}: No 'png_path' or 'thumbnail_file' found in page dict. Skipping image-based extraction for this page."
-                )
-            raw_text = page.get("raw_text", "")
-            label = None
-            label_source = None
-            crop_used = None
-            crop_img_path = None
-            wide_crop_img_path = None
-            config_key = None
-            prompt_override = None
-            extraction_method = None  # <-- New field for user-friendly provenance
-            # 1. Try default (narrow) crop
-            if label_crop:
-                img = Image.open(page_image_path)
-                w, h = img.size
-                left = int(label_crop["left"] * w)
-                right = int(label_crop["right"] * w)
-                top = int(label_crop["top"] * h)
-                bottom = int(label_crop["bottom"] * h)
-                crop_img = img.crop((left, top, right, bottom))
+        print(
+            f"[DEBUG] Page {page_number}: initial state: label=None, label_source=None, extraction_method=None"
+        )
+        label = None
+        label_source = None
+        crop_used = None
+        crop_img_path = None
+        wide_crop_img_path = None
+        errors = []
+        # 1. Try default (narrow) crop
+        if label_crop:
+            crop_png = render_crop_png(pdf_doc, page_number, label_crop, self.image_dpi)
+            if self.save_label_crops:
                 crop_img_path = os.path.join(
                     self.output_dir, f"label_narrow_page_{page_number}.png"
                 )
-                crop_img.save(crop_img_path)
-                try:
-                    result = extract_structured_data_from_image(
-                        crop_img_path, "Extract the Form_Label from this region."
-                    )
-                    label = result.get("Form_Label") or str(result)
-                    print(f"[DEBUG] Page {page_number}: label set to: {label}")
-                    if label and label.strip():
-                        label_source = "Form_Label (narrow)"
-                        crop_used = "Form_Label"
-                    else:
-                        label = None
-                except Exception as e:
-                    print(
-                        f"[LABEL EXTRACTION] Vision LLM (narrow) failed for page {page_number}: {e}"
-                    )
-            # 2. If not found, try wide crop if available
-            if (not label or not label.strip()) and wide_label_crop:
-                left = int(wide_label_crop["left"] * w)
-                right = int(wide_label_crop["right"] * w)
-                top = int(wide_label_crop["top"] * h)
-                bottom = int(wide_label_crop["bottom"] * h)
-                wide_crop_img = img.crop((left, top, right, bottom))
+                with open(crop_img_path, "wb") as f:
+                    f.write(crop_png)
+            try:
+                result = extract_structured_data_from_image(
+                    crop_png, "Extract the Form_Label from this region."
+                )
+                label = result.get("Form_Label") or str(result)
+                print(f"[DEBUG] Page {page_number}: label set to: {label}")
+                if label and label.strip():
+                    label_source = "Form_Label (narrow)"
+                    crop_used = "Form_Label"
+                else:
+                    label = None
+            except Exception as e:
+                print(
+                    f"[LABEL EXTRACTION] Vision LLM (narrow) failed for page {page_number}: {e}"
+                )
+                errors.append(f"narrow: {e}")
+        # 2. If not found, try wide crop if available
+        if (not label or not label.strip()) and wide_label_crop:
+            wide_crop_png = render_crop_png(
+                pdf_doc, page_number, wide_label_crop, self.image_dpi
+            )
+            if self.save_label_crops:
                 wide_crop_img_path = os.path.join(
                     self.output_dir, f"label_wide_page_{page_number}.png"
                 )
-                wide_crop_img.save(wide_crop_img_path)
-                try:
-                    result = extract_structured_data_from_image(
-                        wide_crop_img_path, "Extract the Form_Label from this region."
-                    )
-                    # PATCH: Use Wide_Form_Label if present, else Form_Label, else fallback
-                    if isinstance(result, dict):
-                        if result.get("Wide_Form_Label"):
-                            label = result["Wide_Form_Label"]
-                        elif result.get("Form_Label"):
-                            label = result["Form_Label"]
-                        else:
-                            label = str(result)
+                with open(wide_crop_img_path, "wb") as f:
+                    f.write(wide_crop_png)
+            try:
+                result = extract_structured_data_from_image(
+                    wide_crop_png, "Extract the Form_Label from this region."
+                )
+                # PATCH: Use Wide_Form_Label if present, else Form_Label, else fallback
+                if isinstance(result, dict):
+                    if result.get("Wide_Form_Label"):
+                        label = result["Wide_Form_Label"]
+                    elif result.get("Form_Label"):
+                        label = result["Form_Label"]
                     else:
                         label = str(result)
-                    if label and label.strip():
-                        label_source = "Wide_Form_Label (wide)"
-                        crop_used = "Wide_Form_Label"
-                    else:
-                        label = None
-                except Exception as e:
+                else:
+                    label = str(result)
+                if label and label.strip():
+                    label_source = "Wide_Form_Label (wide)"
+                    crop_used = "Wide_Form_Label"
+                else:
+                    label = None
+            except Exception as e:
+                print(
+                    f"[LABEL EXTRACTION] Vision LLM (wide) failed for page {page_number}: {e}"
+                )
+                errors.append(f"wide: {e}")
+        return {
+            "label": label,
+            "label_source": label_source,
+            "crop_used": crop_used,
+            "crop_img_path": crop_img_path,
+            "wide_crop_img_path": wide_crop_img_path,
+            "errors": errors,
+        }
+
+    def _extract_page_fields(self, page, label_info, config):
+        """
+        Resolve a page's config key (vision label, else unique_search_key in the raw
+        text) and extract its fields. Returns the page's all_fields_manifest.json entry.
+        """
+        default_fields = config.get("default", {})
+        extracted_fields = {}  # Always initialize per page to avoid NameError
+        page_number = page["page_number"]
+        page_image_path = page.get("png_path") or page.get("thumbnail_file")
+        if not page_image_path:
+            print(
+                f"[WARNING] Page {page_number}: No 'png_path' or 'thumbnail_file' found in page dict. Skipping image-based extraction for this page."
+            )
+        raw_text = page.get("raw_text", "")
+        label = label_info["label"]
+        label_source = label_info["label_source"]
+        crop_used = label_info["crop_used"]
+        crop_img_path = label_info["crop_img_path"]
+        config_key = None
+        prompt_override = None
+        extraction_method = None  # <-- New field for user-friendly provenance
+        # 3. If still not found, scan raw text for unique_search_key from config
+        print(
+            f"[DEBUG] Page {page_number}: label before fallback check: {label!r} (type: {type(label)})"
+        )
+        # PATCH: Always run search key fallback if label is None, empty, or not a valid config key
+        if not label or not str(label).strip() or str(label).strip() not in config:
+            print(
+                f"[DEBUG] Page {page_number}: Entering search key fallback block (label: {label!r})"
+            )
+            # Try all config sections with unique_search_key
+            raw_text_path = os.path.join(self.output_dir, f"page_{page_number}.txt")
+            raw_text = ""
+            if os.path.exists(raw_text_path):
+                with open(raw_text_path, "r") as f:
+                    raw_text = f.read()
+            # Normalize raw text for matching
+            raw_text_normalized = (
+                raw_text.replace("\n", "").replace("\r", "").strip().lower()
+            )
+            for key, entry in config.items():
+                if isinstance(entry, dict) and entry.get("unique_search_key"):
+                    search_key = (
+                        entry["unique_search_key"]
+                        .replace("\n", "")
+                        .replace("\r", "")
+                        .strip()
+                        .lower()
+                    )
                     print(
-                        f"[LABEL EXTRACTION] Vision LLM (wide) failed for page {page_number}: {e}"
+                        f"[DEBUG] Page {page_number}: Comparing search_key '{search_key}' to raw_text_normalized (first 200 chars): '{raw_text_normalized[:200]}'"
                     )
-            # 3. If still not found, scan raw text for unique_search_key from config
+                    if search_key in raw_text_normalized:
+                        config_key = key
+                        prompt_override = entry.get("prompt_override")
+                        print(
+                            f"[DEBUG] Page {page_number}: unique_search_key '{entry['unique_search_key']}' matched in raw text. Using config_key: {config_key}"
+                        )
+                        extraction_method = "Text Only"  # Fallback to text search
+                        break
+                    else:
+                        print(
+                            f"[DEBUG] Page {page_number}: unique_search_key '{entry['unique_search_key']}' NOT found in raw text."
+                        )
+            # If still not set, mark as config fallback
+            if extraction_method is None:
+                extraction_method = "Config Fallback"
+        # After search key fallback, inject label and label_source if config_key was found and label is empty/garbage
+        garbage_labels = [None, "", "{}", "None", "{'Form_Label': ''"]
+        if is_garbage_label(label) and config_key:
+            label = config_key
+            label_source = "config_fallback"
+        # 4. Use 'Title' for display, but config_key for lookup
+        # PATCH: For special pages (config_key set), use config_key and its Title for manifest
+        if config_key:
+            manifest_label = config_key
+            manifest_title = config.get(config_key, {}).get("Title") or config_key
+        else:
+            manifest_label = label
+            manifest_title = config.get(label, {}).get("Title") or label
+        # Log which crop was used
+        print(
+            f"[INFO] Page {page_number}: Label extracted using {label_source} ({crop_used} crop): {label}"
+        )
+        print(
+            f"[DEBUG] Page {page_number}: config_key={config_key}, form_code={manifest_label}, manifest_title={manifest_title}"
+        )
+        # Determine form_code: prefer label if in config, else use config_key, else default
+        form_code = None
+        if label and label in config:
+            form_code = label
+            prompt_override = (
+                config[label].get("prompt_override")
+                if config[label].get("prompt_override")
+                else prompt_override
+            )
+        elif config_key:
+            form_code = config_key
+        page_config = (
+            config.get(form_code)
+            if form_code and form_code in config
+            else default_fields
+        )
+        if page_config is default_fields:
             print(
-                f"[DEBUG] Page {page_number}: label before fallback check: {label!r} (type: {type(label)})"
+                f"[DEBUG] Page {page_number}: Falling back to default_fields for extraction."
             )
-            # PATCH: Always run search key fallback if label is None, empty, or not a valid config key
-            if not label or not str(label).strip() or str(label).strip() not in config:
-                print(
-                    f"[DEBUG] Page {page_number}: Entering search key fallback block (label: {label!r})"
+        print(
+            f"[DEBUG] Page {page_number}: Fields to process: {list(page_config.keys())}"
+        )
+        # Field crops still work from the rendered page image; opening it only
+        # reads the header, pixels are decoded on the first crop
+        if page_image_path:
+            img = Image.open(page_image_path)
+            w, h = img.size
+        for field, field_info in page_config.items():
+            # Only process fields where field_info is a dict and has a 'method' key
+            if not isinstance(field_info, dict) or "method" not in field_info:
+                continue
+            method = field_info.get("method")
+            split_column = field_info.get("split_column", False)
+            crop_left = field_info.get("crop_left")
+            crop_right = field_info.get("crop_right")
+            crop = field_info.get("crop")
+            field_prompt_override = field_info.get("prompt_override") or prompt_override
+            # --- Special handling for Cover and Signature pages: full page extraction ---
+            if form_code in ("Cover_Sheet", "Signature_Page") and field == "Full_Page":
+                from PIL import Image
+
+                img = Image.open(page_image_path)
+                full_img_path = os.path.join(
+                    self.output_dir, f"full_page_{page_number}.png"
                 )
-                # Try all config sections with unique_search_key
+                img.save(full_img_path)
+                # Try to load raw PDF text for this page
                 raw_text_path = os.path.join(self.output_dir, f"page_{page_number}.txt")
                 raw_text = ""
                 if os.path.exists(raw_text_path):
                     with open(raw_text_path, "r") as f:
                         raw_text = f.read()
-                # Normalize raw text for matching
-                raw_text_normalized = (
-                    raw_text.replace("\n", "").replace("\r", "").strip().lower()
-                )
-                for key, entry in config.items():
-                    if isinstance(entry, dict) and entry.get("unique_search_key"):
-                        search_key = (
-                            entry["unique_search_key"]
-                            .replace("\n", "")
-                            .replace("\r", "")
-                            .strip()
-                            .lower()
-                        )
-                        print(
-                            f"[DEBUG] Page {page_number}: Comparing search_key '{search_key}' to raw_text_normalized (first 200 chars): '{raw_text_normalized[:200]}'"
-                        )
-                        if search_key in raw_text_normalized:
-                            config_key = key
-                            prompt_override = entry.get("prompt_override")
-                            print(
-                                f"[DEBUG] Page {page_number}: unique_search_key '{entry['unique_search_key']}' matched in raw text. Using config_key: {config_key}"
-                            )
-                            extraction_method = "Text Only"  # Fallback to text search
-                            break
-                        else:
-                            print(
-                                f"[DEBUG] Page {page_number}: unique_search_key '{entry['unique_search_key']}' NOT found in raw text."
-                            )
-                # If still not set, mark as config fallback
-                if extraction_method is None:
-                    extraction_method = "Config Fallback"
-            # After search key fallback, inject label and label_source if config_key was found and label is empty/garbage
-            garbage_labels = [None, "", "{}", "None", "{'Form_Label': ''"]
-            if is_garbage_label(label) and config_key:
-                label = config_key
-                label_source = "config_fallback"
-            # 4. Use 'Title' for display, but config_key for lookup
-            # PATCH: For special pages (config_key set), use config_key and its Title for manifest
-            if config_key:
-                manifest_label = config_key
-                manifest_title = config.get(config_key, {}).get("Title") or config_key
-            else:
-                manifest_label = label
-                manifest_title = config.get(label, {}).get("Title") or label
-            # Log which crop was used
-            print(
-                f"[INFO] Page {page_number}: Label extracted using {label_source} ({crop_used} crop): {label}"
-            )
-            print(
-                f"[DEBUG] Page {page_number}: config_key={config_key}, form_code={manifest_label}, manifest_title={manifest_title}"
-            )
-            # Determine form_code: prefer label if in config, else use config_key, else default
-            form_code = None
-            if label and label in config:
-                form_code = label
-                prompt_override = (
-                    config[label].get("prompt_override")
-                    if config[label].get("prompt_override")
-                    else prompt_override
-                )
-            elif config_key:
-                form_code = config_key
-            page_config = (
-                config.get(form_code)
-                if form_code and form_code in config
-                else default_fields
-            )
-            if page_config is default_fields:
-                print(
-                    f"[DEBUG] Page {page_number}: Falling back to default_fields for extraction."
-                )
-            print(
-                f"[DEBUG] Page {page_number}: Fields to process: {list(page_config.keys())}"
-            )
-            for field, field_info in page_config.items():
-                # Only process fields where field_info is a dict and has a 'method' key
-                if not isinstance(field_info, dict) or "method" not in field_info:
-                    continue
-                method = field_info.get("method")
-                split_column = field_info.get("split_column", False)
-                crop_left = field_info.get("crop_left")
-                crop_right = field_info.get("crop_right")
-                crop = field_info.get("crop")
-                field_prompt_override = (
-                    field_info.get("prompt_override") or prompt_override
+                prompt = field_prompt_override or (
+                    "Extract all fields/regions from this tax organizer cover/signature page. "
+                    "If helpful, use the following raw PDF text as context: " + raw_text
                 )
-                # --- Special handling for Cover and Signature pages: full page extraction ---
-                if (
-                    form_code in ("Cover_Sheet", "Signature_Page")
-                    and field == "Full_Page"
-                ):
-                    from PIL import Image
-
-                    img = Image.open(page_image_path)
-                    full_img_path = os.path.join(
-                        self.output_dir, f"full_page_{page_number}.png"
-                    )
-                    img.save(full_img_path)
-                    # Try to load raw PDF text for this page
-                    raw_text_path = os.path.join(
-                        self.output_dir, f"page_{page_number}.txt"
+                try:
+                    result = extract_structured_data_from_image(full_img_path, prompt)
+                    llm_response_path = os.path.join(
+                        self.output_dir,
+                        f"field_{field}_page_{page_number}_llm_response.json",
                     )
-                    raw_text = ""
-                    if os.path.exists(raw_text_path):
-                        with open(raw_text_path, "r") as f:
-                            raw_text = f.read()
-                    prompt = field_prompt_override or (
-                        "Extract all fields/regions from this tax organizer cover/signature page. "
-                        "If helpful, use the following raw PDF text as context: "
-                        + raw_text
+                    with open(llm_response_path, "w") as f:
+                        json.dump(result, f, indent=2)
+                    print(f"[LLM RESPONSE] {llm_response_path}: {result}")
+                    extracted_fields[field] = {
+                        "value": result,
+                        "source": "vision_llm_full_page",
+                        "full_img": full_img_path,
+                    }
+                except Exception as e:
+                    print(f"[LLM ERROR] {field} page {page_number} (full page): {e}")
+                    extracted_fields[field] = {
+                        "value": None,
+                        "source": "vision_llm_full_page_failed",
+                        "full_img": full_img_path,
+                        "error": str(e),
+                    }
+                continue
+            # --- Split-column aggregation fix ---
+            if split_column and crop_left and crop_right:
+                all_col_results = []
+                for col_idx, col_crop in enumerate([crop_left, crop_right]):
+                    l = int(col_crop["left"] * w)
+                    r = int(col_crop["right"] * w)
+                    t = int(col_crop["top"] * h)
+                    b = int(col_crop["bottom"] * h)
+                    col_img = img.crop((l, t, r, b))
+                    col_img_path = os.path.join(
+                        self.output_dir,
+                        f"field_{field}_page_{page_number}_col{col_idx+1}.png",
                     )
+                    col_img.save(col_img_path)
                     try:
+                        prompt = field_prompt_override or (
+                            "Extract all {description, value} pairs from this column of a split-column tax organizer form. "
+                            "Return as a list of objects with keys 'description' and 'value'. Ignore empty or header rows."
+                        )
                         result = extract_structured_data_from_image(
-                            full_img_path, prompt
+                            col_img_path, prompt
                         )
                         llm_response_path = os.path.join(
                             self.output_dir,
-                            f"field_{field}_page_{page_number}_llm_response.json",
+                            f"field_{field}_page_{page_number}_col{col_idx+1}_llm_response.json",
                         )
                         with open(llm_response_path, "w") as f:
                             json.dump(result, f, indent=2)
                         print(f"[LLM RESPONSE] {llm_response_path}: {result}")
-                        extracted_fields[field] = {
-                            "value": result,
-                            "source": "vision_llm_full_page",
-                            "full_img": full_img_path,
-                        }
+                        # Accept either a list or dict with 'data' key
+                        col_values = (
+                            result.get("data")
+                            if isinstance(result, dict) and "data" in result
+                            else result
+                        )
+                        if isinstance(col_values, list):
+                            all_col_results.extend(col_values)
+                        elif isinstance(col_values, dict):
+                            all_col_results.append(col_values)
                     except Exception as e:
                         print(
-                            f"[LLM ERROR] {field} page {page_number} (full page): {e}"
-                        )
-                        extracted_fields[field] = {
-                            "value": None,
-                            "source": "vision_llm_full_page_failed",
-                            "full_img": full_img_path,
-                            "error": str(e),
-                        }
-                    continue
-                # --- Split-column aggregation fix ---
-                if split_column and crop_left and crop_right:
-                    all_col_results = []
-                    for col_idx, col_crop in enumerate([crop_left, crop_right]):
-                        l = int(col_crop["left"] * w)
-                        r = int(col_crop["right"] * w)
-                        t = int(col_crop["top"] * h)
-                        b = int(col_crop["bottom"] * h)
-                        col_img = img.crop((l, t, r, b))
-                        col_img_path = os.path.join(
-                            self.output_dir,
-                            f"field_{field}_page_{page_number}_col{col_idx+1}.png",
+                            f"[LLM ERROR] {field} page {page_number} col {col_idx+1}: {e}"
                         )
-                        col_img.save(col_img_path)
-                        try:
-                            prompt = field_prompt_override or (
-                                "Extract all {description, value} pairs from this column of a split-column tax organizer form. "
-                                "Return as a list of objects with keys 'description' and 'value'. Ignore empty or header rows."
-                            )
-                            result = extract_structured_data_from_image(
-                                col_img_path, prompt
-                            )
-                            llm_response_path = os.path.join(
-                                self.output_dir,
-                                f"field_{field}_page_{page_number}_col{col_idx+1}_llm_response.json",
-                            )
-                            with open(llm_response_path, "w") as f:
-                                json.dump(result, f, indent=2)
-                            print(f"[LLM RESPONSE] {llm_response_path}: {result}")
-                            # Accept either a list or dict with 'data' key
-                            col_values = (
-                                result.get("data")
-                                if isinstance(result, dict) and "data" in result
-                                else result
-                            )
-                            if isinstance(col_values, list):
-                                all_col_results.extend(col_values)
-                            elif isinstance(col_values, dict):
-                                all_col_results.append(col_values)
-                        except Exception as e:
-                            print(
-                                f"[LLM ERROR] {field} page {page_number} col {col_idx+1}: {e}"
-                            )
-                    # Aggregate both columns into a single list under 'data'
-                    extracted_fields[field] = {
-                        "data": all_col_results,
-                        "source": "vision_llm_split_column",
-                        "columns": 2,
-                    }
-                    continue
-                # --- Standard extraction for all other fields ---
-                if method == "vision" and crop:
-                    left = int(crop["left"] * w)
-                    right = int(crop["right"] * w)
-                    top = int(crop["top"] * h)
-                    bottom = int(crop["bottom"] * h)
-                    field_crop_img = img.crop((left, top, right, bottom))
-                    field_crop_img_path = os.path.join(
-                        self.output_dir, f"field_{field}_page_{page_number}.png"
-                    )
-                    field_crop_img.save(field_crop_img_path)
-                    # Save raw OCR text for debug
-                    try:
-                        import pytesseract
+                # Aggregate both columns into a single list under 'data'
+                extracted_fields[field] = {
+                    "data": all_col_results,
+                    "source": "vision_llm_split_column",
+                    "columns": 2,
+                }
+                continue
+            # --- Standard extraction for all other fields ---
+            if method == "vision" and crop:
+                left = int(crop["left"] * w)
+                right = int(crop["right"] * w)
+                top = int(crop["top"] * h)
+                bottom = int(crop["bottom"] * h)
+                field_crop_img = img.crop((left, top, right, bottom))
+                field_crop_img_path = os.path.join(
+                    self.output_dir, f"field_{field}_page_{page_number}.png"
+                )
+                field_crop_img.save(field_crop_img_path)
+                # Save raw OCR text for debug
+                try:
+                    import pytesseract
 
-                        ocr_text = pytesseract.image_to_string(field_crop_img)
-                        ocr_txt_path = field_crop_img_path.replace(".png", "_ocr.txt")
-                        with open(ocr_txt_path, "w") as f:
-                            f.write(ocr_text)
-                        print(f"[DEBUG] Saved OCR text to {ocr_txt_path}")
-                    except Exception as e:
-                        print(f"[WARN] Could not save OCR text: {e}")
-                    # Determine if raw text should be included in the prompt
-                    # Priority: field > page > default
-                    include_raw_text = False
-                    if (
-                        isinstance(field_info, dict)
-                        and "include_raw_text" in field_info
-                    ):
-                        include_raw_text = field_info["include_raw_text"]
-                    elif "include_raw_text" in page_config:
-                        include_raw_text = page_config["include_raw_text"]
-                    elif "include_raw_text" in default_fields:
-                        include_raw_text = default_fields["include_raw_text"]
-                    # Build the prompt
-                    prompt = None
-                    if field_prompt_override:
-                        if "{raw_text}" in field_prompt_override:
-                            prompt = field_prompt_override.replace(
-                                "{raw_text}", raw_text
-                            )
-                        elif include_raw_text:
-                            prompt = (
-                                field_prompt_override.strip().rstrip(".")
-                                + " Use the following raw PDF text as additional context if helpful:\n\n"
-                                + raw_text
-                                + "\nReturn a JSON object with all detected fields and values."
-                            )
-                        else:
-                            prompt = field_prompt_override
-                    else:
-                        if include_raw_text:
-                            prompt = (
-                                f"Extract all structured data, tables, and user-entered fields from this region of a tax organizer page. "
-                                f"Use the following raw PDF text as additional context if helpful:\n\n"
-                                + raw_text
-                                + "\nReturn a JSON object with all detected fields and values."
-                            )
-                        else:
-                            prompt = f"Extract all structured data, tables, and user-entered fields from this region of a tax organizer page. Return a JSON object with all detected fields and values."
-                    print(
-                        f"[DEBUG] Sending PNG to Vision LLM: {field_crop_img_path} with prompt: {prompt[:200]}{'...' if len(prompt) > 200 else ''}"
-                    )
-                    try:
-                        result = extract_structured_data_from_image(
-                            field_crop_img_path, prompt
+                    ocr_text = pytesseract.image_to_string(field_crop_img)
+                    ocr_txt_path = field_crop_img_path.replace(".png", "_ocr.txt")
+                    with open(ocr_txt_path, "w") as f:
+                        f.write(ocr_text)
+                    print(f"[DEBUG] Saved OCR text to {ocr_txt_path}")
+                except Exception as e:
+                    print(f"[WARN] Could not save OCR text: {e}")
+                # Determine if raw text should be included in the prompt
+                # Priority: field > page > default
+                include_raw_text = False
+                if isinstance(field_info, dict) and "include_raw_text" in field_info:
+                    include_raw_text = field_info["include_raw_text"]
+                elif "include_raw_text" in page_config:
+                    include_raw_text = page_config["include_raw_text"]
+                elif "include_raw_text" in default_fields:
+                    include_raw_text = default_fields["include_raw_text"]
+                # Build the prompt
+                prompt = None
+                if field_prompt_override:
+                    if "{raw_text}" in field_prompt_override:
+                        prompt = field_prompt_override.replace("{raw_text}", raw_text)
+                    elif include_raw_text:
+                        prompt = (
+                            field_prompt_override.strip().rstrip(".")
+                            + " Use the following raw PDF text as additional context if helpful:\n\n"
+                            + raw_text
+                            + "\nReturn a JSON object with all detected fields and values."
                         )
-                        llm_response_path = os.path.join(
-                            self.output_dir,
-                            f"field_{field}_page_{page_number}_llm_response.json",
+                    else:
+                        prompt = field_prompt_override
+                else:
+                    if include_raw_text:
+                        prompt = (
+                            f"Extract all structured data, tables, and user-entered fields from this region of a tax organizer page. "
+                            f"Use the following raw PDF text as additional context if helpful:\n\n"
+                            + raw_text
+                            + "\nReturn a JSON object with all detected fields and values."
                         )
-                        with open(llm_response_path, "w") as f:
-                            json.dump(result, f, indent=2)
-                        print(f"[LLM RESPONSE] {llm_response_path}: {result}")
-                        # Patch: Always use native JSON object if possible
-                        value = result.get(field)
-                        if value is None:
-                            # If result itself is a dict or list, use it directly
-                            if isinstance(result, (dict, list)):
-                                value = result
-                            else:
-                                value = str(result)
-                        extracted_fields[field] = {
-                            "value": value,
-                            "source": "vision_llm",
-                            "crop": crop,
-                            "crop_img": field_crop_img_path,
-                        }
-                    except Exception as e:
-                        print(f"[LLM ERROR] {field} page {page_number}: {e}")
-                        extracted_fields[field] = {
-                            "value": None,
-                            "source": "vision_llm_failed",
-                            "crop": crop,
-                            "crop_img": field_crop_img_path,
-                            "error": str(e),
-                        }
-            if not extracted_fields or (
-                isinstance(extracted_fields, dict)
-                and all(not v for v in extracted_fields.values())
-            ):
+                    else:
+                        prompt = f"Extract all structured data, tables, and user-entered fields from this region of a tax organizer page. Return a JSON object with all detected fields and values."
                 print(
-                    f"[WARN] No extracted fields for page {page_number} (label={label})"
+                    f"[DEBUG] Sending PNG to Vision LLM: {field_crop_img_path} with prompt: {prompt[:200]}{'...' if len(prompt) > 200 else ''}"
                 )
-            # Add file name fields for manifest (do not change any other logic)
-            pdf_page_file = os.path.basename(
-                os.path.join(self.output_dir, f"page_{page_number}.pdf")
+                try:
+                    result = extract_structured_data_from_image(
+                        field_crop_img_path, prompt
+                    )
+                    llm_response_path = os.path.join(
+                        self.output_dir,
+                        f"field_{field}_page_{page_number}_llm_response.json",
+                    )
+                    with open(llm_response_path, "w") as f:
+                        json.dump(result, f, indent=2)
+                    print(f"[LLM RESPONSE] {llm_response_path}: {result}")
+                    # Patch: Always use native JSON object if possible
+                    value = result.get(field)
+                    if value is None:
+                        # If result itself is a dict or list, use it directly
+                        if isinstance(result, (dict, list)):
+                            value = result
+                        else:
+                            value = str(result)
+                    extracted_fields[field] = {
+                        "value": value,
+                        "source": "vision_llm",
+                        "crop": crop,
+                        "crop_img": field_crop_img_path,
+                    }
+                except Exception as e:
+                    print(f"[LLM ERROR] {field} page {page_number}: {e}")
+                    extracted_fields[field] = {
+                        "value": None,
+                        "source": "vision_llm_failed",
+                        "crop": crop,
+                        "crop_img": field_crop_img_path,
+                        "error": str(e),
+                    }
+        if not extracted_fields or (
+            isinstance(extracted_fields, dict)
+            and all(not v for v in extracted_fields.values())
+        ):
+            print(f"[WARN] No extracted fields for page {page_number} (label={label})")
+        # Add file name fields for manifest (do not change any other logic)
+        pdf_page_file = os.path.basename(
+            os.path.join(self.output_dir, f"page_{page_number}.pdf")
+        )
+        thumbnail_file = os.path.basename(page_image_path)
+        raw_text_file = os.path.basename(
+            os.path.join(self.output_dir, f"page_{page_number}.txt")
+        )
+        # After label is set, set extraction_method for region-based extraction
+        if label_source == "Form_Label (narrow)":
+            extraction_method = "Regions + Text"
+            print(
+                f"[DEBUG] Page {page_number}: extraction_method set to 'Regions + Text' due to region-based extraction."
             )
-            thumbnail_file = os.path.basename(page_image_path)
-            raw_text_file = os.path.basename(
-                os.path.join(self.output_dir, f"page_{page_number}.txt")
+        # If extraction_method is still None, set to 'Extraction Method Unknown'
+        if extraction_method is None:
+            extraction_method = "Extraction Method Unknown"
+            print(
+                f"[DEBUG] Page {page_number}: extraction_method was None, set to 'Extraction Method Unknown'."
             )
-            # After label is set, set extraction_method for region-based extraction
-            if label_source == "Form_Label (narrow)":
-                extraction_method = "Regions + Text"
-                print(
-                    f"[DEBUG] Page {page_number}: extraction_method set to 'Regions + Text' due to region-based extraction."
-                )
-            # If extraction_method is still None, set to 'Extraction Method Unknown'
-            if extraction_method is None:
-                extraction_method = "Extraction Method Unknown"
-                print(
-                    f"[DEBUG] Page {page_number}: extraction_method was None, set to 'Extraction Method Unknown'."
-                )
-            # Print extraction_method for debug
+        # Print extraction_method for debug
+        print(
+            f"[DEBUG] Page {page_number}: extraction_method before manifest append: {extraction_method}"
+        )
+        return {
+            "page_number": page_number,
+            "label": manifest_label,
+            "label_source": label_source,
+            "label_crop_img": crop_img_path,
+            "Title": manifest_title,
+            "extracted_fields": extracted_fields,
+            "pdf_page_file": pdf_page_file,
+            "thumbnail_file": thumbnail_file,
+            "raw_text_file": raw_text_file,
+            "extracted_with": extraction_method,
+        }
+
+    def extract_all_fields_manifest(self, config_path=None, page_numbers=None):
+        """
+        Robustly extract all fields for each page using fallback logic:
+        1. Try narrow crop (Vision LLM)
+        2. If no config match, try wide crop (Vision LLM)
+        3. If still no match, try raw PDF text (for special pages)
+        For standard forms, map label through gold standard to get form ID.
+        For special pages, match unique phrases in raw text.
+        Log which fallback was used.
+        Only process the specified page_numbers if provided.
+        Handles split-column (Form 1) logic for correct extraction.
+        Supports config-driven prompt_override and unique_search_key for robust fallback.
+        Every step is a memoized stage (see stage_graph()), so re-runs and page subsets
+        only split, render and extract the pages that are not cached yet.
+        """
+        graph = self.stage_graph(config_path)
+        if page_numbers is not None:
+            page_numbers_set = set(page_numbers)
+            page_numbers = [p for p in graph.page_numbers if p in page_numbers_set]
+        manifest = graph.run("manifest", page_numbers)
+        print(f"[DONE] Saved all-fields manifest to {manifest['manifest_path']}")
+        # --- Built-in cleaning step: always run after manifest generation ---
+        cleaned = graph.run("cleaned", page_numbers)
+        if cleaned:
             print(
-                f"[DEBUG] Page {page_number}: extraction_method before manifest append: {extraction_method}"
+                f"[DONE] Cleaned manifest written to {cleaned['cleaned_manifest_path']}"
             )
-            manifest.append(
-                {
-                    "page_number": page_number,
-                    "label": manifest_label,
-                    "label_source": label_source,
-                    "label_crop_img": crop_img_path,
-                    "Title": manifest_title,
-                    "extracted_fields": extracted_fields,
-                    "pdf_page_file": pdf_page_file,
-                    "thumbnail_file": thumbnail_file,
-                    "raw_text_file": raw_text_file,
-                    "extracted_with": extraction_method,
-                }
+        vision_cache = get_vision_cache()
+        if vision_cache is not None:
+            vision_cache.flush()
+            print(f"[CACHE] Vision responses: {vision_cache.stats()}")
+        # NOTE: Only Python scripts should be committed to git. Do NOT commit debug_outputs/ or JSON output files.
+        return manifest
+
+    def stage_graph(self, config_path=None) -> StageGraph:
+        """
+        The organizer workflow as a memoized stage graph, cached in output_dir by the
+        PDF's hash plus each stage's config:
+
+            toc
+            split -> render, raw_text
+            labels (narrow/wide vision crops)
+            fields (labels, render, raw_text, split) -> manifest -> cleaned
+            prefilled (fields, raw_text), run by detect_prefilled()
+
+        split, render, raw_text, labels, fields and prefilled are cached per page.
+        """
+        if config_path is None:
+            config_path = os.path.join(
+                os.path.dirname(__file__), "special_page_configs.json"
             )
-        # Save manifest
+        if config_path in self._stage_graphs:
+            return self._stage_graphs[config_path]
+        with open(config_path, "r") as f:
+            config = json.load(f)
+        default_fields = config.get("default", {})
+        label_crop = default_fields.get("Form_Label", {}).get("crop")
+        # Use Wide_Form_Label if present
+        wide_label_crop = None
+        if default_fields.get("Wide_Form_Label"):
+            wide_label_crop = default_fields["Wide_Form_Label"]["crop"]
+        try:
+            all_pages = list(range(1, page_count(self.pdf_path) + 1))
+        except Exception as e:
+            self.errors.append(f"Page count failed: {e}")
+            all_pages = []
+        graph = StageGraph(self.pdf_path, self.output_dir, page_numbers=all_pages)
+
+        def labels(pages):
+            # Pages run concurrently; each opens its own document (fitz is not
+            # thread-safe) and keeps narrow -> wide in order
+            def label_page(p):
+                with fitz.open(self.pdf_path) as pdf_doc:
+                    return self._extract_page_label(
+                        pdf_doc, p, label_crop, wide_label_crop
+                    )
+
+            return map_pages(
+                pages,
+                label_page,
+                workers=self.page_workers,
+                retry_if=lambda label_info: label_info["errors"],
+            )
+
+        def fields(pages, labels, render, raw_text, split):
+            return map_pages(
+                [p for p in pages if p in labels],
+                lambda p: self._extract_page_fields(
+                    {
+                        "page_number": p,
+                        **split.get(p, {}),
+                        **render.get(p, {}),
+                        **raw_text.get(p, {}),
+                    },
+                    labels[p],
+                    config,
+                ),
+                workers=self.page_workers,
+            )
+
+        graph.add(
+            "toc",
+            self._toc_stage,
+            files=lambda toc: [os.path.join(self.output_dir, "toc_inventory.json")],
+        )
+        graph.add(
+            "split",
+            lambda pages: {
+                p["page_number"]: {"pdf_path": p["pdf_path"]}
+                for p in self.split_pages(pages)
+            },
+            per_page=True,
+            files=lambda a: [a["pdf_path"]],
+        )
+        graph.add(
+            "render",
+            self._render_stage,
+            per_page=True,
+            config={"thumb": self.thumbnail_dpi, "page": self.image_dpi},
+            files=lambda a: [a["thumbnail_path"], a["png_path"]],
+        )
+        graph.add(
+            "raw_text",
+            self._raw_text_stage,
+            per_page=True,
+            files=lambda a: [a["raw_text_file"]],
+        )
+        graph.add(
+            "labels",
+            labels,
+            per_page=True,
+            config={
+                "crop": label_crop,
+                "wide_crop": wide_label_crop,
+                "dpi": self.image_dpi,
+                "model": self.openai_model_ocr,
+                "save_label_crops": self.save_label_crops,
+            },
+            files=lambda a: [a["crop_img_path"], a["wide_crop_img_path"]],
+            cache_if=lambda a: not a["errors"],
+        )
+        graph.add(
+            "fields",
+            fields,
+            deps=["labels", "render", "raw_text", "split"],
+            per_page=True,
+            config={
+                "config": config,
+                "dpi": self.image_dpi,
+                "model": self.openai_model_ocr,
+            },
+            cache_if=lambda entry: not any(
+                isinstance(v, dict) and str(v.get("source", "")).endswith("_failed")
+                for v in entry["extracted_fields"].values()
+            ),
+        )
+        graph.add(
+            "manifest",
+            self._manifest_stage,
+            deps=["fields"],
+            files=lambda a: [a["manifest_path"]],
+        )
+        graph.add(
+            "cleaned",
+            self._cleaned_stage,
+            deps=["manifest"],
+            config={
+                "models": [
+                    os.getenv(k)
+                    for k in (
+                        "OPENAI_MODEL_OCR",
+                        "OPENAI_MODEL_FAST",
+                        "OPENAI_MODEL_PRECISE",
+                    )
+                ]
+            },
+            files=lambda a: [a["cleaned_manifest_path"]],
+            cache_if=lambda a: a is not None,
+        )
+        self._stage_graphs[config_path] = graph
+        return graph
+
+    def _toc_stage(self):
+        toc = self.extract_toc()
+        # Link TOC entries to page and thumbnail paths
+        for entry in toc:
+            page_num = entry.get("page_number")
+            if page_num:
+                entry["pdf_path"] = os.path.join(
+                    self.output_dir, f"page_{page_num}.pdf"
+                )
+                entry["thumbnail_path"] = os.path.join(
+                    self.output_dir, f"thumb_{page_num}.png"
+                )
+            else:
+                entry["pdf_path"] = None
+                entry["thumbnail_path"] = None
+        # Write valid JSON TOC inventory
+        self.write_toc_inventory(toc)
+        return toc
+
+    def _render_stage(self, pages):
+        pages_info = [{"page_number": p} for p in pages]
+        self.generate_thumbnails_and_images(pages_info)
+        return {
+            p["page_number"]: {
+                "thumbnail_path": p["thumbnail_path"],
+                "png_path": p["png_path"],
+            }
+            for p in pages_info
+            if "png_path" in p
+        }
+
+    def _raw_text_stage(self, pages):
+        pages_info = [{"page_number": p} for p in pages]
+        self.extract_raw_text_per_page(pages_info)
+        return {
+            p["page_number"]: {"raw_text_file": p["raw_text_file"]}
+            for p in pages_info
+            if "raw_text_file" in p
+        }
+
+    def _manifest_stage(self, fields):
+        manifest = [fields[p] for p in sorted(fields)]
         manifest_path = os.path.join(self.output_dir, "all_fields_manifest.json")
         with open(manifest_path, "w") as f:
             json.dump(manifest, f, indent=2)
-        print(f"[DONE] Saved all-fields manifest to {manifest_path}")
-        # --- Built-in cleaning step: always run after manifest generation ---
+        return {
+            "manifest_path": manifest_path,
+            "pages": sorted(fields),
+            "digest": artifact_digest(manifest),
+        }
+
+    def _cleaned_stage(self, manifest):
         try:
             from dataextractai.parsers.clean_manifest import clean_manifest
 
@@ -1258,20 +1478,84 @@ class OrganizerExtractor:
                 self.output_dir, "all_fields_manifest_cleaned.json"
             )
             clean_manifest(
-                input_path=manifest_path,
+                input_path=manifest["manifest_path"],
                 output_path=cleaned_manifest_path,
                 pdf_path=self.pdf_path,
             )
-            print(f"[DONE] Cleaned manifest written to {cleaned_manifest_path}")
         except Exception as e:
             print(f"[ERROR] Cleaning step failed: {e}")
-        # NOTE: Only Python scripts should be committed to git. Do NOT commit debug_outputs/ or JSON output files.
+            return None
+        return {"cleaned_manifest_path": cleaned_manifest_path}
+
+    def pages_info(self, page_numbers=None) -> List[Dict[str, Any]]:
+        """Per-page pdf_path, thumbnail_path, png_path and raw_text_file, from the stage cache."""
+        graph = self.stage_graph()
+        split = graph.run("split", page_numbers)
+        render = graph.run("render", page_numbers)
+        raw_text = graph.run("raw_text", page_numbers)
+        return [
+            {
+                "page_number": p,
+                **split[p],
+                **render.get(p, {}),
+                **raw_text.get(p, {}),
+            }
+            for p in sorted(split)
+        ]
+
+    def detect_prefilled(self, page_numbers=None, model_env_keys=None):
+        """
+        Run PrefilledDataDetector on the all-fields manifest entries, cached per page
+        by the entry, its raw text and the models. Writes
+        all_fields_manifest_with_prefilled.json and returns its entries.
+        """
+        model_env_keys = model_env_keys or ["OPENAI_MODEL_FAST", "OPENAI_MODEL_PRECISE"]
+        graph = self.stage_graph()
+        manifest_path = os.path.join(self.output_dir, "all_fields_manifest.json")
+        detector = PrefilledDataDetector(
+            manifest_path, self.output_dir, model_env_keys=model_env_keys
+        )
+        detector.vendor = detector.detect_document_vendor(
+            [{"raw_text_file": f"page_{p}.txt"} for p in graph.page_numbers]
+        )
+        if "prefilled" not in graph.stages:
+            graph.add(
+                "prefilled",
+                lambda pages, fields, raw_text: map_pages(
+                    pages, lambda p: detector.detect_entry(dict(fields[p]))
+                ),
+                deps=["fields", "raw_text"],
+                per_page=True,
+                config={
+                    "models": detector.models,
+                    "exclude_terms": sorted(detector.exclude_terms),
+                    "include_terms": sorted(detector.include_terms),
+                    "prefilter": detector.use_prefilter,
+                },
+                cache_if=lambda entry: entry.get("prefilled_model") is not None,
+            )
+        entries = graph.run("prefilled", page_numbers)
+        updated = [
+            entries[p]
+            for p in sorted(entries)
+            if entries[p].get("has_prefilled_data") is not None
+        ]
+        with open(detector.output_path, "w") as f:
+            json.dump(updated, f, indent=2)
+        logging.info(f"Final output written to: {detector.output_path}")
+        return updated
+
+
+# prefilled_model recorded for pages the local pre-filter marked empty
+PREFILTER_MODEL = "local_prefilter"
 
 
 class PrefilledDataDetector:
     """
     Detects prefilled/user data on each page using LLMs. Can be run as part of the pipeline or standalone.
     Supports exclusion of false positive terms via a config file (dataextractai/parsers/prefilled_exclude_terms.txt).
+    Pages are scored locally first (see prefilled_prefilter); clearly blank pages are marked
+    without an LLM call and the rest are sent to the LLM concurrently.
     """
 
     def __init__(
@@ -1281,6 +1565,10 @@ class PrefilledDataDetector:
         output_path=None,
         model_env_keys=None,
         exclude_terms_path=None,
+        include_terms_path=None,
+        use_prefilter=True,
+        vendor=None,
+        template_store=None,
     ):
         self.manifest_path = manifest_path
         self.raw_text_dir = raw_text_dir
@@ -1304,6 +1592,26 @@ class PrefilledDataDetector:
                 )
         except Exception:
             self.exclude_terms = set()
+        # Local scoring marks clearly blank pages without an LLM call
+        self.use_prefilter = use_prefilter
+        self.include_terms = set()
+        try:
+            with open(
+                include_terms_path
+                or os.path.join(
+                    os.path.dirname(__file__), "prefilled_include_terms.txt"
+                ),
+                "r",
+            ) as f:
+                self.include_terms = set(
+                    line.strip().lower() for line in f if line.strip()
+                )
+        except Exception:
+            pass
+        self.vendor = vendor
+        self.templates = template_store or TemplateStore()
+        self.stats = {"prefiltered": 0, "llm": 0}
+        self._stats_lock = threading.Lock()
 
     def _filter_excluded(self, fields):
         # Recursively filter out any field/value matching exclude_terms
@@ -1336,49 +1644,27 @@ class PrefilledDataDetector:
         logging.info(f"Output path: {self.output_path}")
         with open(self.manifest_path, "r") as f:
             manifest = json.load(f)
-        updated = []
-        page_count = 0
+        entries = []
         for entry in manifest:
-            page_number = entry.get("page_number")
-            raw_text_file = entry.get("raw_text_file")
-            if not raw_text_file:
+            if not entry.get("raw_text_file"):
                 logging.warning(f"No raw_text_file for page {entry.get('page_number')}")
                 continue
-            raw_text_path = os.path.join(self.raw_text_dir, raw_text_file)
-            logging.info(f"[Page {page_number}] Loading raw text from: {raw_text_path}")
-            try:
-                with open(raw_text_path, "r", encoding="utf-8") as f:
-                    raw_text = f.read()
-            except Exception as e:
-                logging.error(
-                    f"Failed to load raw text for page {entry.get('page_number')}: {e}"
-                )
-                entry["has_prefilled_data"] = None
-                entry["prefilled_fields"] = None
-                entry["prefilled_model"] = None
-                continue
-            logging.info(f"[Page {page_number}] Calling LLM for prefilled detection...")
-            result, model_used = self._llm_detect_prefilled(raw_text)
-            # Filter out excluded terms from prefilled_fields
-            filtered_fields = (
-                self._filter_excluded(result.get("prefilled_fields"))
-                if result.get("prefilled_fields")
-                else None
-            )
-            has_prefilled = bool(filtered_fields) if filtered_fields else False
-            entry["has_prefilled_data"] = has_prefilled
-            entry["prefilled_fields"] = filtered_fields
-            entry["prefilled_model"] = model_used
-            n_fields = (
-                len(filtered_fields)
-                if filtered_fields and isinstance(filtered_fields, dict)
-                else 0
-            )
-            logging.info(
-                f"[Page {page_number}] Model: {model_used} | has_prefilled_data: {has_prefilled} | Fields: {n_fields}"
-            )
-            updated.append(entry)
-            page_count += 1
+            entries.append(entry)
+        if self.vendor is None:
+            self.vendor = self.detect_document_vendor(entries)
+        # Pages that survive the local pre-filter go to the LLM concurrently
+        results = map_pages(
+            range(len(entries)), lambda i: self.detect_entry(entries[i])
+        )
+        updated = [
+            entry
+            for entry in results.values()
+            if entry.get("has_prefilled_data") is not None
+        ]
+        page_count = len(updated)
+        logging.info(
+            f"Pre-filter marked {self.stats['prefiltered']} page(s) empty; {self.stats['llm']} sent to the LLM."
+        )
         logging.info(f"Writing manifest with prefilled data to {self.output_path}")
         with open(self.output_path, "w") as f:
             json.dump(updated, f, indent=2)
@@ -1387,8 +1673,79 @@ class PrefilledDataDetector:
         )
         logging.info(f"Final output written to: {self.output_path}")
 
+    def detect_entry(self, entry):
+        """
+        Add has_prefilled_data, prefilled_fields and prefilled_model to one manifest
+        entry from its raw text. has_prefilled_data is None if the text can't be read.
+        """
+        page_number = entry.get("page_number")
+        raw_text_path = os.path.join(
+            self.raw_text_dir, entry.get("raw_text_file") or ""
+        )
+        logging.info(f"[Page {page_number}] Loading raw text from: {raw_text_path}")
+        try:
+            with open(raw_text_path, "r", encoding="utf-8") as f:
+                raw_text = f.read()
+        except Exception as e:
+            logging.error(f"Failed to load raw text for page {page_number}: {e}")
+            entry["has_prefilled_data"] = None
+            entry["prefilled_fields"] = None
+            entry["prefilled_model"] = None
+            return entry
+        vendor = self.vendor or detect_vendor(raw_text)
+        template = self.templates.get(vendor, entry.get("label"))
+        features = score_page(raw_text, template, self.include_terms)
+        if self.use_prefilter and features["clearly_empty"]:
+            logging.info(
+                f"[Page {page_number}] Pre-filter: no user data ({features}); skipping LLM."
+            )
+            with self._stats_lock:
+                self.stats["prefiltered"] += 1
+            entry["has_prefilled_data"] = False
+            entry["prefilled_fields"] = None
+            entry["prefilled_model"] = PREFILTER_MODEL
+            return entry
+        logging.info(f"[Page {page_number}] Calling LLM for prefilled detection...")
+        with self._stats_lock:
+            self.stats["llm"] += 1
+        result, model_used = self._llm_detect_prefilled(raw_text)
+        # Filter out excluded terms from prefilled_fields
+        filtered_fields = (
+            self._filter_excluded(result.get("prefilled_fields"))
+            if result.get("prefilled_fields")
+            else None
+        )
+        has_prefilled = bool(filtered_fields) if filtered_fields else False
+        entry["has_prefilled_data"] = has_prefilled
+        entry["prefilled_fields"] = filtered_fields
+        entry["prefilled_model"] = model_used
+        if model_used and not has_prefilled:
+            # A page the LLM found blank is this form's template for the vendor
+            self.templates.add(vendor, entry.get("label"), raw_text)
+        n_fields = (
+            len(filtered_fields)
+            if filtered_fields and isinstance(filtered_fields, dict)
+            else 0
+        )
+        logging.info(
+            f"[Page {page_number}] Model: {model_used} | has_prefilled_data: {has_prefilled} | Fields: {n_fields}"
+        )
+        return entry
+
+    def detect_document_vendor(self, entries):
+        """The organizer software vendor named on any page's raw text, or None."""
+        for entry in entries:
+            path = os.path.join(self.raw_text_dir, entry.get("raw_text_file") or "")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    vendor = detect_vendor(f.read())
+            except OSError:
+                continue
+            if vendor:
+                return vendor
+        return None
+
     def _llm_detect_prefilled(self, page_text):
-        import openai
         import json
 
         prompt = (
@@ -1398,7 +1755,8 @@ class PrefilledDataDetector:
         )
         for model in self.models:
             try:
-                response = openai.chat.completions.create(
+                response = get_dispatcher().call_sync(
+                    "chat.completions.create",
                     model=model,
                     messages=[{"role": "user", "content": prompt}],
                     response_format={"type": "json_object"},
@@ -1465,25 +1823,29 @@ def extract_labels_for_all_pages(pdf_path, config, output_dir):
     """
     import os
     import logging
-    from pdf2image import convert_from_path
     from dataextractai.utils.ai import extract_structured_data_from_image
-    from PIL import Image
 
     os.makedirs(os.path.join(output_dir, "crops"), exist_ok=True)
-    images = convert_from_path(pdf_path, dpi=300)
+    crop = config["default"]["Form_Label"]["crop"]
+    # Crops are rendered up front in this thread (only the label region, not the
+    # whole page); the vision calls then run for many pages at once
+    crops = {}
+    with fitz.open(pdf_path) as doc:
+        for i in range(1, doc.page_count + 1):
+            crop_png = render_crop_png(doc, i, crop, 300)
+            crop_img_path = os.path.join(
+                output_dir, "crops", f"page_{i}_Form_Label.png"
+            )
+            with open(crop_img_path, "wb") as f:
+                f.write(crop_png)
+            crops[i] = (crop_png, crop_img_path)
+    prompt = "Extract the Form_Label from this region."
+    labels = map_pages(
+        crops, lambda i: extract_structured_data_from_image(crops[i][0], prompt)
+    )
     results = []
-    for i, img in enumerate(images, 1):
-        crop = config["default"]["Form_Label"]["crop"]
-        w, h = img.size
-        left = int(crop["left"] * w)
-        right = int(crop["right"] * w)
-        top = int(crop["top"] * h)
-        bottom = int(crop["bottom"] * h)
-        crop_img = img.crop((left, top, right, bottom))
-        crop_img_path = os.path.join(output_dir, "crops", f"page_{i}_Form_Label.png")
-        crop_img.save(crop_img_path)
-        prompt = "Extract the Form_Label from this region."
-        result = extract_structured_data_from_image(crop_img_path, prompt)
+    for i, (crop_png, crop_img_path) in crops.items():
+        result = labels.get(i) or {}
         logging.info(
             f"[LABEL EXTRACTION] Page {i}: label='{result.get('Form_Label')}' | crop={crop} | img={crop_img_path}"
         )
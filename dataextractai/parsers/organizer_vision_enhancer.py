@@ -4,6 +4,7 @@ from PIL import Image
 import tempfile
 import datetime
 from dataextractai.utils.ai import extract_structured_data_from_image
+from dataextractai.utils.page_scheduler import map_pages
 import sys
 
 # from your_vision_llm_module import run_vision_llm  # Implement this for your API
@@ -79,6 +80,126 @@ def load_special_page_configs():
 special_page_configs = load_special_page_configs()
 
 
+def _enhance_page(page, idx, total_pages, manifest_path, debug_dir, tax_year):
+    """
+    Run the Form_Label/Title vision crops for one manifest page, falling back to the
+    indicator-block fields. Returns (form_code, new_prefilled, log_entries).
+    """
+    page_num = page.get("page_number")
+    print(f"[VISION] Processing page {page_num} ({idx+1}/{total_pages})...")
+    sys.stdout.flush()
+    form_code = (
+        page.get("topic_index_match", {}).get("form_code")
+        if page.get("topic_index_match")
+        else None
+    )
+    config = None
+    codes = [c.strip() for c in form_code.split(",")] if form_code else []
+    # Try to get config for any of the codes
+    for code in codes:
+        if code in special_page_configs:
+            config = special_page_configs[code]
+            break
+    # If no config found, try to match by special page indicator blocks
+    if not config:
+        # Try to match by unique indicator blocks (e.g., Remove_This_Sheet_Box, etc.)
+        for key, cfg in special_page_configs.items():
+            indicator_blocks = [
+                k
+                for k in cfg.keys()
+                if "Box" in k or "Signature" in k or "California" in k or "Notice" in k
+            ]
+            if indicator_blocks:
+                config = cfg
+                break
+    if not config:
+        print(f"[VISION] Skipping page {page_num}: no config found.")
+        sys.stdout.flush()
+        return form_code, {}, []
+    log_entries = []
+    new_prefilled = {}
+    # --- Use ONLY default Form_Label and Title crops ---
+    for field in ["Form_Label", "Title"]:
+        if field in config.get("default", {}):
+            region_cfg = config.get("default", {})[field]
+            if region_cfg.get("method") == "vision":
+                img_path = os.path.join(
+                    os.path.dirname(manifest_path),
+                    page["pdf_page_file"].replace(".pdf", "_full.png"),
+                )
+                try:
+                    with Image.open(img_path) as img:
+                        cropped = crop_by_percent(img, region_cfg["crop"])
+                        crop_filename = f"page_{page['page_number']}_{field}.png"
+                        crop_path = os.path.join(debug_dir, crop_filename)
+                        cropped.save(crop_path)
+                        model_used = os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
+                        vision_result = run_vision_llm(
+                            crop_path, region_cfg, model=model_used
+                        )
+                        if isinstance(vision_result, dict):
+                            if any(isinstance(v, dict) for v in vision_result.values()):
+                                vision_result = filter_to_previous_year(
+                                    vision_result, tax_year
+                                )
+                        new_prefilled[field] = vision_result
+                        page["prefilled_model"] = model_used
+                        log_entries.append(
+                            {
+                                "timestamp": datetime.datetime.now().isoformat(),
+                                "page_number": page_num,
+                                "field": field,
+                                "crop": region_cfg.get("crop"),
+                                "img_path": crop_path,
+                                "vision_llm_response": vision_result,
+                            }
+                        )
+                except Exception as e:
+                    print(f"[VISION][ERROR] Page {page_num} field '{field}': {e}")
+                    sys.stdout.flush()
+    # If no confident result from Form_Label/Title, try indicator blocks (non-label fields only)
+    if not new_prefilled:
+        for field, region_cfg in config.get(form_code, {}).items():
+            if field in ["Form_Label", "Title"]:
+                continue
+            if region_cfg.get("method") == "vision":
+                img_path = os.path.join(
+                    os.path.dirname(manifest_path),
+                    page["pdf_page_file"].replace(".pdf", "_full.png"),
+                )
+                try:
+                    with Image.open(img_path) as img:
+                        cropped = crop_by_percent(img, region_cfg["crop"])
+                        crop_filename = f"page_{page['page_number']}_{field}.png"
+                        crop_path = os.path.join(debug_dir, crop_filename)
+                        cropped.save(crop_path)
+                        model_used = os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
+                        vision_result = run_vision_llm(
+                            crop_path, region_cfg, model=model_used
+                        )
+                        if isinstance(vision_result, dict):
+                            if any(isinstance(v, dict) for v in vision_result.values()):
+                                vision_result = filter_to_previous_year(
+                                    vision_result, tax_year
+                                )
+                        new_prefilled[field] = vision_result
+                        page["prefilled_model"] = model_used
+                        log_entries.append(
+                            {
+                                "timestamp": datetime.datetime.now().isoformat(),
+                                "page_number": page_num,
+                                "field": field,
+                                "crop": region_cfg.get("crop"),
+                                "img_path": crop_path,
+                                "vision_llm_response": vision_result,
+                            }
+                        )
+                except Exception as e:
+                    print(f"[VISION][ERROR] Page {page_num} field '{field}': {e}")
+                    sys.stdout.flush()
+    return form_code, new_prefilled, log_entries
+
+
 def enhance_manifest_with_vision(manifest_path, output_path=None):
     """
     For every page, use ONLY the default section's Form_Label and Title crops from the config for Vision LLM extraction.
@@ -108,125 +229,19 @@ def enhance_manifest_with_vision(manifest_path, output_path=None):
     debug_dir = os.path.join(os.path.dirname(manifest_path), "crops")
     os.makedirs(debug_dir, exist_ok=True)
     vision_overlay_count = 0
+    # Pages run concurrently; crops within a page keep their fallback order
+    page_results = map_pages(
+        range(len(manifest)),
+        lambda idx: _enhance_page(
+            manifest[idx], idx, total_pages, manifest_path, debug_dir, tax_year
+        ),
+    )
     for idx, page in enumerate(manifest):
         page_num = page.get("page_number")
-        print(f"[VISION] Processing page {page_num} ({idx+1}/{total_pages})...")
-        sys.stdout.flush()
-        form_code = (
-            page.get("topic_index_match", {}).get("form_code")
-            if page.get("topic_index_match")
-            else None
+        form_code, new_prefilled, page_log_entries = page_results.get(
+            idx, (None, {}, [])
         )
-        config = None
-        codes = [c.strip() for c in form_code.split(",")] if form_code else []
-        # Try to get config for any of the codes
-        for code in codes:
-            if code in special_page_configs:
-                config = special_page_configs[code]
-                break
-        # If no config found, try to match by special page indicator blocks
-        if not config:
-            # Try to match by unique indicator blocks (e.g., Remove_This_Sheet_Box, etc.)
-            for key, cfg in special_page_configs.items():
-                indicator_blocks = [
-                    k
-                    for k in cfg.keys()
-                    if "Box" in k
-                    or "Signature" in k
-                    or "California" in k
-                    or "Notice" in k
-                ]
-                if indicator_blocks:
-                    config = cfg
-                    break
-        if not config:
-            print(f"[VISION] Skipping page {page_num}: no config found.")
-            sys.stdout.flush()
-            continue
-        new_prefilled = {}
-        # --- Use ONLY default Form_Label and Title crops ---
-        for field in ["Form_Label", "Title"]:
-            if field in config.get("default", {}):
-                region_cfg = config.get("default", {})[field]
-                if region_cfg.get("method") == "vision":
-                    img_path = os.path.join(
-                        os.path.dirname(manifest_path),
-                        page["pdf_page_file"].replace(".pdf", "_full.png"),
-                    )
-                    try:
-                        with Image.open(img_path) as img:
-                            cropped = crop_by_percent(img, region_cfg["crop"])
-                            crop_filename = f"page_{page['page_number']}_{field}.png"
-                            crop_path = os.path.join(debug_dir, crop_filename)
-                            cropped.save(crop_path)
-                            model_used = os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
-                            vision_result = run_vision_llm(
-                                crop_path, region_cfg, model=model_used
-                            )
-                            if isinstance(vision_result, dict):
-                                if any(
-                                    isinstance(v, dict) for v in vision_result.values()
-                                ):
-                                    vision_result = filter_to_previous_year(
-                                        vision_result, tax_year
-                                    )
-                            new_prefilled[field] = vision_result
-                            page["prefilled_model"] = model_used
-                            log_entries.append(
-                                {
-                                    "timestamp": datetime.datetime.now().isoformat(),
-                                    "page_number": page_num,
-                                    "field": field,
-                                    "crop": region_cfg.get("crop"),
-                                    "img_path": crop_path,
-                                    "vision_llm_response": vision_result,
-                                }
-                            )
-                    except Exception as e:
-                        print(f"[VISION][ERROR] Page {page_num} field '{field}': {e}")
-                        sys.stdout.flush()
-        # If no confident result from Form_Label/Title, try indicator blocks (non-label fields only)
-        if not new_prefilled:
-            for field, region_cfg in config.get(form_code, {}).items():
-                if field in ["Form_Label", "Title"]:
-                    continue
-                if region_cfg.get("method") == "vision":
-                    img_path = os.path.join(
-                        os.path.dirname(manifest_path),
-                        page["pdf_page_file"].replace(".pdf", "_full.png"),
-                    )
-                    try:
-                        with Image.open(img_path) as img:
-                            cropped = crop_by_percent(img, region_cfg["crop"])
-                            crop_filename = f"page_{page['page_number']}_{field}.png"
-                            crop_path = os.path.join(debug_dir, crop_filename)
-                            cropped.save(crop_path)
-                            model_used = os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
-                            vision_result = run_vision_llm(
-                                crop_path, region_cfg, model=model_used
-                            )
-                            if isinstance(vision_result, dict):
-                                if any(
-                                    isinstance(v, dict) for v in vision_result.values()
-                                ):
-                                    vision_result = filter_to_previous_year(
-                                        vision_result, tax_year
-                                    )
-                            new_prefilled[field] = vision_result
-                            page["prefilled_model"] = model_used
-                            log_entries.append(
-                                {
-                                    "timestamp": datetime.datetime.now().isoformat(),
-                                    "page_number": page_num,
-                                    "field": field,
-                                    "crop": region_cfg.get("crop"),
-                                    "img_path": crop_path,
-                                    "vision_llm_response": vision_result,
-                                }
-                            )
-                    except Exception as e:
-                        print(f"[VISION][ERROR] Page {page_num} field '{field}': {e}")
-                        sys.stdout.flush()
+        log_entries.extend(page_log_entries)
         if new_prefilled:
             page["prefilled_fields"] = new_prefilled
             page["has_prefilled_data"] = True
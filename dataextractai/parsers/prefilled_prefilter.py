@@ -0,0 +1,178 @@
+"""
+Local Pre-filter for Prefilled Data Detection
+
+Most pages of a tax organizer are blank templates, yet PrefilledDataDetector used to
+send every page's raw text to an LLM. score_page() looks for user data locally first:
+
+- pattern hits (SSNs, EINs, dollar amounts, dates, phone numbers, e-mail addresses,
+  ZIP codes and other runs of 5+ digits, and prefilled_include_terms.txt)
+- bare numbers such as "Daughter 12" or "Charitable contributions 850"; tax years,
+  form codes (1099-INT, W-2) and page, line or form references are boilerplate
+- high-entropy tokens that mix letters and digits (account and reference numbers)
+- how much of the text is new compared with the blank template of the same form from
+  the same software vendor (UltraTax, Lacerte, Drake), when one is known
+
+A page with no hits and (when a template is known) almost no new text is clearly empty
+and is marked without an LLM call. Without a template that means the page has no digits
+beyond boilerplate; names and addresses alone do not match, so any number sends the
+page to the LLM. Templates are learned: when the LLM finds nothing
+on a page, its text becomes the template for that vendor and form label. They are kept
+as one JSON file per vendor under PREFILLED_TEMPLATE_DIR (default
+data/cache/organizer_templates).
+
+Usage:
+    from dataextractai.parsers.prefilled_prefilter import detect_vendor, score_page
+    vendor = detect_vendor(raw_text)
+    features = score_page(raw_text, template_text=templates.get(vendor, "5A"))
+    if features["clearly_empty"]:
+        ...
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+DEFAULT_TEMPLATE_DIR = os.getenv(
+    "PREFILLED_TEMPLATE_DIR", os.path.join("data", "cache", "organizer_templates")
+)
+# A templated page with at most this many characters of new text counts as empty
+MAX_NOVEL_CHARS = int(os.getenv("PREFILLED_MAX_NOVEL_CHARS", "40"))
+# Bits per character above which a mixed letter/digit token looks like an identifier
+HIGH_ENTROPY_BITS = 2.5
+
+VENDOR_MARKERS = {
+    "ultratax": ("ultratax",),
+    "lacerte": ("lacerte", "intuit accountants"),
+    "drake": ("drake software", "drake tax"),
+}
+
+# One pass over the text; the named group says which feature matched
+_USER_DATA = re.compile(
+    r"(?P<ssn>\b\d{3}-\d{2}-\d{4}\b)"
+    r"|(?P<ein>\b\d{2}-\d{7}\b)"
+    r"|(?P<phone>\(\d{3}\)\s*\d{3}-\d{4}|\b\d{3}[-.]\d{3}-\d{4}\b)"
+    r"|(?P<date>\b\d{1,2}/\d{1,2}/\d{2,4}\b)"
+    r"|(?P<email>\b[\w.+-]+@[\w-]+\.[\w.]+\b)"
+    r"|(?P<amount>\$\s?\d[\d,]*(?:\.\d{2})?|\b\d{1,3}(?:,\d{3})+(?:\.\d{2})?\b|\b\d+\.\d{2}\b)"
+    r"|(?P<long_number>\b\d{5,}\b)"
+    r"|(?P<boilerplate>\b(?:19|20)\d{2}\b|\b\d+-[A-Za-z]+\b|\b[A-Za-z]+-\d+\b"
+    r"|(?i:\b(?:page|form|schedule|line|part|box)\s+\d+))"
+    r"|(?P<number>\b\d+\b)"
+)
+# Form codes such as "1099-INT" contain a hyphen and are not identifiers
+_ALNUM_TOKEN = re.compile(r"\b[A-Za-z0-9]{6,}\b")
+
+
+def detect_vendor(text: str) -> Optional[str]:
+    """Return the organizer software vendor named in the text, if any."""
+    lowered = text.lower()
+    for vendor, markers in VENDOR_MARKERS.items():
+        if any(marker in lowered for marker in markers):
+            return vendor
+    return None
+
+
+def shannon_entropy(text: str) -> float:
+    """Bits per character of text."""
+    if not text:
+        return 0.0
+    counts = Counter(text)
+    total = len(text)
+    return -sum(n / total * math.log2(n / total) for n in counts.values())
+
+
+def _novel_text(raw_text: str, template_text: Optional[str]) -> str:
+    lines = [" ".join(line.split()) for line in raw_text.splitlines()]
+    if template_text is None:
+        return "\n".join(line for line in lines if line)
+    template_lines = {" ".join(line.split()) for line in template_text.splitlines()}
+    return "\n".join(line for line in lines if line and line not in template_lines)
+
+
+def score_page(
+    raw_text: str,
+    template_text: Optional[str] = None,
+    include_terms: Iterable[str] = (),
+) -> Dict:
+    """
+    Local user-data features of a page's raw text. Only text that is not in the
+    template (when given) is scored. clearly_empty is True when the page can be
+    marked as having no prefilled data without asking an LLM.
+    """
+    novel = _novel_text(raw_text, template_text)
+    hits = Counter(m.lastgroup for m in _USER_DATA.finditer(novel))
+    del hits["boilerplate"]
+    lowered = novel.lower()
+    include_hits = sum(1 for term in include_terms if term and term.lower() in lowered)
+    if include_hits:
+        hits["include_term"] = include_hits
+    identifiers = sum(
+        1
+        for token in _ALNUM_TOKEN.findall(novel)
+        if sum(c.isdigit() for c in token) >= 2
+        and sum(c.isalpha() for c in token) >= 2
+        and shannon_entropy(token) >= HIGH_ENTROPY_BITS
+    )
+    if identifiers:
+        hits["identifier"] = identifiers
+    novel_chars = len(novel.replace("\n", ""))
+    clearly_empty = not hits and (
+        template_text is None or novel_chars <= MAX_NOVEL_CHARS
+    )
+    return {
+        "hits": dict(hits),
+        "novel_chars": novel_chars,
+        "entropy": round(shannon_entropy(novel), 3),
+        "has_template": template_text is not None,
+        "clearly_empty": clearly_empty,
+    }
+
+
+class TemplateStore:
+    """Blank-page text per (vendor, form label), learned from pages with no user data."""
+
+    def __init__(self, template_dir: str = None):
+        self.template_dir = template_dir or DEFAULT_TEMPLATE_DIR
+        self._templates: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, vendor: str) -> str:
+        return os.path.join(self.template_dir, f"{vendor}.json")
+
+    def _load(self, vendor: str) -> Dict[str, str]:
+        if vendor not in self._templates:
+            try:
+                with open(self._path(vendor), "r", encoding="utf-8") as f:
+                    self._templates[vendor] = json.load(f)
+            except (OSError, ValueError):
+                self._templates[vendor] = {}
+        return self._templates[vendor]
+
+    def get(self, vendor: Optional[str], label: Optional[str]) -> Optional[str]:
+        if not vendor or not label:
+            return None
+        with self._lock:
+            return self._load(vendor).get(label)
+
+    def add(self, vendor: Optional[str], label: Optional[str], text: str) -> bool:
+        """Record text as the blank template for a form unless one is known already."""
+        if not vendor or not label or not text.strip():
+            return False
+        with self._lock:
+            templates = self._load(vendor)
+            if label in templates:
+                return False
+            templates[label] = text
+            try:
+                os.makedirs(self.template_dir, exist_ok=True)
+                tmp_path = self._path(vendor) + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(templates, f, indent=2)
+                os.replace(tmp_path, self._path(vendor))
+            except OSError as e:
+                print(f"[WARN] Could not save organizer template {vendor}/{label}: {e}")
+        return True
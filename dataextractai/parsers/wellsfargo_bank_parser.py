@@ -28,6 +28,7 @@ import json
 import csv
 from ..utils.config import PARSER_INPUT_DIRS, PARSER_OUTPUT_PATHS
 from ..utils.utils import standardize_column_names, get_parent_dir_and_file
+from ..parsers_core.batch import map_files
 from PyPDF2 import PdfReader
 import logging
 
@@ -352,18 +353,20 @@ def extract_transactions_from_page(pdf_path):
     return json_data
 
 
-def process_all_pdfs(source_dir):
+def process_all_pdfs(source_dir, max_workers=None):
     """
     Iterate through a directory of PDF bank statements, extract transactions, and compile them.
 
     This function scans a specified directory for PDF files, processes each file to extract transaction data,
     and appends each transaction to a master list. It also enhances each transaction with the statement date and
-    file path using the 'add_statement_date_and_file_path' function.
+    file path using the 'add_statement_date_and_file_path' function. Files are processed in parallel.
 
     Parameters
     ----------
     source_dir : str
         The directory path where PDF bank statements are stored.
+    max_workers : int, optional
+        Worker processes to use (default: CPU count).
 
     Returns
     -------
@@ -384,23 +387,41 @@ def process_all_pdfs(source_dir):
         'File Path': '/path/to/pdf/statements/statement010423.pdf'
     }
     """
+    pdf_paths = [
+        os.path.join(source_dir, filename)
+        for filename in os.listdir(source_dir)
+        if filename.endswith(".pdf")
+    ]
+    # Files are parsed in parallel; results keep directory listing order
     all_transactions = []
-    for filename in os.listdir(source_dir):
-        if filename.endswith(".pdf"):
-            pdf_path = os.path.join(source_dir, filename)
-            print(f"processing file: {filename}")
-            transactions_json = extract_transactions_from_page(pdf_path)
-            transactions_data = json.loads(transactions_json)
-            # Add additional data like statement date
-        for transaction in transactions_data:
-            updated_transaction = add_statement_date_and_file_path(
-                transaction, pdf_path
-            )
-            all_transactions.append(updated_transaction)
+    for transactions in map_files(
+        process_pdf, pdf_paths, on_error=_log_failed_pdf, max_workers=max_workers
+    ):
+        all_transactions.extend(transactions)
 
     return all_transactions
 
 
+def process_pdf(pdf_path):
+    """
+    Extract the transactions of a single PDF statement, each enhanced with the
+    statement date and file path.
+    """
+    print(f"processing file: {os.path.basename(pdf_path)}")
+    transactions_json = extract_transactions_from_page(pdf_path)
+    transactions_data = json.loads(transactions_json)
+    # Add additional data like statement date
+    return [
+        add_statement_date_and_file_path(transaction, pdf_path)
+        for transaction in transactions_data
+    ]
+
+
+def _log_failed_pdf(pdf_path, message):
+    logger.error(f"Error processing {pdf_path}: {message}")
+    return []
+
+
 def convert_to_float(value):
     try:
         return float(value.replace(",", ""))
@@ -40,6 +40,12 @@ class WellsFargoCheckingCSVParser(BaseParser):
     name = "wellsfargo_checking_csv"
     description = "Parser for Wells Fargo checking account CSV exports."
     file_types = [".csv"]
+    # Headerless export: first row is "date","amount","*","check no","description"
+    detection_signature = {
+        "file_types": [".csv"],
+        "patterns": [r'\A"?\d{1,2}/\d{1,2}/\d{4}"?,"?-?[\d.]+"?,"?\*"?,'],
+        "verify": True,
+    }
 
     @staticmethod
     def _match_csv_headers(file_path, required_headers, min_matches=2):
@@ -31,6 +31,7 @@ from PyPDF2 import PdfReader
 import logging
 from typing import List, Dict, Any
 from ..parsers_core.base import BaseParser
+from ..parsers_core.document import DocumentText
 from ..parsers_core.registry import ParserRegistry
 from ..parsers_core.models import ParserOutput, TransactionRecord, StatementMetadata
 from dataextractai.utils.data_transformation import normalize_transaction_amount
@@ -54,13 +55,17 @@ class WellsFargoMastercardParser(BaseParser):
     Modular parser for Wells Fargo Mastercard PDF statements.
     """
 
-    def can_parse(self, file_path: str) -> bool:
+    detection_signature = {
+        "file_types": [".pdf"],
+        "max_pages": 2,
+        "all_phrases": ["wells fargo", "account number"],
+        "any_phrases": ["business card", "credit line"],
+    }
+
+    def can_parse(self, file_path: str, document: DocumentText = None) -> bool:
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages[:2]:
-                text += page.extract_text() or ""
-            text = text.lower()
+            document = document or DocumentText.from_path(file_path)
+            text = document.text(max_pages=2, sep="").lower()
             result = (
                 "wells fargo" in text
                 and "account number" in text
@@ -71,8 +76,7 @@ class WellsFargoMastercardParser(BaseParser):
             return False
 
     def parse_file(self, input_path: str, config: Dict[str, Any] = None) -> List[Dict]:
-        pdf_reader = PdfReader(input_path)
-        text = "\n".join([page.extract_text() or "" for page in pdf_reader.pages])
+        text = DocumentText.from_path(input_path).text()
         # Extract statement year from metadata
         metadata = self.extract_metadata([], input_path)
         statement_year = None
@@ -150,9 +154,10 @@ class WellsFargoMastercardParser(BaseParser):
         statement_period_start = None
         statement_period_end = None
         statement_date_source = None
+        document = None
         try:
-            reader = PdfReader(input_path)
-            text = "\n".join([page.extract_text() or "" for page in reader.pages])
+            document = DocumentText.from_path(input_path)
+            text = document.text()
             # Try to find 'Statement Period MM/DD/YY to MM/DD/YY'
             match_period = re.search(
                 r"Statement Period\s+(\d{2}/\d{2}/\d{2,4})\s+to\s+(\d{2}/\d{2}/\d{2,4})",
@@ -218,9 +223,7 @@ class WellsFargoMastercardParser(BaseParser):
         # Account number extraction (as before)
         account_number = None
         try:
-            reader = PdfReader(input_path)
-            for page in reader.pages:
-                text = page.extract_text() or ""
+            for text in (document or DocumentText.from_path(input_path)).pages_text():
                 match = re.search(r"Account Number:?\s*([\d\s]+)", text)
                 if match:
                     account_number = match.group(1).replace(" ", "").strip()
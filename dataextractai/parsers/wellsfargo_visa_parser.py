@@ -17,7 +17,6 @@ __description__ = (
 import re
 import pandas as pd
 from datetime import datetime
-import pdfplumber
 import os
 import logging
 import json
@@ -28,6 +27,7 @@ from dataextractai.utils.utils import (
     get_parent_dir_and_file,
 )
 from dataextractai.parsers_core.base import BaseParser
+from dataextractai.parsers_core.document import DocumentText, PDFPLUMBER
 from dataextractai.parsers_core.registry import ParserRegistry
 from dateutil import parser as dateutil_parser
 from dataextractai.parsers_core.models import (
@@ -67,40 +67,36 @@ def extract_transactions(pdf_path):
     statement_date = None
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            logger.info(f"Processing PDF: {pdf_path}")
+        document = DocumentText.from_path(pdf_path)
+        logger.info(f"Processing PDF: {pdf_path}")
 
-            # Extract text from the first page to get statement date
-            first_page_text = pdf.pages[0].extract_text()
-            statement_date = extract_statement_date(first_page_text)
-            logger.info(f"Statement date: {statement_date}")
+        # Extract text from the first page to get statement date
+        first_page_text = document.page_text(0, engine=PDFPLUMBER)
+        statement_date = extract_statement_date(first_page_text)
+        logger.info(f"Statement date: {statement_date}")
 
-            # Get all text from the document at once
-            full_text = ""
-            for page_num in range(len(pdf.pages)):
-                full_text += pdf.pages[page_num].extract_text() + "\n"
+        # Get all text from the document at once
+        full_text = "".join(
+            page_text + "\n" for page_text in document.pages_text(engine=PDFPLUMBER)
+        )
 
-            logger.debug("Full text extracted from PDF")
+        logger.debug("Full text extracted from PDF")
 
-            # Extract payment transactions
-            payment_transactions = extract_payment_transactions(
-                full_text, statement_date
-            )
-            for transaction in payment_transactions:
-                transaction["transaction_type"] = "payment"
-                transaction["statement_date"] = statement_date
-                transaction["file_path"] = pdf_path
-                transactions.append(transaction)
-
-            # Extract purchase transactions
-            purchase_transactions = extract_purchase_transactions(
-                full_text, statement_date
-            )
-            for transaction in purchase_transactions:
-                transaction["transaction_type"] = "purchase"
-                transaction["statement_date"] = statement_date
-                transaction["file_path"] = pdf_path
-                transactions.append(transaction)
+        # Extract payment transactions
+        payment_transactions = extract_payment_transactions(full_text, statement_date)
+        for transaction in payment_transactions:
+            transaction["transaction_type"] = "payment"
+            transaction["statement_date"] = statement_date
+            transaction["file_path"] = pdf_path
+            transactions.append(transaction)
+
+        # Extract purchase transactions
+        purchase_transactions = extract_purchase_transactions(full_text, statement_date)
+        for transaction in purchase_transactions:
+            transaction["transaction_type"] = "purchase"
+            transaction["statement_date"] = statement_date
+            transaction["file_path"] = pdf_path
+            transactions.append(transaction)
 
     except Exception as e:
         logger.error(f"Error processing {pdf_path}: {e}")
@@ -425,17 +421,22 @@ class WellsFargoVisaParser(BaseParser):
 
     name = "wellsfargo_visa"
     description = "Parser for Wells Fargo Visa PDF statements. Extracts and normalizes transactions."
+    detection_signature = {
+        "file_types": [".pdf"],
+        "engine": PDFPLUMBER,
+        "all_phrases": ["wellsfargo.com", "Account ending in", "Statement Period"],
+        "any_phrases": ["Minimum Payment", "Late Payment Warning", "SIGNATURE"],
+    }
 
     @staticmethod
     def extract_account_number_from_first_page(pdf_path):
         import re
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text = pdf.pages[0].extract_text() or ""
-                match = re.search(r"Account ending in (\d{4})", text)
-                if match:
-                    return match.group(1)
+            text = DocumentText.from_path(pdf_path).page_text(0, engine=PDFPLUMBER)
+            match = re.search(r"Account ending in (\d{4})", text)
+            if match:
+                return match.group(1)
         except Exception:
             pass
         return None
@@ -468,22 +469,20 @@ class WellsFargoVisaParser(BaseParser):
         return df
 
     @classmethod
-    def can_parse(cls, input_path):
+    def can_parse(cls, input_path, document: DocumentText = None, **kwargs):
         required_phrases = ["wellsfargo.com", "Account ending in", "Statement Period"]
         credit_card_markers = ["Minimum Payment", "Late Payment Warning", "SIGNATURE"]
         try:
-            with pdfplumber.open(input_path) as pdf:
-                first_page_text = pdf.pages[0].extract_text() or ""
-                text_lower = first_page_text.lower()
-                # All required phrases must be present
-                if not all(phrase.lower() in text_lower for phrase in required_phrases):
-                    return False
-                # At least one credit card marker must be present
-                if not any(
-                    marker.lower() in text_lower for marker in credit_card_markers
-                ):
-                    return False
-                return True
+            document = document or DocumentText.from_path(input_path)
+            first_page_text = document.page_text(0, engine=PDFPLUMBER)
+            text_lower = first_page_text.lower()
+            # All required phrases must be present
+            if not all(phrase.lower() in text_lower for phrase in required_phrases):
+                return False
+            # At least one credit card marker must be present
+            if not any(marker.lower() in text_lower for marker in credit_card_markers):
+                return False
+            return True
         except Exception:
             return False
 
@@ -493,7 +492,6 @@ class WellsFargoVisaParser(BaseParser):
         Statement date extraction prioritizes PDF content (statement period or explicit date fields). Only falls back to original_filename, then input_path filename, if content-based extraction fails. If all fail, logs a warning and sets statement_date to None.
         """
         import re
-        from PyPDF2 import PdfReader
         import os
         import logging
 
@@ -533,8 +531,8 @@ class WellsFargoVisaParser(BaseParser):
                     break
             return name, address, acct_num
 
-        reader = PdfReader(input_path)
-        first_page_text = reader.pages[0].extract_text() if reader.pages else ""
+        document = DocumentText.from_path(input_path)
+        first_page_text = document.page_text(0) if document.page_count else ""
         period_start, period_end = extract_statement_period(first_page_text)
         # Robust statement date extraction
         statement_date = None
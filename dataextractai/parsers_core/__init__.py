@@ -2,4 +2,5 @@
 # Core package for modular parser system
 
 from .base import BaseParser
+from .document import DocumentText
 from .registry import ParserRegistry
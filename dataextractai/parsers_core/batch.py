@@ -0,0 +1,379 @@
+"""
+Parallel Batch Parsing
+
+This module fans parser detection and parsing out over a process pool so whole client
+folders are parsed on every core instead of one file at a time. Results always come
+back in input order.
+
+- map_files(func, items): run any picklable per-file function over a process pool
+- detect_files(file_paths): detect the parser for each file (name or None)
+- parse_files(file_paths): detect (if needed) and parse each file into a ParserOutput
+- find_input_files(directory): list statement files (PDF/CSV) under a folder
+- output_to_records(output, file_path): flatten a ParserOutput into row dicts
+
+Memory stays bounded: at most max_in_flight files are submitted at once and workers are
+recycled after max_tasks_per_child files. Each file gets its own timeout; a file that
+fails or times out yields an error result instead of aborting the batch.
+
+Usage:
+    from dataextractai.parsers_core.batch import parse_files
+    outputs = parse_files(pdf_paths, max_workers=16, timeout=300)
+    for path, output in zip(pdf_paths, outputs):
+        print(path, len(output.transactions), output.errors)
+"""
+
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .document import DocumentText
+from .models import ParserOutput, StatementMetadata
+from .registry import ParserRegistry
+from .result_cache import cached_parse
+
+# Seconds a single file may take before it is abandoned
+DEFAULT_FILE_TIMEOUT = int(os.getenv("PARSER_FILE_TIMEOUT", "300"))
+# Files handled by one worker process before it is replaced (frees leaked memory)
+DEFAULT_MAX_TASKS_PER_CHILD = 50
+# Extra time the parent waits beyond the worker-side timeout before giving up
+_TIMEOUT_GRACE = 10
+
+
+class FileTimeoutError(Exception):
+    """Raised inside a worker when a single file exceeds its time budget."""
+
+
+def default_max_workers() -> int:
+    return int(os.getenv("PARSER_MAX_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _raise_timeout(signum, frame):
+    raise FileTimeoutError()
+
+
+def _call_with_timeout(func: Callable, args: tuple, timeout: Optional[float]):
+    """
+    Call func(*args), raising FileTimeoutError after timeout seconds.
+    Uses SIGALRM where available (POSIX, main thread); otherwise runs unbounded and
+    relies on the parent-side deadline.
+    """
+    use_alarm = (
+        timeout
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not use_alarm:
+        return func(*args)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _init_worker():
+    # Populate the registry in freshly spawned workers
+    from .autodiscover import autodiscover_parsers
+
+    try:
+        autodiscover_parsers()
+    except Exception as e:
+        print(f"[WARN] Parser autodiscovery failed in worker: {e}", file=sys.stderr)
+
+
+def _error_output(
+    file_path: str, message: str, parser_name: str = None
+) -> ParserOutput:
+    return ParserOutput(
+        transactions=[],
+        metadata=StatementMetadata(
+            original_filename=os.path.basename(file_path), parser_name=parser_name
+        ),
+        errors=[message],
+    )
+
+
+def _run_task(func: Callable, item: Any, timeout: Optional[float]) -> Tuple[bool, Any]:
+    # Worker entrypoint: never raises, so one bad file cannot break the pool
+    try:
+        return True, _call_with_timeout(func, (item,), timeout)
+    except FileTimeoutError:
+        return False, f"Timed out after {timeout}s"
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+
+def map_files(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    max_workers: int = None,
+    timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+    max_in_flight: int = None,
+    max_tasks_per_child: int = DEFAULT_MAX_TASKS_PER_CHILD,
+    on_error: Callable[[Any, str], Any] = None,
+) -> List[Any]:
+    """
+    Apply func to every item over a process pool and return results in input order.
+
+    Args:
+        func: Module-level (picklable) function taking one item.
+        items: Inputs, usually file paths.
+        max_workers: Worker processes (default: PARSER_MAX_WORKERS or CPU count).
+            With 1 worker, or a single item, everything runs in-process.
+        timeout: Per-item time budget in seconds (None disables it).
+        max_in_flight: Items submitted at once (default: 2 * max_workers).
+        max_tasks_per_child: Items per worker before it is recycled.
+        on_error: Called as on_error(item, message) for failed or timed-out items;
+            its return value is used as that item's result. Default: re-raise.
+
+    Returns:
+        List of results, one per item, in the same order as items.
+    """
+    items = list(items)
+    max_workers = max(1, min(max_workers or default_max_workers(), len(items) or 1))
+
+    def handle_failure(item, message):
+        if on_error is None:
+            raise RuntimeError(f"Batch task failed for {item}: {message}")
+        return on_error(item, message)
+
+    if max_workers == 1 or len(items) <= 1:
+        results = []
+        for item in items:
+            ok, value = _run_task(func, item, timeout)
+            results.append(value if ok else handle_failure(item, value))
+        return results
+
+    max_in_flight = max(max_workers, max_in_flight or 2 * max_workers)
+    pool_kwargs = {
+        "max_workers": max_workers,
+        "mp_context": multiprocessing.get_context("spawn"),
+        "initializer": _init_worker,
+    }
+    if sys.version_info >= (3, 11) and max_tasks_per_child:
+        pool_kwargs["max_tasks_per_child"] = max_tasks_per_child
+
+    # Queued items wait for at most this many predecessors per worker, each of which
+    # is itself bounded by the worker-side timeout
+    parent_deadline = (
+        -(-max_in_flight // max_workers) * timeout + _TIMEOUT_GRACE if timeout else None
+    )
+
+    results: List[Any] = [None] * len(items)
+    pending: Dict[concurrent.futures.Future, Tuple[int, float]] = {}
+    next_index = 0
+    hung = False
+    executor = concurrent.futures.ProcessPoolExecutor(**pool_kwargs)
+    try:
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < max_in_flight:
+                try:
+                    future = executor.submit(
+                        _run_task, func, items[next_index], timeout
+                    )
+                except concurrent.futures.process.BrokenProcessPool as e:
+                    results[next_index] = handle_failure(
+                        items[next_index], f"Worker pool failed: {e}"
+                    )
+                    next_index += 1
+                    continue
+                pending[future] = (next_index, time.monotonic())
+                next_index += 1
+            done, _ = concurrent.futures.wait(
+                pending, timeout=1, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                index, _ = pending.pop(future)
+                try:
+                    ok, value = future.result()
+                except Exception as e:
+                    # Worker died (e.g. killed for memory); the pool is unusable
+                    ok, value = False, f"Worker failed: {type(e).__name__}: {e}"
+                results[index] = value if ok else handle_failure(items[index], value)
+            if parent_deadline:
+                # Backstop for workers stuck where SIGALRM cannot interrupt them
+                now = time.monotonic()
+                for future, (index, started) in list(pending.items()):
+                    if now - started > parent_deadline:
+                        pending.pop(future)
+                        future.cancel()
+                        hung = True
+                        results[index] = handle_failure(
+                            items[index], f"Timed out after {timeout}s"
+                        )
+    finally:
+        if hung:
+            # Hung workers never return; terminate them instead of joining
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        executor.shutdown(wait=not hung, cancel_futures=True)
+    return results
+
+
+def run_parser(
+    parser_name: str,
+    file_path: str,
+    config: Dict[str, Any] = None,
+    use_cache: bool = True,
+) -> ParserOutput:
+    """
+    Run one registered parser on one file and return its ParserOutput.
+    Uses the parser module's canonical main(input_path) entrypoint when available,
+    otherwise parse_file(), which must return a ParserOutput. Results are served from
+    the persistent parse result cache when the file was parsed before.
+    """
+    parser_cls = ParserRegistry.get_parser(parser_name)
+    if parser_cls is None:
+        raise ValueError(f"Parser '{parser_name}' not found in registry.")
+    module = sys.modules.get(parser_cls.__module__)
+    entrypoint = getattr(module, "main", None)
+    if config is None and callable(entrypoint):
+        parse = functools.partial(entrypoint, file_path)
+    else:
+        parse = functools.partial(parser_cls().parse_file, file_path, config=config)
+    if use_cache:
+        output = cached_parse(parser_name, file_path, parse, config=config)
+    else:
+        output = parse()
+    if not isinstance(output, ParserOutput):
+        raise TypeError(
+            f"Parser '{parser_name}' did not return a ParserOutput. Got {type(output)} instead."
+        )
+    return output
+
+
+def _detect_one(file_path: str) -> Optional[str]:
+    return ParserRegistry.detect_parser_for_file(file_path)
+
+
+def _parse_one(task: Tuple[str, Optional[str], Optional[dict], bool]):
+    file_path, parser_name, config, use_cache = task
+    if parser_name is None:
+        parser_name = ParserRegistry.detect_parser_for_file(
+            file_path, document=DocumentText.from_path(file_path)
+        )
+        if parser_name is None:
+            return None, _error_output(file_path, f"No parser matched {file_path}")
+    return parser_name, run_parser(parser_name, file_path, config, use_cache)
+
+
+def detect_files(
+    file_paths: Sequence[str], max_workers: int = None, **kwargs
+) -> Dict[str, Optional[str]]:
+    """
+    Detect the parser for each file over a process pool.
+    Returns a dict mapping file_path -> parser name (or None), in input order.
+    """
+    file_paths = list(file_paths)
+    names = map_files(
+        _detect_one,
+        file_paths,
+        max_workers=max_workers,
+        on_error=lambda item, message: None,
+        **kwargs,
+    )
+    return dict(zip(file_paths, names))
+
+
+def detect_and_parse_files(
+    file_paths: Sequence[str],
+    parser_names: Sequence[Optional[str]] = None,
+    config: Dict[str, Any] = None,
+    max_workers: int = None,
+    use_cache: bool = True,
+    **kwargs,
+) -> List[Tuple[Optional[str], ParserOutput]]:
+    """
+    Parse each file over a process pool, detecting its parser first when no name is
+    given. Detection and parsing run in the same worker so the file is decoded once.
+    With use_cache, files already parsed by the same parser version are read from the
+    persistent parse result cache instead of being parsed again.
+
+    Returns:
+        List of (parser_name, ParserOutput) tuples in input order. Files that no parser
+        matches, that fail, or that time out get an empty ParserOutput with errors set.
+    """
+    file_paths = list(file_paths)
+    parser_names = list(parser_names or [None] * len(file_paths))
+    if len(parser_names) != len(file_paths):
+        raise ValueError("parser_names must be the same length as file_paths")
+    tasks = [
+        (fp, name, config, use_cache) for fp, name in zip(file_paths, parser_names)
+    ]
+    return map_files(
+        _parse_one,
+        tasks,
+        max_workers=max_workers,
+        on_error=lambda task, message: (
+            task[1],
+            _error_output(task[0], f"Failed to parse {task[0]}: {message}", task[1]),
+        ),
+        **kwargs,
+    )
+
+
+def parse_files(
+    file_paths: Sequence[str],
+    parser_names: Sequence[Optional[str]] = None,
+    config: Dict[str, Any] = None,
+    max_workers: int = None,
+    use_cache: bool = True,
+    **kwargs,
+) -> List[ParserOutput]:
+    """
+    Parse each file over a process pool and return one ParserOutput per file, in input
+    order. See detect_and_parse_files for arguments.
+    """
+    return [
+        output
+        for _, output in detect_and_parse_files(
+            file_paths,
+            parser_names=parser_names,
+            config=config,
+            max_workers=max_workers,
+            use_cache=use_cache,
+            **kwargs,
+        )
+    ]
+
+
+def find_input_files(directory: str, exts=(".pdf", ".csv")) -> List[str]:
+    """Return every file under directory with one of exts, in sorted order."""
+    files = []
+    for root, _, filenames in os.walk(directory):
+        for fname in filenames:
+            if fname.lower().endswith(exts) and not fname.startswith("."):
+                files.append(os.path.join(root, fname))
+    return sorted(files)
+
+
+def output_to_records(output: ParserOutput, file_path: str) -> List[Dict[str, Any]]:
+    """
+    Flatten a ParserOutput into one dict per transaction: TransactionRecord fields,
+    then parser-specific extra fields, then statement context and file_path.
+    """
+    metadata = output.metadata
+    context = {
+        "statement_date": metadata.statement_date if metadata else None,
+        "account_number": metadata.account_number if metadata else None,
+        "file_path": file_path,
+    }
+    records = []
+    for tx in output.transactions:
+        row = tx.model_dump(exclude={"extra"})
+        for key, value in (tx.extra or {}).items():
+            row.setdefault(key, value)
+        for key, value in context.items():
+            if row.get(key) is None:
+                row[key] = value
+        records.append(row)
+    return records
@@ -0,0 +1,182 @@
+"""
+Fingerprint-Indexed Parser Detection
+
+Parsers declare cheap detection signatures as a class attribute instead of being
+instantiated and asked to can_parse every file. The DetectionIndex compiles all
+signatures once: first-page phrases become one combined regex per text engine, and a
+CSV's header row is parsed once and compared against every header set. Detecting a file
+then costs one text pass per engine plus one regex scan, no matter how many parsers are
+registered. Only when several signatures match (or a parser has none) does the registry
+fall back to the parsers' own can_parse.
+
+Signature format (all keys optional except file_types):
+
+    detection_signature = {
+        "file_types": [".pdf"],          # extensions this parser handles
+        "engine": "pypdf2",              # DocumentText engine: "pypdf2" or "pdfplumber"
+        "max_pages": 1,                  # leading pages to scan
+        "all_phrases": ["wells fargo"],  # every phrase must appear (case-insensitive)
+        "any_phrases": ["credit line"],  # at least one must appear, if given
+        "headers": ["Date", "Amount"],   # CSV: header cells that must all be present
+        "exact_headers": False,          # CSV: header row must equal headers, in order
+        "patterns": [r"^\\d{2}/"],         # regexes that must all match the text searched
+        "verify": False,                 # True: a match only nominates; can_parse decides
+    }
+
+Usage:
+    from dataextractai.parsers_core.detection_index import DetectionIndex
+    index = DetectionIndex.build(ParserRegistry._parsers)
+    confirmed, nominated, unindexed = index.candidates(DocumentText.from_path(path))
+"""
+
+import csv
+import io
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Type
+
+from .document import DocumentText, PYPDF2
+
+SIGNATURE_ATTR = "detection_signature"
+
+
+class _Signature:
+    def __init__(self, parser_name: str, spec: dict):
+        self.parser_name = parser_name
+        self.file_types = tuple(ext.lower() for ext in spec.get("file_types", []))
+        self.engine = spec.get("engine", PYPDF2)
+        self.max_pages = spec.get("max_pages", 1)
+        self.all_phrases = {p.lower() for p in spec.get("all_phrases", [])}
+        self.any_phrases = {p.lower() for p in spec.get("any_phrases", [])}
+        self.headers = [h.strip() for h in spec.get("headers", [])]
+        self.exact_headers = spec.get("exact_headers", False)
+        self.patterns = [re.compile(p, re.MULTILINE) for p in spec.get("patterns", [])]
+        self.verify = spec.get("verify", False)
+
+    @property
+    def phrases(self) -> Set[str]:
+        return self.all_phrases | self.any_phrases
+
+    def matches(self, found: Set[str], headers: List[str], text: str) -> bool:
+        if not self.all_phrases.issubset(found):
+            return False
+        if self.any_phrases and not (self.any_phrases & found):
+            return False
+        if self.headers:
+            if self.exact_headers:
+                if headers != self.headers:
+                    return False
+            elif not set(self.headers).issubset(headers):
+                return False
+        return all(p.search(text) for p in self.patterns)
+
+
+class _PhraseMatcher:
+    """
+    One combined regex over many phrases that reports every phrase present.
+
+    The alternation is tried longest-first inside a lookahead, so each position yields
+    the longest phrase starting there; shorter phrases at the same position are its
+    prefixes and are added from a precomputed prefix table.
+    """
+
+    def __init__(self, phrases: Set[str]):
+        ordered = sorted(phrases, key=len, reverse=True)
+        self._regex = (
+            re.compile("(?=(" + "|".join(re.escape(p) for p in ordered) + "))")
+            if ordered
+            else None
+        )
+        self._prefixes = {p: {q for q in ordered if p.startswith(q)} for p in ordered}
+
+    def find(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if self._regex is None:
+            return found
+        for match in self._regex.finditer(text.lower()):
+            found |= self._prefixes[match.group(1)]
+        return found
+
+
+class DetectionIndex:
+    """Compiled detection signatures for every registered parser that declares one."""
+
+    def __init__(self, signatures: List[_Signature], unindexed: List[str]):
+        self.signatures = signatures
+        self.unindexed = unindexed
+        self._pdf_scans: Dict[str, int] = defaultdict(int)
+        phrases_by_engine: Dict[str, Set[str]] = defaultdict(set)
+        csv_phrases: Set[str] = set()
+        for sig in signatures:
+            if ".csv" in sig.file_types:
+                csv_phrases |= sig.phrases
+            if ".pdf" in sig.file_types:
+                phrases_by_engine[sig.engine] |= sig.phrases
+                self._pdf_scans[sig.engine] = max(
+                    self._pdf_scans[sig.engine], sig.max_pages
+                )
+        self._pdf_matchers = {
+            engine: _PhraseMatcher(phrases)
+            for engine, phrases in phrases_by_engine.items()
+        }
+        self._csv_matcher = _PhraseMatcher(csv_phrases)
+
+    @classmethod
+    def build(cls, parsers: Dict[str, Type]) -> "DetectionIndex":
+        signatures, unindexed = [], []
+        for name, parser_cls in parsers.items():
+            spec = getattr(parser_cls, SIGNATURE_ATTR, None)
+            if spec:
+                signatures.append(_Signature(name, spec))
+            else:
+                unindexed.append(name)
+        return cls(signatures, unindexed)
+
+    def candidates(
+        self, document: DocumentText
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Match the document against every signature in one pass.
+
+        Returns:
+            (confirmed, nominated, unindexed): parser names whose signature fully
+            identifies the file, names whose signature matched but asks for can_parse
+            verification, and names without a signature. Each list keeps registration
+            order.
+        """
+        ext = os.path.splitext(document.file_path)[1].lower()
+        confirmed, nominated, headers = [], [], []
+        if ext == ".csv":
+            head = document.head()
+            csv_found = self._csv_matcher.find(head)
+            headers = _csv_headers(head)
+        else:
+            # Scan each leading page once per engine; signatures then pick their window
+            page_found: Dict[str, List[Set[str]]] = {}
+            for engine, matcher in self._pdf_matchers.items():
+                pages = document.pages_text(engine, max_pages=self._pdf_scans[engine])
+                page_found[engine] = [matcher.find(page) for page in pages]
+        for sig in self.signatures:
+            if ext not in sig.file_types:
+                continue
+            if ext == ".csv":
+                found, text = csv_found, head
+            else:
+                found = set().union(*page_found[sig.engine][: sig.max_pages])
+                text = (
+                    document.text(engine=sig.engine, max_pages=sig.max_pages)
+                    if sig.patterns
+                    else ""
+                )
+            if sig.matches(found, headers, text):
+                (nominated if sig.verify else confirmed).append(sig.parser_name)
+        return confirmed, nominated, list(self.unindexed)
+
+
+def _csv_headers(text: str) -> List[str]:
+    try:
+        first_row = next(csv.reader(io.StringIO(text)), [])
+    except csv.Error:
+        return []
+    return [str(h).strip() for h in first_row]
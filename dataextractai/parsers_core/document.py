@@ -0,0 +1,185 @@
+"""
+Shared Per-Document Text Cache
+
+This module provides DocumentText, a lazy, per-page text cache for a single input
+file. Each page is decoded at most once per text engine ("pypdf2" or "pdfplumber"),
+and instances are memoized by the SHA-256 of the file content, so parser detection,
+parse_file, extract_metadata and utils.extract_statement_date_from_content all share
+the same decoded text instead of re-opening the PDF.
+
+Usage:
+    from dataextractai.parsers_core.document import DocumentText
+    doc = DocumentText.from_path("path/to/statement.pdf")
+    first_page = doc.page_text(0)                  # PyPDF2 text of page 0
+    full_text = doc.text(engine="pdfplumber")      # pdfplumber text of every page
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+PYPDF2 = "pypdf2"
+PDFPLUMBER = "pdfplumber"
+ENGINES = (PYPDF2, PDFPLUMBER)
+
+# Number of decoded documents kept in memory at once (LRU)
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_TEXT_CACHE_SIZE", "16"))
+# Leading bytes of a non-PDF file exposed by DocumentText.head()
+HEAD_BYTES = 4096
+
+
+def compute_content_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class DocumentText:
+    """
+    Lazily decoded text of one input file, keyed by content hash.
+
+    Pages are extracted on first access and cached per engine. Readers are opened
+    on demand and released by close(); cached page text survives close().
+    Non-PDF files report zero pages and expose their leading text via head().
+    """
+
+    _cache: "OrderedDict[str, DocumentText]" = OrderedDict()
+    _hash_index: Dict[Tuple[str, int, int], str] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, file_path: str, content_hash: Optional[str] = None):
+        self.file_path = file_path
+        self._content_hash = content_hash
+        self._pages: Dict[str, Dict[int, str]] = {engine: {} for engine in ENGINES}
+        self._readers: Dict[str, object] = {}
+        self._page_count: Optional[int] = None
+        self._head: Optional[str] = None
+
+    @classmethod
+    def from_path(cls, file_path: str) -> "DocumentText":
+        """
+        Return the shared DocumentText for file_path, creating it if needed.
+        Files with identical content share one instance regardless of path.
+        """
+        content_hash = cls._hash_for_path(file_path)
+        with cls._lock:
+            doc = cls._cache.get(content_hash)
+            if doc is not None:
+                cls._cache.move_to_end(content_hash)
+                if doc.file_path != file_path and not os.path.exists(doc.file_path):
+                    doc.file_path = file_path
+                return doc
+            doc = cls(file_path, content_hash=content_hash)
+            cls._cache[content_hash] = doc
+            while len(cls._cache) > DOCUMENT_CACHE_SIZE:
+                _, evicted = cls._cache.popitem(last=False)
+                evicted.close()
+            return doc
+
+    @classmethod
+    def clear_cache(cls):
+        """Close and drop every cached document."""
+        with cls._lock:
+            for doc in cls._cache.values():
+                doc.close()
+            cls._cache.clear()
+            cls._hash_index.clear()
+
+    @classmethod
+    def _hash_for_path(cls, file_path: str) -> str:
+        # Avoid re-hashing an unchanged file on every lookup
+        st = os.stat(file_path)
+        key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        content_hash = cls._hash_index.get(key)
+        if content_hash is None:
+            content_hash = compute_content_hash(file_path)
+            cls._hash_index[key] = content_hash
+        return content_hash
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = compute_content_hash(self.file_path)
+        return self._content_hash
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.file_path.lower().endswith(".pdf")
+
+    def _reader(self, engine: str):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown text engine: {engine}")
+        reader = self._readers.get(engine)
+        if reader is None:
+            if engine == PYPDF2:
+                from PyPDF2 import PdfReader
+
+                reader = PdfReader(self.file_path)
+            else:
+                import pdfplumber
+
+                reader = pdfplumber.open(self.file_path)
+            self._readers[engine] = reader
+        return reader
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            if not self.is_pdf:
+                self._page_count = 0
+            else:
+                try:
+                    self._page_count = len(self._reader(PYPDF2).pages)
+                except Exception:
+                    self._page_count = len(self._reader(PDFPLUMBER).pages)
+        return self._page_count
+
+    def page_text(self, index: int, engine: str = PYPDF2) -> str:
+        """Return the text of one page (0-based), decoding it on first access."""
+        if engine not in self._pages:
+            raise ValueError(f"Unknown text engine: {engine}")
+        pages = self._pages[engine]
+        if index not in pages:
+            page = self._reader(engine).pages[index]
+            pages[index] = page.extract_text() or ""
+            if engine == PDFPLUMBER:
+                # Drop pdfplumber's per-page layout objects once text is cached
+                page.flush_cache()
+        return pages[index]
+
+    def pages_text(self, engine: str = PYPDF2, max_pages: int = None) -> List[str]:
+        """Return the text of the first max_pages pages (all pages if None)."""
+        count = self.page_count
+        if max_pages is not None:
+            count = min(count, max_pages)
+        return [self.page_text(i, engine) for i in range(count)]
+
+    def text(self, engine: str = PYPDF2, max_pages: int = None, sep: str = "\n") -> str:
+        """Return the joined text of the first max_pages pages (all pages if None)."""
+        return sep.join(self.pages_text(engine, max_pages=max_pages))
+
+    def head(self) -> str:
+        """Return the leading HEAD_BYTES of a non-PDF file (e.g. CSV header rows)."""
+        if self._head is None:
+            with open(self.file_path, "r", encoding="utf-8-sig", errors="replace") as f:
+                self._head = f.read(HEAD_BYTES)
+        return self._head
+
+    def close(self):
+        """Release open readers. Already decoded page text stays cached."""
+        plumber = self._readers.pop(PDFPLUMBER, None)
+        if plumber is not None:
+            try:
+                plumber.close()
+            except Exception as e:
+                print(f"[WARN] Failed to close {self.file_path}: {e}", file=sys.stderr)
+        self._readers.clear()
+
+    def __repr__(self) -> str:
+        return f"DocumentText({self.file_path!r}, hash={self._content_hash})"
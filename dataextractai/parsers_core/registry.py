@@ -1,15 +1,37 @@
 from typing import Type, Dict
+import inspect
 from .base import BaseParser
+from .document import DocumentText
+from .detection_index import DetectionIndex
 import sys
 
 
+def _accepts_document(can_parse) -> bool:
+    try:
+        params = inspect.signature(can_parse).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "document" or p.kind == inspect.Parameter.VAR_KEYWORD for p in params
+    )
+
+
 class ParserRegistry:
     _parsers: Dict[str, Type[BaseParser]] = {}
+    _index: DetectionIndex = None
 
     @classmethod
     def register_parser(cls, name: str, parser_cls: Type[BaseParser]):
         print(f"[DEBUG] Registering parser: {name} -> {parser_cls}", file=sys.stderr)
         cls._parsers[name] = parser_cls
+        cls._index = None
+
+    @classmethod
+    def detection_index(cls) -> DetectionIndex:
+        """Return the compiled signature index, rebuilding it after registrations."""
+        if cls._index is None:
+            cls._index = DetectionIndex.build(cls._parsers)
+        return cls._index
 
     @classmethod
     def get_parser(cls, name: str) -> Type[BaseParser]:
@@ -20,21 +42,48 @@ class ParserRegistry:
         return list(cls._parsers.keys())
 
     @classmethod
-    def detect_parser_for_file(cls, file_path):
+    def detect_parser_for_file(cls, file_path, document: DocumentText = None):
         """
-        Returns the name of the first parser whose can_parse returns True for the file.
-        Returns None if no parser matches.
+        Returns the name of the parser that handles the file, or None if none matches.
+
+        Parsers that declare a detection_signature are matched through the detection
+        index in a single text pass. A unique signature match is returned directly;
+        can_parse only runs to break ties between several matches, to verify signatures
+        marked "verify", and for parsers without a signature. The file's DocumentText
+        is built once and shared with every can_parse call.
         """
-        for parser_name in cls.list_parsers():
-            parser_cls = cls.get_parser(parser_name)
-            parser = parser_cls()
+        if document is None:
             try:
-                if hasattr(parser, "can_parse") and parser.can_parse(file_path):
-                    return parser_name
-            except Exception as e:
-                print(f"[WARN] Parser {parser_name} errored on {file_path}: {e}")
+                document = DocumentText.from_path(file_path)
+            except OSError as e:
+                print(f"[WARN] Could not read {file_path}: {e}")
+                return None
+        try:
+            confirmed, nominated, unindexed = cls.detection_index().candidates(document)
+        except Exception as e:
+            print(f"[WARN] Detection index failed on {file_path}: {e}")
+            confirmed, nominated, unindexed = [], [], cls.list_parsers()
+        if len(confirmed) == 1:
+            return confirmed[0]
+        for parser_name in confirmed + nominated + unindexed:
+            if cls._can_parse(parser_name, file_path, document):
+                return parser_name
         return None
 
+    @classmethod
+    def _can_parse(cls, parser_name, file_path, document: DocumentText) -> bool:
+        parser_cls = cls.get_parser(parser_name)
+        try:
+            parser = parser_cls()
+            if not hasattr(parser, "can_parse"):
+                return False
+            if _accepts_document(parser.can_parse):
+                return bool(parser.can_parse(file_path, document=document))
+            return bool(parser.can_parse(file_path))
+        except Exception as e:
+            print(f"[WARN] Parser {parser_name} errored on {file_path}: {e}")
+            return False
+
     @classmethod
     def batch_detect_parsers(cls, file_paths):
         """
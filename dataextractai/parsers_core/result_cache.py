@@ -0,0 +1,269 @@
+"""
+Persistent Parse Result Cache
+
+Clients re-upload overlapping statement archives, so the same PDF is often parsed many
+times. ParseResultCache stores each parser's ParserOutput on disk keyed by the file's
+SHA-256, its basename, the parser name, the parser version and the parser config, so an
+unchanged file is never parsed twice by the same parser version. The basename is part
+of the key because parsers fall back to the filename for values such as the statement
+date. A hit for the same file in another directory gets its per-transaction path fields
+(extra["file_path"], ["source_file"], ["file_name"]) rewritten to the current path.
+
+A parser that declares no __version__ or parser_version is versioned by a hash of its
+module's source, so a fix to it is never masked by results cached before the fix.
+
+Entries are JSON files under PARSE_CACHE_DIR (default data/cache/parse_results). Their
+total size is tracked as entries are written; once it grows past PARSE_CACHE_MAX_MB,
+the least recently used entries are deleted. Set PARSE_CACHE_DISABLED=1 to bypass the cache entirely.
+
+Usage:
+    from dataextractai.parsers_core.result_cache import cached_parse
+    output = cached_parse(
+        "chase_checking", path, lambda: parser.parse_file(path), config=config
+    )
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+from .document import DocumentText
+from .models import ParserOutput
+from .registry import ParserRegistry
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "PARSE_CACHE_DIR", os.path.join("data", "cache", "parse_results")
+)
+DEFAULT_MAX_BYTES = int(float(os.getenv("PARSE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+# Bump when the on-disk entry layout or the key changes
+CACHE_FORMAT = "2"
+# Per-record fields that parsers fill from the input path
+PATH_FIELDS = ("file_path",)
+NAME_FIELDS = ("source_file", "file_name")
+
+
+# Source hashes of parser modules without a declared version, hashed once per process
+_source_versions: Dict[Any, str] = {}
+
+
+def cache_disabled() -> bool:
+    return os.getenv("PARSE_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+def _source_hash(module) -> Optional[str]:
+    """SHA-256 prefix of a module's source file, or None if it cannot be read."""
+    path = getattr(module, "__file__", None)
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return "src-" + hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def parser_version(parser_name: str) -> str:
+    """
+    Return the version string used in cache keys: the parser module's __version__,
+    else the class's parser_version, else a hash of the module's source, so editing a
+    parser that declares no version still invalidates its cached results.
+    """
+    parser_cls = ParserRegistry.get_parser(parser_name)
+    if parser_cls is None:
+        return "0"
+    module = sys.modules.get(parser_cls.__module__)
+    version = getattr(module, "__version__", None) or getattr(
+        parser_cls, "parser_version", None
+    )
+    if version:
+        return str(version)
+    if module not in _source_versions:
+        _source_versions[module] = _source_hash(module) or "0"
+    return _source_versions[module]
+
+
+class ParseResultCache:
+    """On-disk, content-addressed store of ParserOutput objects with LRU size eviction."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Total entry bytes, scanned on the first write and tracked after that
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        content_hash: str,
+        parser_name: str,
+        version: str,
+        config: Dict[str, Any] = None,
+        filename: str = "",
+    ) -> str:
+        config_str = json.dumps(config or {}, sort_keys=True, default=str)
+        key_str = "|".join(
+            [CACHE_FORMAT, content_hash, filename, parser_name, version, config_str]
+        )
+        return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+
+    def key_for_file(
+        self, file_path: str, parser_name: str, config: Dict[str, Any] = None
+    ) -> str:
+        content_hash = DocumentText.from_path(file_path).content_hash
+        return self.make_key(
+            content_hash,
+            parser_name,
+            parser_version(parser_name),
+            config,
+            filename=os.path.basename(file_path),
+        )
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[ParserOutput]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                output = ParserOutput.model_validate_json(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Discarding unreadable parse cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        # Touch the entry so eviction drops the least recently used first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return output
+
+    def put(self, key: str, output: ParserOutput):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically so concurrent workers never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(output.model_dump_json())
+            size = os.path.getsize(tmp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not write parse cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+        if self._size is None:
+            self._size = self._scan()[1]
+        else:
+            self._size += size - replaced
+        # Only walk the cache directory once the tracked size crosses the limit
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _scan(self):
+        """(mtime, size, path) of every entry, and their total size."""
+        entries, total = [], 0
+        for root, _, filenames in os.walk(self.cache_dir):
+            for fname in filenames:
+                if not fname.endswith(".json"):
+                    continue
+                path = os.path.join(root, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries, total = self._scan()
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._size = total
+
+    def clear(self):
+        for root, _, filenames in os.walk(self.cache_dir):
+            for fname in filenames:
+                self._remove(os.path.join(root, fname))
+        self._size = 0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_default_cache: Optional[ParseResultCache] = None
+
+
+def get_default_cache() -> ParseResultCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseResultCache()
+    return _default_cache
+
+
+def _rebind_paths(extra: Optional[Dict[str, Any]], file_path: str):
+    """Point path fields a parser stored in extra at file_path."""
+    if not extra:
+        return
+    for field in PATH_FIELDS:
+        if extra.get(field):
+            extra[field] = file_path
+    for field in NAME_FIELDS:
+        if extra.get(field):
+            extra[field] = os.path.basename(file_path)
+
+
+def cached_parse(
+    parser_name: str,
+    file_path: str,
+    parse: Callable[[], Any],
+    config: Dict[str, Any] = None,
+    cache: ParseResultCache = None,
+):
+    """
+    Return the cached ParserOutput for (file content, parser, version, config), or call
+    parse() and cache its result. Results that are not a ParserOutput (legacy parsers
+    returning raw dicts) and outputs with errors are returned uncached.
+    """
+    if cache_disabled():
+        return parse()
+    cache = cache or get_default_cache()
+    try:
+        key = cache.key_for_file(file_path, parser_name, config)
+    except OSError as e:
+        print(f"[WARN] Parse cache skipped for {file_path}: {e}")
+        return parse()
+    output = cache.get(key)
+    if output is not None:
+        # The entry may have been cached from the same file in another directory
+        for record in output.transactions:
+            _rebind_paths(record.extra, file_path)
+        if output.metadata:
+            _rebind_paths(output.metadata.extra, file_path)
+        return output
+    output = parse()
+    if isinstance(output, ParserOutput) and not output.errors:
+        cache.put(key, output)
+    return output
@@ -4,16 +4,14 @@ import os
 import json
 import yaml
 from typing import List, Dict, Optional, Tuple
-from openai import OpenAI
 from dotenv import load_dotenv
 from .config import ASSISTANTS_CONFIG, PROMPTS, CLASSIFICATIONS
+from .llm_dispatcher import get_dispatcher
+from .vision_cache import get_vision_cache
 import base64
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 # Model configurations
 MODEL_SIMPLE = os.getenv("OPENAI_MODEL_FAST", "gpt-4o-mini-2024-07-18")
 MODEL_COMPLEX = os.getenv("OPENAI_MODEL_PRECISE", "o3-mini-2025-01-31")
@@ -50,14 +48,17 @@ def get_assistant(assistant_name: str) -> Dict:
 
 def create_thread() -> str:
     """Create a new conversation thread."""
-    thread = client.beta.threads.create()
+    thread = get_dispatcher().call_sync("beta.threads.create")
     return thread.id
 
 
 def add_message(thread_id: str, content: str) -> str:
     """Add a message to a thread."""
-    message = client.beta.threads.messages.create(
-        thread_id=thread_id, role="user", content=content
+    message = get_dispatcher().call_sync(
+        "beta.threads.messages.create",
+        thread_id=thread_id,
+        role="user",
+        content=content,
     )
     return message.id
 
@@ -68,15 +69,17 @@ def run_assistant(thread_id: str, assistant_name: str) -> str:
     if not assistant:
         raise ValueError(f"Assistant {assistant_name} not found")
 
-    run = client.beta.threads.runs.create(
-        thread_id=thread_id, assistant_id=assistant["id"]
+    run = get_dispatcher().call_sync(
+        "beta.threads.runs.create", thread_id=thread_id, assistant_id=assistant["id"]
     )
     return run.id
 
 
 def get_messages(thread_id: str) -> List[Dict]:
     """Get messages from a thread."""
-    messages = client.beta.threads.messages.list(thread_id=thread_id)
+    messages = get_dispatcher().call_sync(
+        "beta.threads.messages.list", thread_id=thread_id
+    )
     return messages.data
 
 
@@ -130,7 +133,8 @@ def generate_enhanced_business_context(
     The response must be valid JSON only, with no additional text."""
 
     try:
-        response = client.chat.completions.create(
+        response = get_dispatcher().call_sync(
+            "chat.completions.create",
             model="gpt-4",
             messages=[
                 {
@@ -254,7 +258,8 @@ def get_payee(assistant_config: Dict, description: str) -> Tuple[Dict, float]:
     """Extract or infer the payee from the transaction description with confidence level."""
     prompt = f"""Determine by any means necessary, or extract or infer, the payee of the transaction and return a clean succinct vendor name whether is a company, person or city government agency, utility or other entity. Use your best judgement come up with the most logical and recognizable vendor name which can be used for general ledgers and tax forms purposes and return it in the object json key 'payee'. Also include a 'confidence' field with a value between 0 and 1 indicating your confidence in the payee identification. The transaction description is: {description}"""
 
-    response = client.ChatCompletion.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=assistant_config["model"],
         messages=[
             {
@@ -276,7 +281,8 @@ def get_category(assistant_config: Dict, description: str) -> Tuple[Dict, float]
     formatted_categories = ", ".join([f'"{category}"' for category in CATEGORIES])
     prompt = f"""Categorize the transaction description into one of the business categories: {formatted_categories}, Return the best category match for the description in the list provided and assign it to the object json key 'category'. Also include a 'confidence' field with a value between 0 and 1 indicating your confidence in the categorization. The description to categorize is: {description}"""
 
-    response = client.ChatCompletion.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=assistant_config["model"],
         messages=[
             {
@@ -305,7 +311,8 @@ def get_classification(
 Client Context:
 {client_context}"""
 
-    response = client.ChatCompletion.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=assistant_config["model"],
         messages=[
             {
@@ -355,7 +362,8 @@ Consider:
 - Compliance requirements
 - Best practices for expense tracking"""
 
-    response = client.chat.completions.create(
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
         model=MODEL_COMPLEX,
         messages=[
             {
@@ -395,8 +403,10 @@ def categorize_transactions(client_name: str) -> None:
         [f"- {cat['name']}: {cat['description']}" for cat in config["categories"]]
     )
 
-    # Process transactions in batches
+    # Process transactions in batches, submitting every batch up front
     batch_size = 10
+    dispatcher = get_dispatcher()
+    futures = []
     for i in range(0, len(df), batch_size):
         batch = df.iloc[i : i + batch_size]
 
@@ -419,19 +429,24 @@ Transactions:
 Format the response as a JSON array of objects with 'index' and 'category' fields.
 Example: [{{"index": 0, "category": "Office Supplies"}}, {{"index": 1, "category": "Travel"}}]"""
 
+        future = dispatcher.submit(
+            "chat.completions.create",
+            model="gpt-3.5-turbo",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a financial categorization expert.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.3,
+            max_tokens=500,
+        )
+        futures.append((i, future))
+
+    for i, future in futures:
         try:
-            response = client.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a financial categorization expert.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=500,
-            )
+            response = future.result()
 
             # Update categories in DataFrame
             categorizations = json.loads(response.choices[0].message.content)
@@ -505,7 +520,8 @@ Consider:
 5. Consider the business context for relevance"""
 
     try:
-        response = client.chat.completions.create(
+        response = get_dispatcher().call_sync(
+            "chat.completions.create",
             model=os.getenv("OPENAI_MODEL_PRECISE", "o3-mini-2025-01-31"),
             messages=[
                 {
@@ -524,38 +540,52 @@ Consider:
         return None
 
 
-def extract_structured_data_from_image(img_path, prompt, model=None):
+def extract_structured_data_from_image(img_path, prompt, model=None, use_cache=True):
     """
     Given an image path and a prompt, call the OpenAI Vision API to extract structured data.
+    img_path may also be the PNG bytes themselves (e.g. a crop rendered in memory).
+    Responses are cached by image, prompt and model (see utils.vision_cache), so an
+    identical crop is only sent once.
     Returns the parsed JSON response. Raises an error if the response is not valid JSON.
     """
-    api_key = os.getenv("OPENAI_API_KEY")
     model = model or os.getenv("OPENAI_MODEL_OCR", "gpt-4o")
-    client = OpenAI(api_key=api_key)
-    with open(img_path, "rb") as img_file:
-        img_bytes = img_file.read()
-        img_b64 = base64.b64encode(img_bytes).decode("utf-8")
-        image_content = {
-            "type": "image_url",
-            "image_url": {"url": f"data:image/png;base64,{img_b64}"},
-        }
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that extracts structured data from images. Return your response as a JSON object only, with no extra text.",
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        image_content,
-                    ],
-                },
-            ],
-            temperature=0.0,
-            response_format={"type": "json_object"},
-        )
-        content = response.choices[0].message.content
-        return json.loads(content)
+    if isinstance(img_path, (bytes, bytearray)):
+        img_bytes = bytes(img_path)
+    else:
+        with open(img_path, "rb") as img_file:
+            img_bytes = img_file.read()
+    cache = get_vision_cache() if use_cache else None
+    if cache is not None:
+        cache_key = cache.make_key(img_bytes, prompt, model)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    img_b64 = base64.b64encode(img_bytes).decode("utf-8")
+    image_content = {
+        "type": "image_url",
+        "image_url": {"url": f"data:image/png;base64,{img_b64}"},
+    }
+    response = get_dispatcher().call_sync(
+        "chat.completions.create",
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that extracts structured data from images. Return your response as a JSON object only, with no extra text.",
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    image_content,
+                ],
+            },
+        ],
+        temperature=0.0,
+        response_format={"type": "json_object"},
+    )
+    content = response.choices[0].message.content
+    result = json.loads(content)
+    if cache is not None:
+        cache.put(cache_key, model, result)
+    return result
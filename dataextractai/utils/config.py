@@ -299,85 +299,99 @@ DATA_MANIFESTS = {
     },
 }
 
+# Every map carries account_number so the normalizer's dedup key can tell accounts apart
 TRANSFORMATION_MAPS = {
     "wellsfargo_mastercard": {
         "transaction_date": "transaction_date",
         "description": "description",
         "amount": "amount",  # Assuming 'Amount' is the source column with the correct sign
         "file_path": "file_path",
-        "source": lambda x: "wellsfargo_mastercard",
-        "transaction_type": lambda x: "Credit Card",
+        "source": {"const": "wellsfargo_mastercard"},
+        "transaction_type": {"const": "Credit Card"},
+        "account_number": {"optional": "account_number"},
     },
     "amazon": {
         "transaction_date": "order_placed",
         "description": "description",
         "amount": "amount",  # This is the calculated amount per item
         "file_path": "file_path",
-        "source": lambda x: "amazon",
-        "transaction_type": lambda x: "Credit Card",
+        "source": {"const": "amazon"},
+        "transaction_type": {"const": "Credit Card"},
+        "account_number": {"optional": "account_number"},
     },
     "bofa_bank": {
         "transaction_date": "date",
         "description": "description",
         "amount": "amount",  # Assuming 'amount' is the source column, and the sign may need normalization
         "file_path": "file_path",
-        "source": lambda x: "bofa_bank",
-        "transaction_type": lambda x: "Debit/Check",
+        "source": {"const": "bofa_bank"},
+        "transaction_type": {"const": "Debit/Check"},
+        "account_number": {"optional": "account_number"},
     },
     "bofa_visa": {
         "transaction_date": "transaction_date",
         "description": "description",
         "amount": "amount",
         "file_path": "file_path",
-        "source": lambda x: "bofa_visa",
-        "transaction_type": lambda x: "Credit Card",
+        "source": {"const": "bofa_visa"},
+        "transaction_type": {"const": "Credit Card"},
+        "account_number": {"optional": "account_number"},
     },
     "chase_visa": {
         "transaction_date": "date",
         "description": "merchant_name_or_transaction_description",
         "amount": "amount",
         "file_path": "file_path",
-        "source": lambda x: "chase_visa",
-        "transaction_type": lambda x: "Credit Card",
+        "source": {"const": "chase_visa"},
+        "transaction_type": {"const": "Credit Card"},
+        "account_number": {"optional": "account_number"},
     },
     "wellsfargo_bank": {
         "transaction_date": "date",
         "description": "description",
         "amount": "amount",  # Assuming 'amount' is the calculated source column with normalized sign
         "file_path": "file_path",
-        "source": lambda x: "wellsfargo_bank",
-        "transaction_type": lambda x: "Debit/Check",
+        "source": {"const": "wellsfargo_bank"},
+        "transaction_type": {"const": "Debit/Check"},
+        "account_number": {"optional": "account_number"},
     },
     "wellsfargo_visa": {
         "transaction_date": "transaction_date",
         "description": "description",
         "amount": "amount",
         "file_path": "file_path",
-        "source": lambda x: "wellsfargo_visa",
-        "transaction_type": lambda x: "Credit Card",
+        "source": {"const": "wellsfargo_visa"},
+        "transaction_type": {"const": "Credit Card"},
+        "account_number": {"optional": "account_number"},
     },
     "wellsfargo_bank_csv": {
         "transaction_date": "transaction_date",
         "description": "description",
         "amount": "amount",
         "file_path": "source_file",
-        "source": lambda x: "wellsfargo_bank_csv",
+        "source": {"const": "wellsfargo_bank_csv"},
         "transaction_type": "transaction_type",
+        "account_number": {"optional": "account_number"},
     },
     "first_republic_bank": {
-        "transaction_date": lambda row: (
-            row["statement_end_date"]
-            if "INTEREST CREDIT" in str(row["description"])
-            and (pd.isna(row["transaction_date"]) or row["transaction_date"] == "")
-            else row["transaction_date"]
-        ),
-        "description": lambda x: x["description"],
-        "amount": lambda x: x["amount"],
-        "transaction_type": lambda x: x["transaction_type"],
-        "statement_start_date": lambda x: x["statement_start_date"],
-        "statement_end_date": lambda x: x["statement_end_date"],
-        "account_number": lambda x: x["account_number"],
-        "file_path": lambda x: x["file_path"],
+        # Interest credits have no transaction date; use the statement end date
+        "transaction_date": {
+            "if": {
+                "all": [
+                    {"contains": ["description", "INTEREST CREDIT"]},
+                    {"missing": "transaction_date"},
+                ]
+            },
+            "then": {"column": "statement_end_date"},
+            "else": {"column": "transaction_date"},
+        },
+        "description": {"column": "description"},
+        "amount": {"column": "amount"},
+        "transaction_type": {"column": "transaction_type"},
+        "statement_start_date": {"column": "statement_start_date"},
+        "statement_end_date": {"column": "statement_end_date"},
+        "account_number": {"column": "account_number"},
+        "file_path": {"column": "file_path"},
     },
     "chase_checking": {
         # Use normalized_date if present, else fallback to date_of_transaction parsed as ISO
@@ -395,14 +409,10 @@ TRANSFORMATION_MAPS = {
         ),
         "description": "merchant_name_or_transaction_description",
         # Always output float for amount
-        "amount": lambda row: (
-            float(row["amount"])
-            if "amount" in row and row["amount"] is not None
-            else 0.0
-        ),
+        "amount": {"float": "amount", "default": 0.0},
         "file_path": "file_path",
-        "source": lambda x: "chase_checking",
-        "transaction_type": lambda x: "Debit/Check",
+        "source": {"const": "chase_checking"},
+        "transaction_type": {"const": "Debit/Check"},
         "account_number": "account_number",
     },
     "capitalone_csv": {
@@ -410,7 +420,7 @@ TRANSFORMATION_MAPS = {
         "description": "description",
         "amount": "amount",
         "file_path": "source_file",
-        "source": lambda x: "capitalone_csv",
+        "source": {"const": "capitalone_csv"},
         "transaction_type": "transaction_type",
         "account_number": "card_no",
     },
@@ -750,6 +760,75 @@ BUSINESS_EXPENSES = [
 
 EXPENSE_THRESHOLD = 2
 
+# Deterministic rules applied before the LLM passes (see agents/rule_engine.py).
+# Each rule matches "pattern" (regex) or "keywords" (whole words) case-insensitively
+# against the description and fills whichever of payee/category/classification it sets.
+# Clients can override or extend these in data/clients/<client>/classification_rules.yaml.
+CLASSIFICATION_RULES = [
+    {
+        "name": "payroll_providers",
+        "pattern": r"\b(?:adp|gusto|paychex|rippling|justworks)\b",
+        "category": "Payroll",
+    },
+    {"name": "adp", "pattern": r"\badp\b", "payee": "ADP"},
+    {"name": "gusto", "pattern": r"\bgusto\b", "payee": "Gusto"},
+    {"name": "paychex", "pattern": r"\bpaychex\b", "payee": "Paychex"},
+    {
+        "name": "pge",
+        "pattern": r"\bpg\s?&\s?e\b|pacific gas",
+        "payee": "PG&E",
+        "category": "Utilities",
+    },
+    {
+        "name": "comcast",
+        "pattern": r"\bcomcast\b|\bxfinity\b",
+        "payee": "Comcast",
+        "category": "Utilities",
+    },
+    {
+        "name": "verizon",
+        "pattern": r"\bverizon\b|\bvzwrlss\b",
+        "payee": "Verizon",
+        "category": "Utilities",
+    },
+    {
+        "name": "att",
+        "pattern": r"\bat\s?&\s?t\b|\batt\*",
+        "payee": "AT&T",
+        "category": "Utilities",
+    },
+    {
+        "name": "zoom",
+        "pattern": r"\bzoom\.us\b",
+        "payee": "Zoom",
+        "category": "Office Expenses",
+    },
+    {
+        "name": "slack",
+        "pattern": r"\bslack\b",
+        "payee": "Slack",
+        "category": "Office Expenses",
+    },
+    {
+        "name": "github",
+        "pattern": r"\bgithub\b",
+        "payee": "GitHub",
+        "category": "Office Expenses",
+    },
+    {
+        "name": "dropbox",
+        "pattern": r"\bdropbox\b",
+        "payee": "Dropbox",
+        "category": "Office Expenses",
+    },
+    {
+        "name": "adobe",
+        "pattern": r"\badobe\b",
+        "payee": "Adobe",
+        "category": "Office Expenses",
+    },
+]
+
 
 def get_current_paths(config: Dict) -> Dict:
     """Get current paths based on configuration."""
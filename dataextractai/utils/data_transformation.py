@@ -11,21 +11,13 @@ Date: November 5, 2023
 import pandas as pd
 from dataextractai.utils.config import DATA_MANIFESTS
 from dataextractai.utils.config import TRANSFORMATION_MAPS
+from dataextractai.utils.transformation_plan import get_plan
 
 
 def apply_transformation_map(df, source):
-    transformation_map = TRANSFORMATION_MAPS[source]
-    transformed_df = df.copy()  # Start with a copy of the original DataFrame
-
-    for target_col, source_col in transformation_map.items():
-        if callable(source_col):
-            # Apply the lambda function to the DataFrame
-            transformed_df[target_col] = df.apply(lambda row: source_col(row), axis=1)
-        else:
-            # Directly map the source column to the target column
-            transformed_df[target_col] = df[source_col]
-
-    return transformed_df
+    # Start with a copy of the original DataFrame; mapped columns must exist
+    plan = get_plan(TRANSFORMATION_MAPS[source])
+    return plan.apply(df, missing="raise", keep_columns=True)
 
 
 def normalize_transaction_amount(
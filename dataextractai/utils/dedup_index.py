@@ -0,0 +1,147 @@
+"""
+Transaction Hashes and Per-Client Dedup Index
+
+Overlapping statements of the same account produce the same transaction more than
+once. Each transaction gets a transaction_hash (SHA-256 of date, amount, description and
+account number), computed column-wise for a whole DataFrame. The normalizer checks a
+dedup hash of the same fields plus the source parser (DEDUP_FIELDS) against a persistent
+per-client index of hashes already seen (data/clients/<client>/output/dedup_index.db)
+before the row reaches classification. The source and account number are the account
+identity: the same $15.99 charge on the same day on two different cards is two
+transactions.
+
+Identical transactions inside one statement (two $4.50 coffees on the same day) are
+real, so the index key is the hash plus the row's occurrence number among identical rows
+of its source file: a second statement repeating both coffees matches both keys, while
+the statement itself never matches its own rows when it is normalized again.
+
+NORMALIZE_DEDUP_MODE selects what happens to a duplicate: "flag" (default; kept, with
+duplicate_of naming the first source), "drop" (recorded as a problem row instead) or
+"off". Many parsers do not report an account number, so even "drop" only flags
+duplicates that have none.
+
+Usage:
+    from dataextractai.utils.dedup_index import DedupIndex, compute_transaction_hashes
+    df["transaction_hash"] = compute_transaction_hashes(df)
+    index = DedupIndex("data/clients/acme/output/dedup_index.db")
+    duplicate_of = index.check(
+        compute_transaction_hashes(df, DEDUP_FIELDS), df["file_path"]
+    )
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Iterable, List
+
+import pandas as pd
+
+DEDUP_MODE = os.getenv("NORMALIZE_DEDUP_MODE", "flag").lower()
+HASH_FIELDS = ["transaction_date", "amount", "description", "account_number"]
+DEDUP_FIELDS = HASH_FIELDS + ["source"]
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    dedup_key TEXT PRIMARY KEY,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seen_source ON seen (source);
+"""
+
+
+def compute_transaction_hashes(
+    df: pd.DataFrame, fields: List[str] = HASH_FIELDS
+) -> pd.Series:
+    """
+    SHA-256 of "|".join(str(value) for each field) per row, the same value
+    normalize_api.compute_transaction_id gives, built from whole columns.
+    """
+    key = None
+    for field in fields:
+        if field in df.columns:
+            text = df[field].astype(object).map(str)
+        else:
+            text = pd.Series("", index=df.index, dtype=object)
+        key = text if key is None else key + "|" + text
+    return pd.Series(
+        [hashlib.sha256(k.encode("utf-8")).hexdigest() for k in key],
+        index=df.index,
+        dtype=object,
+    )
+
+
+class DedupIndex:
+    """Persistent set of transaction keys and the source file that introduced each."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def check(self, hashes: pd.Series, sources: pd.Series) -> pd.Series:
+        """
+        Register new rows and find duplicates.
+
+        Returns:
+            Series on the same index: the source that first introduced the row, for
+            rows already seen from another source, else None.
+        """
+        sources = sources.fillna("").astype(str)
+        occurrence = hashes.groupby([sources, hashes]).cumcount().astype(str)
+        keys = (hashes.astype(str) + ":" + occurrence).tolist()
+        with self._lock:
+            seen = self._lookup(set(keys))
+            duplicate_of, new_rows = [], []
+            for key, source in zip(keys, sources.tolist()):
+                first = seen.get(key)
+                if first is None:
+                    seen[key] = source
+                    new_rows.append((key, source))
+                    duplicate_of.append(None)
+                else:
+                    duplicate_of.append(first if first != source else None)
+            self._conn.executemany("INSERT INTO seen VALUES (?, ?)", new_rows)
+            self._conn.commit()
+        return pd.Series(duplicate_of, index=hashes.index, dtype=object)
+
+    def _lookup(self, keys: set) -> dict:
+        found = {}
+        keys = list(keys)
+        for i in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[i : i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                self._conn.execute(
+                    f"SELECT dedup_key, source FROM seen WHERE dedup_key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+    def forget(self, sources: Iterable[str]):
+        """Drop the keys of sources that are being re-normalized or no longer exist."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM seen WHERE source = ?", [(s,) for s in set(sources)]
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM seen")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
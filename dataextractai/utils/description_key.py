@@ -0,0 +1,122 @@
+"""
+Canonical Transaction Descriptions
+
+Bank descriptions of the same purchase differ in per-transaction noise: "POS DEBIT 1234
+NETFLIX" and "POS DEBIT 5678 NETFLIX", "AMZN Mktp US*2K1AB3" and "AMZN Mktp US*7Q9ZZ1",
+"SHELL OIL #4411 01/15". Every classification cache key is built from the canonical
+description, so such rows share one cached result instead of each costing an LLM call.
+
+All noise is removed with one precompiled case-insensitive alternation:
+
+- transaction-type prefixes and their numbers (POS DEBIT 1234, PURCHASE AUTH)
+- reference IDs (REF 123, TRANS#45, CONF: A1B2, *2K1AB3), but not names such as
+  "ID: 7-ELEVEN"
+- dates (01/15, 1/15/24, 2024-01-15)
+- card and account suffixes (CARD 1234, XXXX1234, ACCT ENDING IN 9876, 1234*)
+- store numbers (#4411, STORE 12) and other runs of 4+ digits
+
+Checks, transfers, ACH, wire and Zelle payments are left as plain lowercased text. Their
+check number or account suffix is what tells "CHECK # 1234" from "CHECK 5678" and a
+transfer to savings ...1234 from one to ...9876, and the payee cache is shared across
+clients, so merging them would spread one row's classification to unrelated payments.
+
+canonical_description() works on one string; canonical_descriptions() and cache_keys()
+apply the same regex to whole pandas string columns. A description that is nothing but
+noise keeps its lowercased text, so unrelated rows never collapse onto an empty key.
+
+Usage:
+    from dataextractai.utils.description_key import cache_key, canonical_descriptions
+    cache_key("POS DEBIT 1234 NETFLIX")                  # "netflix"
+    cache_key("POS DEBIT 1234 NETFLIX", "Netflix")       # "netflix|netflix"
+    df["description_key"] = canonical_descriptions(df["description"])
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+
+# Bump when the noise pattern changes so stored cache keys are rebuilt
+KEY_VERSION = 2
+
+# Descriptions whose numbers identify the payment itself
+REFERENCED = re.compile(
+    r"\b(?:check|chk|cheque|transfer|xfer|ach|wire|zelle)\b", re.IGNORECASE
+)
+
+NOISE = re.compile(
+    r"\bpos\s+(?:debit|credit|purchase)(?:\s+\d+\b(?![/-]))?"
+    r"|\bpurchase\s+auth(?:orized)?(?:\s+on)?(?:\s+\d+\b(?![/-]))?"
+    r"|\b(?:ref|trans|conf|id)\s*(?:no\.?|#|:)?\s*[a-z]*\d\w*\b(?!-)"
+    r"|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b|\b\d{4}-\d{2}-\d{2}\b"
+    r"|\b(?:card|acct)\s*(?:ending(?:\s+in)?\s*)?[x*#]*\d{4}\b|\bx{2,}\d{2,4}\b|\d{4}\*"
+    r"|\bstore\s*#?\s*\d+|#\s*\d+"
+    r"|\*(?=\w*\d)\w+"
+    r"|(?<!-)\b\d{4,}\b(?!-)",
+    re.IGNORECASE,
+)
+
+
+def _plain(description) -> str:
+    if description is None or pd.isna(description):
+        return ""
+    return " ".join(str(description).lower().split())
+
+
+@lru_cache(maxsize=65536)
+def _canonical(text: str) -> str:
+    if REFERENCED.search(text):
+        return text
+    return " ".join(NOISE.sub(" ", text).split()) or text
+
+
+def canonical_description(description) -> str:
+    """Lowercased description with per-transaction noise removed."""
+    return _canonical(_plain(description))
+
+
+def canonical_descriptions(descriptions: pd.Series) -> pd.Series:
+    """canonical_description() over a whole column."""
+    plain = (
+        descriptions.astype("string")
+        .fillna("")
+        .str.lower()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+    canonical = (
+        plain.str.replace(NOISE, " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+    keep = (canonical == "") | plain.str.contains(REFERENCED)
+    return canonical.where(~keep, plain).astype(object)
+
+
+def _part(value) -> Optional[str]:
+    if value is None or pd.isna(value) or str(value) == "":
+        return None
+    return str(value).lower()
+
+
+def cache_key(description, payee=None, category=None) -> str:
+    """Classification cache key: canonical description, then payee and category."""
+    parts = [canonical_description(description)]
+    parts += [part for part in (_part(payee), _part(category)) if part is not None]
+    return "|".join(parts)
+
+
+def cache_keys(
+    descriptions: pd.Series,
+    payees: Optional[pd.Series] = None,
+    categories: Optional[pd.Series] = None,
+) -> pd.Series:
+    """cache_key() over whole columns."""
+    keys = canonical_descriptions(descriptions).astype("string")
+    for column in (payees, categories):
+        if column is None:
+            continue
+        part = column.astype("string").str.lower()
+        keys = keys + ("|" + part).where(part.notna() & (part != ""), "")
+    return keys.astype(object)
@@ -0,0 +1,279 @@
+"""
+Shared Asynchronous LLM Dispatcher
+
+All OpenAI calls go through one LLMDispatcher built on AsyncOpenAI. It runs its own
+event loop in a background thread, so synchronous code can submit many requests and
+collect results as they finish, while every caller in the process shares the same
+limits:
+
+- bounded concurrency (OPENAI_MAX_CONCURRENCY in-flight requests)
+- token buckets for requests per minute (OPENAI_RPM) and tokens per minute (OPENAI_TPM)
+- exponential backoff with jitter on 429s, timeouts, connection and 5xx errors,
+  honoring Retry-After when the API sends it
+- a per-call deadline (OPENAI_CALL_DEADLINE seconds) covering all retries
+
+Methods are named by their client attribute path, e.g. "chat.completions.create" or
+"responses.create", and take the same keyword arguments as the OpenAI client.
+
+Usage:
+    from dataextractai.utils.llm_dispatcher import get_dispatcher
+    dispatcher = get_dispatcher()
+    response = dispatcher.call_sync("chat.completions.create", model=m, messages=msgs)
+
+    futures = [dispatcher.submit("responses.create", **kw) for kw in requests]
+    for future in concurrent.futures.as_completed(futures):
+        handle(future.result())
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import openai
+
+logger = logging.getLogger("llm_dispatcher")
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+DEFAULT_RPM = float(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = float(os.getenv("OPENAI_TPM", "200000"))
+DEFAULT_CALL_DEADLINE = float(os.getenv("OPENAI_CALL_DEADLINE", "180"))
+DEFAULT_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "6"))
+# Backoff: base * 2**attempt seconds, capped, then scaled by a random jitter factor
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+# Rough token cost charged for an image part and for the expected completion
+IMAGE_TOKEN_ESTIMATE = 1000
+DEFAULT_OUTPUT_TOKENS = 500
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when a call (including its retries) runs past its deadline."""
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at rate_per_minute / 60 per second."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = max(1.0, float(rate_per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # Requests larger than the bucket would never fit; charge a full bucket instead
+        amount = min(float(amount), self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """Cheap request-size estimate (~4 characters per token) for the token bucket."""
+
+    def walk(value) -> int:
+        if isinstance(value, str):
+            if value.startswith("data:image"):
+                return IMAGE_TOKEN_ESTIMATE
+            return len(value) // 4
+        if isinstance(value, dict):
+            return sum(walk(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(walk(v) for v in value)
+        return 0
+
+    prompt_tokens = walk(kwargs.get("messages") or kwargs.get("input") or [])
+    output_tokens = (
+        kwargs.get("max_tokens")
+        or kwargs.get("max_output_tokens")
+        or kwargs.get("max_completion_tokens")
+        or DEFAULT_OUTPUT_TOKENS
+    )
+    return prompt_tokens + output_tokens
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMDispatcher:
+    """Rate-limited, concurrent front end to AsyncOpenAI shared by all callers."""
+
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        deadline: float = None,
+        max_retries: int = None,
+        client: Any = None,
+    ):
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.request_bucket = TokenBucket(requests_per_minute or DEFAULT_RPM)
+        self.token_bucket = TokenBucket(tokens_per_minute or DEFAULT_TPM)
+        self.deadline = deadline or DEFAULT_CALL_DEADLINE
+        self.max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+        self._client = client
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+
+    # --- event loop management -------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                # Loop-bound primitives are recreated lazily on the new loop
+                self._semaphore = None
+                self.request_bucket._lock = None
+                self.token_bucket._lock = None
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-dispatcher", daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def close(self):
+        """Stop the background event loop (pending calls are cancelled)."""
+        with self._start_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Retries are handled here, with shared backoff, not inside the client
+            self._client = openai.AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"), max_retries=0
+            )
+        return self._client
+
+    def _resolve(self, method: str) -> Callable:
+        target = self.client
+        for attr in method.split("."):
+            target = getattr(target, attr)
+        return target
+
+    # --- async API ---------------------------------------------------------------
+
+    async def call(self, method: str, deadline: float = None, **kwargs) -> Any:
+        """Run one API call with rate limiting, retries and a deadline."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        tokens = estimate_tokens(kwargs)
+        self.stats["calls"] += 1
+        attempt = 0
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                self.stats["failures"] += 1
+                raise LLMDeadlineExceeded(f"{method} exceeded its deadline")
+            try:
+                async with self._semaphore:
+                    await self.request_bucket.acquire(1)
+                    await self.token_bucket.acquire(tokens)
+                    remaining = deadline_at - time.monotonic()
+                    return await asyncio.wait_for(
+                        self._resolve(method)(**kwargs), timeout=max(remaining, 0.001)
+                    )
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    self.stats["rate_limited"] += 1
+                if attempt >= self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt)
+                    delay *= random.uniform(0.5, 1.5)
+                delay = min(delay, max(0.0, deadline_at - time.monotonic()))
+                logger.warning(
+                    f"{method} failed ({type(e).__name__}); retry {attempt + 1} in {delay:.1f}s"
+                )
+                self.stats["retries"] += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception:
+                self.stats["failures"] += 1
+                raise
+
+    # --- sync bridge -------------------------------------------------------------
+
+    def submit(
+        self, method: str, deadline: float = None, **kwargs
+    ) -> concurrent.futures.Future:
+        """Schedule a call from synchronous code; returns a concurrent Future."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self.call(method, deadline=deadline, **kwargs), loop
+        )
+
+    def call_sync(self, method: str, deadline: float = None, **kwargs) -> Any:
+        """Run one call and block until it finishes."""
+        return self.submit(method, deadline=deadline, **kwargs).result()
+
+    def map(
+        self, method: str, requests: Iterable[Dict[str, Any]], return_exceptions=True
+    ) -> List[Any]:
+        """
+        Run many calls concurrently and return results in request order.
+        Failed calls yield their exception when return_exceptions is True.
+        """
+        futures = [self.submit(method, **kwargs) for kwargs in requests]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+
+_default_dispatcher: Optional[LLMDispatcher] = None
+_default_lock = threading.Lock()
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Return the process-wide dispatcher so all callers share one set of limits."""
+    global _default_dispatcher
+    with _default_lock:
+        if _default_dispatcher is None:
+            _default_dispatcher = LLMDispatcher()
+        return _default_dispatcher
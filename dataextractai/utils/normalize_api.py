@@ -2,10 +2,13 @@ import hashlib
 import logging
 from dataextractai.parsers_core.registry import ParserRegistry
 from dataextractai.utils.config import TRANSFORMATION_MAPS
+from dataextractai.utils.transformation_plan import get_plan
+from dataextractai.utils.dedup_index import compute_transaction_hashes
 import pandas as pd
 import os
 from dataextractai.utils.utils import standardize_column_names
 from dataextractai.parsers_core.autodiscover import autodiscover_parsers
+from dataextractai.parsers_core.result_cache import cached_parse
 from dataextractai.parsers.chase_checking import (
     ChaseCheckingParser,
 )  # Ensure parser is registered
@@ -22,6 +25,7 @@ def compute_transaction_id(row):
     """
     Compute a deterministic transaction_id hash from key fields.
     Uses date, amount, description, and account_number if present.
+    For a whole DataFrame use compute_transaction_hashes, which gives the same values.
     """
     key_fields = [
         str(row.get("transaction_date", "")),
@@ -76,7 +80,12 @@ def normalize_parsed_data(file_path, parser_name, client_name=None, config=None)
     if parser_cls is None:
         raise ValueError(f"Parser '{parser_name}' not found in registry.")
     parser = parser_cls()
-    raw_data = parser.parse_file(file_path, config=config)
+    raw_data = cached_parse(
+        parser_name,
+        file_path,
+        lambda: parser.parse_file(file_path, config=config),
+        config=config,
+    )
     df = parser.normalize_data(raw_data)
 
     # Always standardize column names before transformation
@@ -91,18 +100,10 @@ def normalize_parsed_data(file_path, parser_name, client_name=None, config=None)
         source, TRANSFORMATION_MAPS.get(parser_name)
     )
     if transform_map:
-        transformed_df = pd.DataFrame()
-        for target_col, source_col in transform_map.items():
-            if callable(source_col):
-                transformed_df[target_col] = df.apply(source_col, axis=1)
-            elif source_col in df.columns:
-                transformed_df[target_col] = df[source_col]
-            else:
-                transformed_df[target_col] = None
-        df = transformed_df
+        df = get_plan(transform_map).apply(df, missing="none")
 
     # 3. Add deterministic transaction_id
-    df["transaction_hash"] = df.apply(compute_transaction_id, axis=1)
+    df["transaction_hash"] = compute_transaction_hashes(df)
 
     # 4. Validate and filter transactions
     valid_transactions = []
@@ -160,7 +161,13 @@ def normalize_parsed_data_df(file_path, parser_name, client_name=None, config=No
     if parser_cls is None:
         raise ValueError(f"Parser '{parser_name}' not found in registry.")
     parser = parser_cls()
-    raw_data = parser.parse_file(file_path, config=config)
+    # Files already parsed by this parser version come from the parse result cache
+    raw_data = cached_parse(
+        parser_name,
+        file_path,
+        lambda: parser.parse_file(file_path, config=config),
+        config=config,
+    )
     print("[DEBUG] Raw data:", raw_data)
     df = parser.normalize_data(raw_data)
     print("[DEBUG] After normalize_data:", df.head(), df.columns, df.shape)
@@ -173,15 +180,7 @@ def normalize_parsed_data_df(file_path, parser_name, client_name=None, config=No
     )
     if transform_map:
         # Start with a copy of all columns, then overwrite/add mapped columns
-        transformed_df = df.copy()
-        for target_col, source_col in transform_map.items():
-            if callable(source_col):
-                transformed_df[target_col] = df.apply(source_col, axis=1)
-            elif source_col in df.columns:
-                transformed_df[target_col] = df[source_col]
-            else:
-                transformed_df[target_col] = None
-        df = transformed_df
+        df = get_plan(transform_map).apply(df, missing="none", keep_columns=True)
         print("[DEBUG] After transformation map:", df.head(), df.columns, df.shape)
 
     # --- PATCH: Normalize transaction_date to YYYY-MM-DD (match CLI) ---
@@ -223,7 +222,7 @@ def normalize_parsed_data_df(file_path, parser_name, client_name=None, config=No
         print("[DEBUG] After date normalization:", df.head(), df.columns, df.shape)
 
     # Compute and add transaction_hash (SHA256) for deduplication
-    df["transaction_hash"] = df.apply(compute_transaction_id, axis=1)
+    df["transaction_hash"] = compute_transaction_hashes(df)
     # Do NOT overwrite or create 'transaction_id' unless present in the data
 
     # Validate and filter transactions
@@ -0,0 +1,97 @@
+"""
+Concurrent Page Scheduler
+
+Organizer extraction makes one or more vision calls per page and spends nearly all of
+its time waiting on the API. map_pages() runs a per-page function for many pages on a
+thread pool: the steps inside one page (e.g. narrow crop, then the wide crop fallback)
+stay sequential, while different pages overlap. API-wide limits still come from the
+shared LLM dispatcher, so the worker count only bounds how many pages are in progress.
+
+A page whose function raises, or whose result fails retry_if, is retried with
+exponential backoff; a page that still fails is logged and left out of the result.
+Results come back in the order the pages were given, whatever order they finished in.
+
+Usage:
+    from dataextractai.utils.page_scheduler import map_pages
+    labels = map_pages([1, 2, 3], extract_label, retry_if=lambda r: r["errors"])
+    labels[2]
+"""
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger("page_scheduler")
+
+DEFAULT_PAGE_WORKERS = int(os.getenv("ORGANIZER_PAGE_WORKERS", "8"))
+DEFAULT_PAGE_RETRIES = int(os.getenv("ORGANIZER_PAGE_RETRIES", "2"))
+RETRY_BACKOFF_BASE = 1.0
+
+
+def _run_page(
+    page: Hashable,
+    fn: Callable[[Hashable], Any],
+    retries: int,
+    retry_if: Optional[Callable[[Any], bool]],
+) -> Any:
+    attempt = 0
+    while True:
+        try:
+            result = fn(page)
+            if retry_if is None or not retry_if(result) or attempt >= retries:
+                return result
+            reason = "result flagged for retry"
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            reason = f"{type(e).__name__}: {e}"
+        delay = RETRY_BACKOFF_BASE * 2**attempt * random.uniform(0.5, 1.5)
+        logger.warning(
+            f"Page {page} failed ({reason}); retry {attempt + 1} in {delay:.1f}s"
+        )
+        attempt += 1
+        time.sleep(delay)
+
+
+def map_pages(
+    pages: Iterable[Hashable],
+    fn: Callable[[Hashable], Any],
+    workers: int = None,
+    retries: int = None,
+    retry_if: Callable[[Any], bool] = None,
+) -> Dict[Hashable, Any]:
+    """
+    Run fn(page) for every page concurrently and return {page: result} in input order.
+
+    Args:
+        workers: Pages in progress at once (default ORGANIZER_PAGE_WORKERS); 1 runs
+            the pages one after another in the calling thread.
+        retries: Extra attempts per page (default ORGANIZER_PAGE_RETRIES).
+        retry_if: Also retry when this returns True for a page's result; the last
+            result is kept once retries run out.
+    """
+    pages = list(pages)
+    retries = DEFAULT_PAGE_RETRIES if retries is None else retries
+    workers = max(1, min(workers or DEFAULT_PAGE_WORKERS, len(pages) or 1))
+    results = {}
+    if workers == 1:
+        for page in pages:
+            try:
+                results[page] = _run_page(page, fn, retries, retry_if)
+            except Exception as e:
+                logger.error(f"Page {page} failed after {retries} retries: {e}")
+        return results
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page") as pool:
+        futures = [
+            (page, pool.submit(_run_page, page, fn, retries, retry_if))
+            for page in pages
+        ]
+        for page, future in futures:
+            try:
+                results[page] = future.result()
+            except Exception as e:
+                logger.error(f"Page {page} failed after {retries} retries: {e}")
+    return results
@@ -0,0 +1,135 @@
+"""
+Streaming PDF Page Rendering
+
+pdf2image.convert_from_path() rasterizes a whole document into PIL images held in
+memory at once, which for a 100+ page organizer at 200 DPI is several gigabytes. These
+helpers render with PyMuPDF one page at a time instead: every page is rendered, written
+to disk and released before the next one, and pages are split into contiguous ranges
+rendered by a small process pool (each worker opens the document once). Peak memory is
+one page image per worker.
+
+render_crop_png() renders just a region of a page (e.g. the form label) straight to PNG
+bytes, for vision calls that do not need the full page on disk.
+
+Usage:
+    from dataextractai.utils.pdf_render import render_pages
+    paths = render_pages(pdf_path, output_dir, {"thumb": 50, "page": 200})
+    paths[3]["page"]   # output_dir/page_3.png
+    with fitz.open(pdf_path) as doc:
+        png = render_crop_png(doc, 3, {"left": 0, "top": 0, "right": 1, "bottom": 0.1}, 200)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+DEFAULT_RENDER_WORKERS = int(
+    os.getenv("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Below this many pages starting worker processes costs more than it saves
+MIN_PAGES_PER_WORKER = 8
+
+
+def page_count(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def render_page_png(
+    doc: "fitz.Document", page_number: int, dpi: int, path: str, clip=None
+) -> str:
+    """Render one page (1-based), or the clip rectangle of it, to a PNG file."""
+    page = doc[page_number - 1]
+    pix = page.get_pixmap(dpi=dpi, clip=clip)
+    pix.save(path)
+    return path
+
+
+def crop_rect(page: "fitz.Page", crop: Dict[str, float]) -> "fitz.Rect":
+    """The page area of a special_page_configs.json crop (left/top/right/bottom fractions)."""
+    r = page.rect
+    return fitz.Rect(
+        r.x0 + crop["left"] * r.width,
+        r.y0 + crop["top"] * r.height,
+        r.x0 + crop["right"] * r.width,
+        r.y0 + crop["bottom"] * r.height,
+    )
+
+
+def render_crop_png(
+    doc: "fitz.Document", page_number: int, crop: Dict[str, float], dpi: int
+) -> bytes:
+    """
+    Render only the crop region of a page (1-based) and return it as PNG bytes,
+    pixel-identical to cropping a full render at the same DPI.
+    """
+    page = doc[page_number - 1]
+    return page.get_pixmap(dpi=dpi, clip=crop_rect(page, crop)).tobytes("png")
+
+
+def _render_range(
+    pdf_path: str,
+    page_numbers: List[int],
+    output_dir: str,
+    variants: Dict[str, int],
+    skip_existing: bool,
+) -> Dict[int, Dict[str, str]]:
+    results = {}
+    pdf_mtime = os.path.getmtime(pdf_path)
+    with fitz.open(pdf_path) as doc:
+        for page_number in page_numbers:
+            paths = {}
+            for prefix, dpi in variants.items():
+                path = os.path.join(output_dir, f"{prefix}_{page_number}.png")
+                fresh = os.path.exists(path) and os.path.getmtime(path) >= pdf_mtime
+                if not (skip_existing and fresh):
+                    render_page_png(doc, page_number, dpi, path)
+                paths[prefix] = path
+            results[page_number] = paths
+    return results
+
+
+def render_pages(
+    pdf_path: str,
+    output_dir: str,
+    variants: Dict[str, int],
+    page_numbers: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    skip_existing: bool = False,
+) -> Dict[int, Dict[str, str]]:
+    """
+    Render pages to <prefix>_<page>.png for every {prefix: dpi} in variants.
+
+    Args:
+        page_numbers: 1-based pages to render (default: all).
+        workers: Worker processes (default PDF_RENDER_WORKERS); 1 renders in-process.
+        skip_existing: Keep images already newer than the PDF instead of re-rendering.
+
+    Returns:
+        {page_number: {prefix: path}}
+    """
+    if page_numbers is None:
+        page_numbers = list(range(1, page_count(pdf_path) + 1))
+    workers = max(1, min(workers or DEFAULT_RENDER_WORKERS, len(page_numbers)))
+    workers = min(workers, max(1, len(page_numbers) // MIN_PAGES_PER_WORKER))
+    if workers == 1:
+        return _render_range(
+            pdf_path, page_numbers, output_dir, variants, skip_existing
+        )
+
+    # Contiguous ranges keep each worker's reads local in the file
+    size = -(-len(page_numbers) // workers)
+    chunks = [page_numbers[i : i + size] for i in range(0, len(page_numbers), size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _render_range, pdf_path, chunk, output_dir, variants, skip_existing
+            )
+            for chunk in chunks
+        ]
+        for future in futures:
+            results.update(future.result())
+    return results
@@ -0,0 +1,57 @@
+"""
+Single-Flight Call Coalescing
+
+When many threads resolve the same key at once (e.g. the same monthly subscription on
+several statement rows, all missing the cache because none of them has finished yet),
+only the first caller runs the work. Callers that arrive while it is in flight wait for
+it and receive the same result, or the same exception. Once the call finishes the key
+is forgotten, so later callers are expected to find the result in a cache that the
+leader's function filled.
+
+Usage:
+    from dataextractai.utils.single_flight import SingleFlight
+    flights = SingleFlight()
+    result = flights.do(("payee", cache_key), lambda: resolve_and_cache(...))
+    flights.stats()   # {"calls": ..., "coalesced": ...}
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome with waiters."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,246 @@
+"""
+Memoized Stage Graph
+
+Multi-step document workflows (the organizer pipeline: TOC, split, render, raw text,
+labels, fields, manifest) redo every step each time they are called, even for the same
+file. StageGraph runs named stages in dependency order and caches every artifact under
+the input file's SHA-256, the stage name and the stage config. A cached artifact is
+reused while the artifacts it was computed from are unchanged and any files it wrote
+are still on disk untouched; otherwise it is recomputed, and so is everything
+downstream of it.
+
+Per-page stages cache one artifact per page: asking for a subset of pages computes only
+the pages that are missing. Artifacts must be JSON-serializable. Entries live in
+<cache_dir>/stage_cache.json; an entry for a different input file in the same directory
+is discarded. Set STAGE_CACHE_DISABLED=1 to recompute everything (results are still
+shared within one StageGraph).
+
+Usage:
+    from dataextractai.utils.stage_graph import StageGraph
+    graph = StageGraph(pdf_path, output_dir, page_numbers=[1, 2, 3])
+    graph.add("split", split_fn, per_page=True, files=lambda a: [a["pdf_path"]])
+    graph.add("text", text_fn, deps=["split"], per_page=True, config={"engine": "pypdf"})
+    graph.run("text", pages=[2])   # {2: {...}}; split and text run for page 2 only
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from dataextractai.parsers_core.document import compute_content_hash
+
+STORE_FILENAME = "stage_cache.json"
+# Bump when the on-disk entry layout changes
+STORE_FORMAT = "1"
+
+
+def cache_disabled() -> bool:
+    return os.getenv("STAGE_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+def artifact_digest(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value, independent of dict ordering."""
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _fingerprint(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+@dataclass
+class Stage:
+    """
+    One step of a StageGraph.
+
+    fn receives each dependency's artifact as a keyword argument named after the
+    dependency. Per-page stages are called as fn(pages, **deps) with only the pages that
+    need computing and return {page: artifact}; dependencies that are per-page arrive
+    as {page: artifact}. files(artifact) lists the files an artifact depends on, and
+    cache_if(artifact) can veto caching (e.g. after a failed LLM call).
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    deps: Sequence[str] = ()
+    config: Dict[str, Any] = field(default_factory=dict)
+    per_page: bool = False
+    files: Optional[Callable[[Any], List[str]]] = None
+    cache_if: Optional[Callable[[Any], bool]] = None
+
+
+class StageGraph:
+    """Runs stages in dependency order, caching artifacts per input file and config."""
+
+    def __init__(
+        self,
+        input_path: str,
+        cache_dir: str,
+        page_numbers: Sequence[int] = (),
+        enabled: bool = None,
+    ):
+        self.input_path = input_path
+        self.cache_dir = cache_dir
+        self.page_numbers = list(page_numbers)
+        self.enabled = (not cache_disabled()) if enabled is None else enabled
+        self.input_hash = compute_content_hash(input_path)
+        self.stages: Dict[str, Stage] = {}
+        self.computed: Dict[str, int] = {}
+        self.store_path = os.path.join(cache_dir, STORE_FILENAME)
+        self._entries = self._load() if self.enabled else {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: Sequence[str] = (),
+        config: Dict[str, Any] = None,
+        per_page: bool = False,
+        files: Callable[[Any], List[str]] = None,
+        cache_if: Callable[[Any], bool] = None,
+    ) -> Stage:
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        stage = Stage(name, fn, tuple(deps), config or {}, per_page, files, cache_if)
+        self.stages[name] = stage
+        return stage
+
+    def key(self, name: str) -> str:
+        stage = self.stages[name]
+        return artifact_digest([STORE_FORMAT, name, stage.config])
+
+    def run(self, name: str, pages: Sequence[int] = None) -> Any:
+        """
+        Return the stage's artifact, computing it (and its dependencies) only where the
+        cache has nothing valid. pages limits per-page stages (default: all pages);
+        per-page stages return {page: artifact}.
+        """
+        stage = self.stages[name]
+        pages = self.page_numbers if pages is None else list(pages)
+        dep_results = {dep: self.run(dep, pages) for dep in stage.deps}
+        if stage.per_page:
+            return self._run_per_page(stage, pages, dep_results)
+        return self._run_whole(stage, dep_results)
+
+    def invalidate(self, name: str):
+        """Drop cached artifacts of a stage (downstream stages recompute on next run)."""
+        self._entries.pop(self.key(name), None)
+        self._save()
+
+    def _run_whole(self, stage: Stage, dep_results: Dict[str, Any]) -> Any:
+        key = self.key(stage.name)
+        inputs = artifact_digest(
+            {
+                dep: (
+                    {page: self._dep_state(dep, page) for page in sorted(result)}
+                    if self.stages[dep].per_page
+                    else self._dep_state(dep)
+                )
+                for dep, result in dep_results.items()
+            }
+        )
+        entry = self._entries.get(key)
+        if entry is not None and self._valid(entry, inputs):
+            return entry["artifact"]
+        artifact = stage.fn(**dep_results)
+        self.computed[stage.name] = self.computed.get(stage.name, 0) + 1
+        self._entries[key] = self._entry(stage, artifact, inputs)
+        self._save()
+        return artifact
+
+    def _run_per_page(
+        self, stage: Stage, pages: List[int], dep_results: Dict[str, Any]
+    ) -> Dict[int, Any]:
+        key = self.key(stage.name)
+        cached = self._entries.setdefault(key, {"pages": {}})["pages"]
+        inputs = {page: self._page_inputs(dep_results, page) for page in pages}
+        missing = [
+            page
+            for page in pages
+            if not (
+                str(page) in cached and self._valid(cached[str(page)], inputs[page])
+            )
+        ]
+        if missing:
+            for page in missing:
+                cached.pop(str(page), None)
+            new = stage.fn(missing, **dep_results) or {}
+            self.computed[stage.name] = self.computed.get(stage.name, 0) + len(new)
+            for page, artifact in new.items():
+                cached[str(page)] = self._entry(stage, artifact, inputs[page])
+            self._save()
+        # Pages a stage could not produce are left out of the result
+        return {
+            page: cached[str(page)]["artifact"] for page in pages if str(page) in cached
+        }
+
+    def _page_inputs(self, dep_results: Dict[str, Any], page: int) -> str:
+        return artifact_digest({dep: self._dep_state(dep, page) for dep in dep_results})
+
+    def _dep_state(self, dep: str, page: int = None) -> Any:
+        # A dependency's artifact plus its file fingerprints, so rewriting an upstream
+        # file (even with an identical artifact) invalidates what was built from it
+        entry = self._entries.get(self.key(dep), {})
+        if self.stages[dep].per_page:
+            entry = entry.get("pages", {}).get(str(page), {})
+        return [entry.get("artifact"), entry.get("files")]
+
+    def _entry(self, stage: Stage, artifact: Any, inputs: str) -> Dict[str, Any]:
+        files = stage.files(artifact) if stage.files and artifact else []
+        entry = {
+            "inputs": inputs,
+            "artifact": artifact,
+            "files": {path: _fingerprint(path) for path in files if path},
+        }
+        if stage.cache_if is not None and not stage.cache_if(artifact):
+            # Served for this run only; the next run computes it again
+            entry["inputs"] = None
+        return entry
+
+    @staticmethod
+    def _valid(entry: Dict[str, Any], inputs: str) -> bool:
+        if entry.get("inputs") != inputs:
+            return False
+        return all(
+            fingerprint is not None and _fingerprint(path) == fingerprint
+            for path, fingerprint in entry.get("files", {}).items()
+        )
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                store = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Discarding unreadable stage cache {self.store_path}: {e}")
+            return {}
+        if store.get("input_hash") != self.input_hash:
+            return {}
+        return store.get("entries", {})
+
+    def _save(self):
+        if not self.enabled:
+            return
+        store = {"input_hash": self.input_hash, "entries": self._entries}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write atomically so an interrupted run never leaves a partial store
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(store, f)
+            os.replace(tmp_path, self.store_path)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not write stage cache {self.store_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
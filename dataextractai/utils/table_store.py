@@ -0,0 +1,189 @@
+"""
+Pipeline Table Storage
+
+Parser outputs (<parser>_output), per-statement normalized dumps, the consolidated
+normalized transactions and the classifier pass files are stage tables. By default they
+are CSV files, as before. With PIPELINE_STORAGE_FORMAT=parquet (and pyarrow installed)
+each table is stored as Parquet next to where its CSV would be, with a typed schema
+derived from TransactionRecord plus the columns the pipeline adds, so later stages skip
+text parsing and dtype inference and can read only the columns they need.
+
+CSV stays the export format: tables written with export_csv=True (the consolidated
+normalized file and the final classifier output) are also written as CSV for people and
+downstream tools. Intermediate tables are Parquet only.
+
+Tables are always named by their CSV path; read_table() picks the Parquet file when
+parquet storage is on and it is at least as new as the CSV, and falls back to the CSV
+otherwise, so directories written before the switch keep working.
+
+Usage:
+    from dataextractai.utils.table_store import read_table, write_table
+    write_table(df, os.path.join(output_dir, "bofa_bank_output.csv"))
+    df = read_table(path, columns=["transaction_date", "amount"])
+    df = read_table(path, as_text=True)   # same values as read_csv(dtype=str)
+"""
+
+import json
+import os
+import typing
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ..parsers_core.models import TransactionRecord
+
+STORAGE_FORMAT = os.getenv("PIPELINE_STORAGE_FORMAT", "csv").lower()
+
+# Columns the normalizer adds on top of TransactionRecord
+PIPELINE_COLUMNS = {
+    "normalized_date": "datetime64[ns]",
+    "normalized_amount": "float64",
+    "transaction_id": "Int64",
+}
+_ANNOTATION_DTYPES = {str: "string", float: "float64", int: "Int64", bool: "boolean"}
+
+
+@lru_cache(maxsize=None)
+def _have_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print(
+            "[WARN] PIPELINE_STORAGE_FORMAT=parquet needs pyarrow; "
+            "falling back to CSV storage"
+        )
+        return False
+    return True
+
+
+def parquet_enabled() -> bool:
+    return STORAGE_FORMAT == "parquet" and _have_pyarrow()
+
+
+@lru_cache(maxsize=None)
+def transaction_dtypes() -> Dict[str, str]:
+    """Pandas dtypes of the typed columns: TransactionRecord fields, then pipeline ones."""
+    dtypes = {}
+    for name, field in TransactionRecord.model_fields.items():
+        annotation = field.annotation
+        # Optional[X] -> X
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+            annotation = args[0]
+        if annotation in _ANNOTATION_DTYPES:
+            dtypes[name] = _ANNOTATION_DTYPES[annotation]
+    dtypes.update(PIPELINE_COLUMNS)
+    return dtypes
+
+
+def parquet_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def resolve_table(csv_path: str) -> Optional[str]:
+    """The file read_table() would read for this table, or None if there is none."""
+    pq_path = parquet_path(csv_path)
+    if parquet_enabled() and os.path.exists(pq_path):
+        if not os.path.exists(csv_path) or (
+            os.path.getmtime(pq_path) >= os.path.getmtime(csv_path)
+        ):
+            return pq_path
+    return csv_path if os.path.exists(csv_path) else None
+
+
+def table_exists(csv_path: str) -> bool:
+    return resolve_table(csv_path) is not None
+
+
+def list_tables(directory: str, suffix: str) -> List[str]:
+    """Sorted CSV-style names of the tables in directory whose stem ends with suffix."""
+    names = set()
+    for file in os.listdir(directory):
+        stem, ext = os.path.splitext(file)
+        if stem.endswith(suffix) and (
+            ext == ".csv" or (ext == ".parquet" and parquet_enabled())
+        ):
+            names.add(stem + ".csv")
+    return sorted(names)
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast known columns to their schema dtype and the rest to something Arrow stores."""
+    df = df.copy()
+    dtypes = transaction_dtypes()
+    for col in df.columns:
+        series = df[col]
+        dtype = dtypes.get(col)
+        if dtype in ("float64", "Int64"):
+            numbers = pd.to_numeric(series, errors="coerce")
+            # Keep values that are not plain numbers (e.g. "$1,200.00") as text
+            if not (numbers.isna() & series.notna()).any():
+                df[col] = numbers.astype(dtype)
+                continue
+        elif dtype == "datetime64[ns]":
+            df[col] = pd.to_datetime(series, errors="coerce")
+            continue
+        if series.dtype == object or dtype == "string":
+            df[col] = series.map(
+                lambda v: (
+                    None
+                    if v is None or (isinstance(v, float) and pd.isna(v))
+                    else json.dumps(v) if isinstance(v, (dict, list)) else str(v)
+                )
+            ).astype("string")
+    return df
+
+
+def _as_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Values as strings with NaN for missing, like read_csv(dtype=str)."""
+    text = df.copy()
+    for col in text.columns:
+        series = text[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # Formats like to_csv: date only unless some value has a time of day
+            values = series.astype(str)
+        elif pd.api.types.is_float_dtype(series):
+            values = series.map(repr, na_action="ignore")
+        else:
+            values = series.astype(object).map(str, na_action="ignore")
+        text[col] = values.astype(object).where(series.notna())
+    return text
+
+
+def write_table(df: pd.DataFrame, csv_path: str, export_csv: bool = False) -> str:
+    """
+    Store a stage table. Returns the path written (the Parquet file when parquet
+    storage is on). The CSV is written when parquet is off or export_csv is True.
+    """
+    if not parquet_enabled():
+        df.to_csv(csv_path, index=False)
+        return csv_path
+    if export_csv:
+        df.to_csv(csv_path, index=False)
+    # Written after the CSV export so read_table() prefers it
+    pq_path = parquet_path(csv_path)
+    _typed(df).to_parquet(pq_path, index=False)
+    return pq_path
+
+
+def read_table(
+    csv_path: str, columns: Optional[List[str]] = None, as_text: bool = False
+) -> pd.DataFrame:
+    """
+    Read a stage table, optionally only some of its columns (missing ones are
+    skipped). as_text returns every value as a string, like read_csv(dtype=str).
+    """
+    path = resolve_table(csv_path)
+    if path is None:
+        raise FileNotFoundError(csv_path)
+    if path.endswith(".parquet"):
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            available = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in available]
+        df = pd.read_parquet(path, columns=columns)
+        return _as_text(df) if as_text else df
+    usecols = (lambda c: c in columns) if columns is not None else None
+    return pd.read_csv(path, usecols=usecols, dtype=str if as_text else None)
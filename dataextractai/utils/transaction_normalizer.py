@@ -1,27 +1,116 @@
 """Transaction normalizer for aggregating bank outputs into a single CSV."""
 
+import hashlib
+import json
 import os
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
-import re
 from .data_transformation import apply_transformation_map
 from .config import TRANSFORMATION_MAPS
+from .transformation_plan import get_plan
+from .description_key import NOISE as DESCRIPTION_NOISE
+from .dedup_index import (
+    DEDUP_FIELDS,
+    DEDUP_MODE,
+    DedupIndex,
+    compute_transaction_hashes,
+)
+from .table_store import (
+    list_tables,
+    read_table,
+    resolve_table,
+    table_exists,
+    write_table,
+)
 
 transaction_normalizer_logger = logging.getLogger("transaction_normalizer")
 
+# Date formats parsed column-wise before falling back to per-value parsing. Each one
+# must parse exactly like pd.to_datetime(value) (so no two-digit years, no day-first).
+FAST_DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y"]
+
+# Per output file content hash and row count from the last normalization run
+MANIFEST_FILE = "normalization_manifest.json"
+DEDUP_INDEX_FILE = "dedup_index.db"
+
+
+def _dedup_sources(df: pd.DataFrame) -> pd.Series:
+    """The statement each row came from, for the dedup index."""
+    return df["file_path"].fillna(df["output_file"])
+
+
+def _has_account(df: pd.DataFrame) -> pd.Series:
+    """Rows whose account number is known."""
+    if "account_number" not in df.columns:
+        return pd.Series(False, index=df.index)
+    accounts = df["account_number"].astype("string").str.strip()
+    return (accounts.notna() & (accounts != "")).fillna(False).astype(bool)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _format_dates(dates: pd.Series) -> pd.Series:
+    """Format datetimes as YYYY-MM-DD, with None for missing values."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        formatted = dates.dt.strftime("%Y-%m-%d").astype(object)
+        return formatted.where(dates.notna(), None)
+    return dates.apply(lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else None)
+
+
+def _date_problem(value) -> Optional[str]:
+    """Scalar transaction_date check from _is_valid_row (value is not missing)."""
+    if not isinstance(value, str):
+        return f"transaction_date is not a string: {value}"
+    try:
+        pd.to_datetime(value)
+    except Exception:
+        return f"transaction_date not parseable: {value}"
+    return None
+
+
+def _amount_problem(value) -> Optional[str]:
+    """Scalar amount check from _is_valid_row (value is not missing)."""
+    try:
+        float(value)
+    except Exception:
+        return f"amount not parseable: {value}"
+    return None
+
 
 class TransactionNormalizer:
     """Normalizes and aggregates transactions from different bank outputs.
 
     If dump_per_statement is True, writes a normalized CSV for each input statement file
     (containing only valid rows) to output/normalized_per_statement/.
+
+    If incremental is True, only output files added or changed since the last run are
+    normalized and merged into the existing consolidated CSV (see MANIFEST_FILE).
+
+    Rows get a transaction_hash, and rows already seen from another statement are
+    dropped or flagged per dedup_mode ("drop", "flag" or "off"; see dedup_index).
     """
 
-    def __init__(self, client_name: str, dump_per_statement: bool = False):
+    def __init__(
+        self,
+        client_name: str,
+        dump_per_statement: bool = False,
+        incremental: bool = False,
+        dedup_mode: str = None,
+    ):
         self.client_name = client_name
         self.output_dir = os.path.join("data", "clients", client_name, "output")
+        self.manifest_path = os.path.join(self.output_dir, MANIFEST_FILE)
+        self.incremental = incremental
+        self.dedup_mode = (dedup_mode or DEDUP_MODE).lower()
         self.problem_rows = []  # Store tuples of (row_dict, reason)
         self.dump_per_statement = dump_per_statement
         if self.dump_per_statement:
@@ -112,216 +201,342 @@ class TransactionNormalizer:
 
         return pd.NaT
 
-    def normalize_transactions(self) -> pd.DataFrame:
+    def _interest_credit_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Interest credits that carry a statement end date to use as their date."""
+        if "description" not in df.columns or "statement_end_date" not in df.columns:
+            return pd.Series(False, index=df.index)
+        return (
+            df["description"]
+            .astype(str)
+            .str.contains("INTEREST CREDIT", regex=False, na=False)
+            & df["statement_end_date"].notna()
+        )
+
+    def normalize_dates(self, df: pd.DataFrame) -> pd.Series:
+        """Column-wise normalize_date over df["transaction_date"].
+
+        Values matching FAST_DATE_FORMATS are parsed in one vectorized call per format
+        (those formats parse exactly as pd.to_datetime does for a single value); the
+        rest go through normalize_date once per distinct value.
+        """
+        dates = df["transaction_date"]
+        parsed = np.full(len(df), pd.NaT, dtype=object)
+        todo = dates.notna().to_numpy(copy=True)
+        if todo.any() and pd.api.types.is_string_dtype(dates):
+            for fmt in FAST_DATE_FORMATS:
+                fast = pd.to_datetime(dates, format=fmt, errors="coerce")
+                hit = todo & fast.notna().to_numpy()
+                parsed[hit] = fast[hit].to_numpy(dtype=object)
+                todo &= ~hit
+                if not todo.any():
+                    break
+        if todo.any():
+            remaining = dates[todo]
+            lookup = {
+                value: self.normalize_date(value) for value in pd.unique(remaining)
+            }
+            parsed[todo] = [lookup[value] for value in remaining]
+
+        # Interest credits always take the statement end date
+        interest = self._interest_credit_mask(df).to_numpy()
+        if interest.any():
+            parsed[interest] = pd.to_datetime(
+                df.loc[interest, "statement_end_date"],
+                format="%Y-%m-%d",
+                errors="coerce",
+            ).to_numpy(dtype=object)
+        return pd.Series(parsed, index=df.index).infer_objects()
+
+    def invalid_reasons(self, df: pd.DataFrame) -> pd.Series:
+        """Column-wise _is_valid_row: the first failing check per row, or None.
+
+        Missing values are found with masks; date and amount parsing is checked with
+        vectorized parsers, falling back to the scalar checks once per distinct value.
+        """
+        reasons = pd.Series(None, index=df.index, dtype=object)
+        for field in ["transaction_date", "description", "amount"]:
+            open_rows = reasons.isna()
+            if not open_rows.any():
+                break
+            if field not in df.columns:
+                reasons[open_rows] = f"Missing or invalid field: {field}"
+                continue
+            values = df.loc[open_rows, field]
+            missing = values.isna() | values.astype(str).str.strip().eq("")
+            reasons[missing[missing].index] = f"Missing or invalid field: {field}"
+            values = values[~missing]
+            if field == "transaction_date":
+                ok = pd.Series(False, index=values.index)
+                # is_string_dtype also holds for object columns of only strings
+                if pd.api.types.is_string_dtype(values):
+                    for fmt in FAST_DATE_FORMATS:
+                        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+                        ok |= parsed.notna()
+                check = _date_problem
+            elif field == "amount":
+                ok = pd.to_numeric(values, errors="coerce").notna()
+                check = _amount_problem
+            else:
+                continue
+            values = values[~ok]
+            if values.empty:
+                continue
+            lookup = {value: check(value) for value in pd.unique(values)}
+            reasons[values.index] = [lookup[value] for value in values]
+        return reasons.astype(object).where(reasons.notna(), None)
+
+    def _split_valid(self, df: pd.DataFrame, context: str = None) -> pd.DataFrame:
+        """Return the valid rows of df and record the others as problem rows."""
+        reasons = self.invalid_reasons(df)
+        invalid = reasons.notna()
+        if invalid.any():
+            for row, reason in zip(
+                df[invalid].to_dict(orient="records"), reasons[invalid]
+            ):
+                if context:
+                    self.problem_rows.append((row, f"{context}: {reason}"))
+                    transaction_normalizer_logger.warning(
+                        f"Dropping invalid row from {context}: {reason} | Data: {row}"
+                    )
+                else:
+                    self.problem_rows.append((row, reason))
+                    transaction_normalizer_logger.warning(
+                        f"Dropping invalid row: {reason} | Data: {row}"
+                    )
+        if invalid.all():
+            return pd.DataFrame()
+        return df[~invalid].reset_index(drop=True)
+
+    def normalize_transactions(self, incremental: bool = None) -> pd.DataFrame:
         """Aggregate and normalize all transaction files into a single DataFrame. Only valid rows are included in the output. Problem rows are stored for review.
         If dump_per_statement is True, also writes a normalized CSV for each input statement file (valid rows only).
         Interest credit date logic is only applied if 'statement_end_date' exists.
+
+        In incremental mode only output files that are new or changed since the last
+        run (per the normalization manifest) are normalized; rows from unchanged files
+        are kept from the existing consolidated CSV with their transaction_ids, and
+        rows of files that no longer exist are dropped.
         """
-        all_transactions = []
+        if incremental is None:
+            incremental = self.incremental
         self.problem_rows = []  # Reset for each run
 
-        # Find all CSV files in the output directory
-        for file in os.listdir(self.output_dir):
-            if file.endswith("_output.csv"):
-                file_path = os.path.join(self.output_dir, file)
-                try:
-                    # Read CSV with all columns as strings initially
-                    df = pd.read_csv(file_path, dtype=str)
-                    transaction_normalizer_logger.info(
-                        f"Loaded {len(df)} rows from {file}"
-                    )
-                    transaction_normalizer_logger.info(
-                        f"Columns in {file}: {df.columns.tolist()}"
-                    )
+        output_files = list_tables(self.output_dir, "_output")
+        fingerprints = {
+            f: _file_sha256(resolve_table(os.path.join(self.output_dir, f)))
+            for f in output_files
+        }
+        manifest = self._load_manifest()
+        existing = self._load_consolidated() if incremental else None
+        dedup_index = (
+            DedupIndex(os.path.join(self.output_dir, DEDUP_INDEX_FILE))
+            if self.dedup_mode in ("drop", "flag")
+            else None
+        )
+
+        if existing is not None:
+            to_process = [
+                f
+                for f in output_files
+                if manifest.get(f, {}).get("sha256") != fingerprints[f]
+            ]
+            stale = set(to_process) | (set(manifest) - set(output_files))
+            if not stale:
+                transaction_normalizer_logger.info(
+                    "No new or changed output files; consolidated transactions are up to date"
+                )
+                return existing
+            kept_df = existing[~existing["output_file"].isin(stale)]
+            previous_df = existing[existing["output_file"].isin(stale)]
+            manifest = {f: e for f, e in manifest.items() if f not in stale}
+            if dedup_index is not None:
+                dedup_index.forget(_dedup_sources(previous_df))
+            transaction_normalizer_logger.info(
+                f"Incremental normalization: {len(to_process)} new or changed files, "
+                f"{len(output_files) - len(to_process)} unchanged"
+            )
+        else:
+            if incremental:
+                transaction_normalizer_logger.info(
+                    "No usable consolidated output for incremental mode; normalizing all files"
+                )
+            to_process = output_files
+            kept_df = previous_df = None
+            if dedup_index is not None:
+                dedup_index.clear()
+            manifest = {}
 
-                    # Get source name from file
-                    source = file.replace("_output.csv", "")
-
-                    # Add source column if not present
-                    if "source" not in df.columns:
-                        df["source"] = source
-
-                    # Reset index to avoid duplicate indices
-                    df = df.reset_index(drop=True)
-
-                    # Apply transformation map if available
-                    if source in TRANSFORMATION_MAPS:
-                        transaction_normalizer_logger.info(
-                            f"Applying transformation map for {source}"
-                        )
-                        transaction_normalizer_logger.info(
-                            f"Transformation map: {TRANSFORMATION_MAPS[source]}"
-                        )
-                        transaction_normalizer_logger.info(
-                            f"Available columns before transform: {df.columns.tolist()}"
-                        )
-
-                        # Create a new DataFrame with transformed columns
-                        transformed_df = pd.DataFrame()
-                        transform_map = TRANSFORMATION_MAPS[source]
-
-                        for target_col, source_col in transform_map.items():
-                            if callable(source_col):
-                                transformed_df[target_col] = df.apply(
-                                    source_col, axis=1
-                                )
-                            elif source_col in df.columns:
-                                transformed_df[target_col] = df[source_col]
-                            else:
-                                transaction_normalizer_logger.warning(
-                                    f"Column {source_col} not found in source data for {target_col}"
-                                )
-
-                        df = transformed_df
-                        transaction_normalizer_logger.info(
-                            f"Columns after transform: {df.columns.tolist()}"
-                        )
-
-                    # Log any rows with missing required columns
-                    required_cols = ["transaction_date", "description", "amount"]
-                    missing_cols = [
-                        col for col in required_cols if col not in df.columns
-                    ]
-                    if missing_cols:
-                        transaction_normalizer_logger.error(
-                            f"Missing required columns in {file}: {missing_cols}"
-                        )
-                        transaction_normalizer_logger.error(
-                            f"Available columns: {df.columns.tolist()}"
-                        )
-                        continue
-
-                    # Log any rows with missing transaction dates
-                    missing_dates = df["transaction_date"].isna().sum()
-                    if missing_dates > 0:
-                        transaction_normalizer_logger.warning(
-                            f"Found {missing_dates} rows with missing dates in {file}"
-                        )
-                        # Log the problematic rows
-                        problematic_rows = df[df["transaction_date"].isna()]
-                        for _, row in problematic_rows.iterrows():
-                            transaction_normalizer_logger.warning(
-                                f"Row with missing date: {row.to_dict()}"
-                            )
-                            # For interest credits with missing dates, use the statement end date
-                            if (
-                                "description" in row
-                                and "INTEREST CREDIT" in str(row["description"])
-                                and "statement_end_date" in row
-                                and not pd.isna(row["statement_end_date"])
-                            ):
-                                df.loc[row.name, "transaction_date"] = row[
-                                    "statement_end_date"
-                                ]
-
-                    # Add file_path if not present
-                    if "file_path" not in df.columns:
-                        df["file_path"] = file_path
-
-                    # Convert dates and amounts
-                    if "transaction_date" in df.columns:
-                        df["normalized_date"] = df.apply(
-                            lambda row: self.normalize_date(
-                                row["transaction_date"], row
-                            ),
-                            axis=1,
-                        )
-                        # Count and log rows with NaT dates
-                        nat_count = df["normalized_date"].isna().sum()
-                        if nat_count > 0:
-                            transaction_normalizer_logger.warning(
-                                f"Warning: {nat_count} rows have invalid dates in {file}"
-                            )
-                            # Log the problematic rows
-                            problematic_rows = df[df["normalized_date"].isna()]
-                            for _, row in problematic_rows.iterrows():
-                                transaction_normalizer_logger.warning(
-                                    f"Row with missing date: {row.to_dict()}"
-                                )
-                                # For interest credits with missing dates, use the statement end date
-                                if (
-                                    "description" in row
-                                    and "INTEREST CREDIT" in str(row["description"])
-                                    and "statement_end_date" in row
-                                    and not pd.isna(row["statement_end_date"])
-                                ):
-                                    df.loc[row.name, "normalized_date"] = (
-                                        pd.to_datetime(
-                                            row["statement_end_date"],
-                                            format="%Y-%m-%d",
-                                            errors="coerce",
-                                        )
-                                    )
-                    else:
-                        transaction_normalizer_logger.warning(
-                            f"Warning: 'transaction_date' column not found in {file}"
-                        )
-                        transaction_normalizer_logger.warning(
-                            f"Available columns: {df.columns.tolist()}"
-                        )
-
-                    if "amount" in df.columns:
-                        df["normalized_amount"] = pd.to_numeric(
-                            df["amount"].str.replace("$", "").str.replace(",", ""),
-                            errors="coerce",
-                        )
-                    else:
-                        transaction_normalizer_logger.warning(
-                            f"Warning: 'amount' column not found in {file}"
-                        )
-
-                    # After transformation, strict validation for this file
-                    valid_rows = []
-                    for row in df.to_dict(orient="records"):
-                        is_valid, reason = self._is_valid_row(row)
-                        if is_valid:
-                            valid_rows.append(row)
-                        else:
-                            self.problem_rows.append((row, f"{file}: {reason}"))
-                            transaction_normalizer_logger.warning(
-                                f"Dropping invalid row from {file}: {reason} | Data: {row}"
-                            )
-                    valid_df = pd.DataFrame(valid_rows)
-                    all_transactions.append(valid_df)
-
-                    # Dump per-statement file if enabled
-                    if self.dump_per_statement:
-                        out_name = os.path.splitext(file)[0] + "_normalized.csv"
-                        out_path = os.path.join(self.per_statement_dir, out_name)
-                        valid_df.to_csv(out_path, index=False)
-                        transaction_normalizer_logger.info(
-                            f"Wrote per-statement normalized file: {out_path}"
-                        )
-
-                except Exception as e:
-                    transaction_normalizer_logger.error(f"Error loading {file}: {e}")
-
-        if not all_transactions:
+        all_transactions = []
+        for file in to_process:
+            problems_before = len(self.problem_rows)
+            try:
+                valid_df = self._normalize_file(file)
+            except Exception as e:
+                transaction_normalizer_logger.error(f"Error loading {file}: {e}")
+                continue
+            if valid_df is None:
+                continue
+            all_transactions.append(valid_df)
+            manifest[file] = {
+                "sha256": fingerprints[file],
+                "rows": len(valid_df) + len(self.problem_rows) - problems_before,
+                "valid_rows": len(valid_df),
+                "normalized_at": datetime.now().isoformat(),
+            }
+
+        if not all_transactions and kept_df is None:
             transaction_normalizer_logger.warning(
                 "No transaction files found to normalize"
             )
             return pd.DataFrame()
 
-        # Combine all valid transactions
-        combined_df = pd.concat(all_transactions, ignore_index=True)
+        if all_transactions:
+            # Combine all valid transactions
+            combined_df = pd.concat(all_transactions, ignore_index=True)
+            if kept_df is None:
+                # Add a unique transaction ID
+                combined_df["transaction_id"] = combined_df.index + 1
+            valid_df = self._finalize(combined_df)
+            if valid_df is None:
+                return pd.DataFrame()
+            valid_df = self._deduplicate(valid_df, dedup_index)
+        else:
+            valid_df = pd.DataFrame()
+
+        if kept_df is not None:
+            valid_df = self._assign_stable_ids(valid_df, kept_df, previous_df)
+            valid_df = pd.concat([kept_df, valid_df], ignore_index=True)
+            valid_df = valid_df.sort_values("transaction_id", kind="stable")
+            valid_df = valid_df.reset_index(drop=True)
+
+        # Save valid transactions
+        output_file = write_table(valid_df, self._consolidated_path(), export_csv=True)
+        transaction_normalizer_logger.info(
+            f"Saved normalized transactions to {output_file}"
+        )
+        self._save_manifest(manifest)
+
+        return valid_df
+
+    def _normalize_file(self, file: str) -> Optional[pd.DataFrame]:
+        """Load, transform and validate one *_output.csv. Returns None if unusable."""
+        file_path = os.path.join(self.output_dir, file)
+        # Read CSV with all columns as strings initially
+        df = read_table(file_path, as_text=True)
+        transaction_normalizer_logger.info(f"Loaded {len(df)} rows from {file}")
+        transaction_normalizer_logger.info(f"Columns in {file}: {df.columns.tolist()}")
+
+        # Get source name from file
+        source = file.replace("_output.csv", "")
+
+        # Add source column if not present
+        if "source" not in df.columns:
+            df["source"] = source
+
+        # Reset index to avoid duplicate indices
+        df = df.reset_index(drop=True)
+
+        # Apply transformation map if available
+        if source in TRANSFORMATION_MAPS:
+            transaction_normalizer_logger.info(
+                f"Applying transformation map for {source}"
+            )
+            transaction_normalizer_logger.info(
+                f"Transformation map: {TRANSFORMATION_MAPS[source]}"
+            )
+            transaction_normalizer_logger.info(
+                f"Available columns before transform: {df.columns.tolist()}"
+            )
+
+            # Create a new DataFrame with transformed columns
+            plan = get_plan(TRANSFORMATION_MAPS[source])
+            for target_col, source_col in plan.missing_columns(df).items():
+                transaction_normalizer_logger.warning(
+                    f"Column {source_col} not found in source data for {target_col}"
+                )
+            df = plan.apply(df, missing="omit")
+            transaction_normalizer_logger.info(
+                f"Columns after transform: {df.columns.tolist()}"
+            )
+
+        # Log any rows with missing required columns
+        required_cols = ["transaction_date", "description", "amount"]
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            transaction_normalizer_logger.error(
+                f"Missing required columns in {file}: {missing_cols}"
+            )
+            transaction_normalizer_logger.error(
+                f"Available columns: {df.columns.tolist()}"
+            )
+            return None
 
-        # Add a unique transaction ID
-        combined_df["transaction_id"] = combined_df.index + 1
+        # Log any rows with missing transaction dates
+        missing_dates = df["transaction_date"].isna()
+        if missing_dates.any():
+            transaction_normalizer_logger.warning(
+                f"Found {missing_dates.sum()} rows with missing dates in {file}"
+            )
+            transaction_normalizer_logger.warning(
+                f"Rows with missing date: {df[missing_dates].to_dict(orient='records')}"
+            )
+            # For interest credits with missing dates, use the statement end date
+            fill = missing_dates & self._interest_credit_mask(df)
+            if fill.any():
+                df.loc[fill, "transaction_date"] = df.loc[fill, "statement_end_date"]
+
+        # Add file_path if not present
+        if "file_path" not in df.columns:
+            df["file_path"] = file_path
+
+        # Convert dates and amounts (interest credits already use the
+        # statement end date, so rows still NaT have no usable date)
+        df["normalized_date"] = self.normalize_dates(df)
+        invalid_dates = df["normalized_date"].isna()
+        if invalid_dates.any():
+            transaction_normalizer_logger.warning(
+                f"Warning: {invalid_dates.sum()} rows have invalid dates in {file}"
+            )
+            transaction_normalizer_logger.warning(
+                f"Rows with missing date: {df[invalid_dates].to_dict(orient='records')}"
+            )
 
+        df["normalized_amount"] = pd.to_numeric(
+            df["amount"].str.replace("$", "").str.replace(",", ""),
+            errors="coerce",
+        )
+
+        # After transformation, strict validation for this file
+        valid_df = self._split_valid(df, context=file)
+
+        # Dump per-statement file if enabled
+        if self.dump_per_statement:
+            out_name = os.path.splitext(file)[0] + "_normalized.csv"
+            out_path = os.path.join(self.per_statement_dir, out_name)
+            out_path = write_table(valid_df, out_path)
+            transaction_normalizer_logger.info(
+                f"Wrote per-statement normalized file: {out_path}"
+            )
+
+        valid_df["output_file"] = file
+        return valid_df
+
+    def _finalize(self, combined_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Final date handling and strict validation of newly normalized rows."""
         # Ensure required columns exist
         required_columns = ["transaction_date", "description", "amount", "source"]
         for col in required_columns:
             if col not in combined_df.columns:
                 transaction_normalizer_logger.error(f"Missing required column: {col}")
-                return pd.DataFrame()
+                return None
 
         # Use normalized_date as transaction_date if available
         if "normalized_date" in combined_df.columns:
+            interest_credits = combined_df["description"].str.contains(
+                "INTEREST CREDIT", na=False
+            )
             # Only apply interest credit logic if 'statement_end_date' exists
             if "statement_end_date" in combined_df.columns:
-                interest_credits = combined_df["description"].str.contains(
-                    "INTEREST CREDIT", na=False
-                )
                 combined_df.loc[interest_credits, "transaction_date"] = combined_df.loc[
                     interest_credits, "statement_end_date"
                 ]
@@ -330,19 +545,15 @@ class TransactionNormalizer:
                     "'statement_end_date' column not found; skipping interest credit date logic."
                 )
             # For other transactions, use normalized date
-            if "normalized_date" in combined_df.columns:
-                other_transactions = ~combined_df["description"].str.contains(
-                    "INTEREST CREDIT", na=False
-                )
-                combined_df.loc[other_transactions, "transaction_date"] = (
-                    combined_df.loc[other_transactions, "normalized_date"].apply(
-                        lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else None
-                    )
-                )
+            combined_df.loc[~interest_credits, "transaction_date"] = _format_dates(
+                combined_df.loc[~interest_credits, "normalized_date"]
+            )
             # Ensure all dates are in YYYY-MM-DD format
-            combined_df["transaction_date"] = pd.to_datetime(
-                combined_df["transaction_date"], format="%Y-%m-%d", errors="coerce"
-            ).apply(lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else None)
+            combined_df["transaction_date"] = _format_dates(
+                pd.to_datetime(
+                    combined_df["transaction_date"], format="%Y-%m-%d", errors="coerce"
+                )
+            )
 
         # Log the final DataFrame shape and source counts
         transaction_normalizer_logger.info(
@@ -352,56 +563,132 @@ class TransactionNormalizer:
         transaction_normalizer_logger.info(f"Transactions per source:\n{source_counts}")
 
         # Final strict validation: filter out invalid/problem rows
-        valid_rows = []
-        for row in combined_df.to_dict(orient="records"):
-            is_valid, reason = self._is_valid_row(row)
-            if is_valid:
-                valid_rows.append(row)
-            else:
-                self.problem_rows.append((row, reason))
-                transaction_normalizer_logger.warning(
-                    f"Dropping invalid row: {reason} | Data: {row}"
-                )
-        valid_df = pd.DataFrame(valid_rows)
+        valid_df = self._split_valid(combined_df)
         transaction_normalizer_logger.info(
             f"Valid rows: {len(valid_df)} | Problem rows: {len(self.problem_rows)}"
         )
+        return valid_df
 
-        # Save valid transactions
-        output_file = os.path.join(
-            self.output_dir, f"{self.client_name}_normalized_transactions.csv"
+    def _deduplicate(
+        self, df: pd.DataFrame, dedup_index: Optional[DedupIndex]
+    ) -> pd.DataFrame:
+        """Hash rows, then drop or flag those already seen from another statement."""
+        if df.empty:
+            return df
+        # Hash the normalized amount so "1.00" and "1.0" exports of a row match
+        hashed = df.assign(amount=df["normalized_amount"])
+        df["transaction_hash"] = compute_transaction_hashes(hashed)
+        if dedup_index is None:
+            return df
+        duplicate_of = dedup_index.check(
+            compute_transaction_hashes(hashed, DEDUP_FIELDS), _dedup_sources(df)
         )
-        valid_df.to_csv(output_file, index=False)
-        transaction_normalizer_logger.info(
-            f"Saved normalized transactions to {output_file}"
+        duplicates = duplicate_of.notna()
+        drop = pd.Series(False, index=df.index)
+        if self.dedup_mode == "drop":
+            # Without an account number, two cards' identical charges look the same
+            drop = duplicates & _has_account(df)
+        flagged = duplicates & ~drop
+        if self.dedup_mode == "flag" or flagged.any():
+            df["duplicate_of"] = duplicate_of.where(flagged, None)
+        if not duplicates.any():
+            return df
+        transaction_normalizer_logger.warning(
+            f"Found {duplicates.sum()} transactions already present in other statements"
         )
+        if not drop.any():
+            return df
+        for row, source in zip(df[drop].to_dict(orient="records"), duplicate_of[drop]):
+            self.problem_rows.append((row, f"duplicate of a transaction in {source}"))
+        return df[~drop].reset_index(drop=True)
+
+    def _assign_stable_ids(
+        self, new_df: pd.DataFrame, kept_df: pd.DataFrame, previous_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Give re-normalized rows the transaction_id they had before (matched by file,
+        date, description, normalized amount and occurrence) and new rows fresh ids.
+        """
+        if new_df.empty:
+            return new_df
+        key_cols = [
+            "output_file",
+            "transaction_date",
+            "description",
+            "normalized_amount",
+        ]
 
-        return valid_df
+        def row_keys(df):
+            keys = df[key_cols].fillna("").astype(str)
+            key = keys[key_cols[0]]
+            for col in key_cols[1:]:
+                key = key + "|" + keys[col]
+            # Identical rows in one file are told apart by their order
+            return key + "|" + key.groupby(key).cumcount().astype(str)
+
+        previous_ids = dict(
+            zip(row_keys(previous_df), previous_df["transaction_id"])
+            if not previous_df.empty
+            else []
+        )
+        ids = row_keys(new_df).map(previous_ids)
+        known = pd.concat([kept_df["transaction_id"], previous_df["transaction_id"]])
+        next_id = int(known.max()) + 1 if not known.empty else 1
+        fresh = ids.isna()
+        ids[fresh] = list(range(next_id, next_id + int(fresh.sum())))
+        new_df = new_df.copy()
+        new_df["transaction_id"] = ids.astype(int)
+        return new_df
+
+    def _consolidated_path(self) -> str:
+        return os.path.join(
+            self.output_dir, f"{self.client_name}_normalized_transactions.csv"
+        )
+
+    def _load_consolidated(self) -> Optional[pd.DataFrame]:
+        """Read the previous consolidated CSV, or None if incremental mode can't use it."""
+        path = self._consolidated_path()
+        if not table_exists(path) or not os.path.exists(self.manifest_path):
+            return None
+        try:
+            df = read_table(path, as_text=True)
+        except Exception as e:
+            transaction_normalizer_logger.warning(f"Could not read {path}: {e}")
+            return None
+        if "output_file" not in df.columns or "transaction_id" not in df.columns:
+            return None
+        # Restore the typed columns normalization produces; others stay as written
+        df["transaction_id"] = pd.to_numeric(df["transaction_id"]).astype(int)
+        if "normalized_date" in df.columns:
+            df["normalized_date"] = pd.to_datetime(
+                df["normalized_date"], errors="coerce"
+            )
+        if "normalized_amount" in df.columns:
+            df["normalized_amount"] = pd.to_numeric(
+                df["normalized_amount"], errors="coerce"
+            )
+        return df
+
+    def _load_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError) as e:
+            transaction_normalizer_logger.warning(
+                f"Could not read normalization manifest {self.manifest_path}: {e}"
+            )
+            return {}
+
+    def _save_manifest(self, files: Dict):
+        with open(self.manifest_path, "w") as f:
+            json.dump(
+                {"updated_at": datetime.now().isoformat(), "files": files}, f, indent=2
+            )
 
     def _normalize_description(self, description: str) -> str:
         """Normalize transaction description by removing common patterns and standardizing format."""
         if pd.isna(description):
             return ""
-
-        # Convert to string and clean
-        desc = str(description).strip()
-
-        # Remove common patterns
-        patterns_to_remove = [
-            r"POS\s+DEBIT\s+\d+",  # POS DEBIT numbers
-            r"ACH\s+DEBIT\s+\d+",  # ACH DEBIT numbers
-            r"ACH\s+CREDIT\s+\d+",  # ACH CREDIT numbers
-            r"POS\s+CREDIT\s+\d+",  # POS CREDIT numbers
-            r"\d{4}\*",  # Card numbers
-            r"REF\s*\d+",  # Reference numbers
-            r"TRANS\s*\d+",  # Transaction numbers
-            r"PURCHASE\s+AUTH\s+\d+",  # Purchase authorization numbers
-        ]
-
-        for pattern in patterns_to_remove:
-            desc = re.sub(pattern, "", desc, flags=re.IGNORECASE)
-
-        # Clean up whitespace
-        desc = " ".join(desc.split())
-
-        return desc
+        return " ".join(DESCRIPTION_NOISE.sub(" ", str(description)).split())
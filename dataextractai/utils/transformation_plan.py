@@ -0,0 +1,217 @@
+"""
+Compiled Transformation Maps
+
+Each entry of config.TRANSFORMATION_MAPS maps a target column to how it is derived
+from the parsed source columns. Every entry used to be evaluated with
+df.apply(func, axis=1), building a Series object per row even for constants and
+plain renames. A map is now compiled once into a TransformationPlan of column-wise
+operations, and applying it is a handful of vectorized pandas expressions.
+
+Map values may be:
+
+    "column_name"                         rename; a missing column is handled by the
+                                          caller (omitted, filled with None, or error)
+    {"column": "name"}                    copy a column that must exist (KeyError)
+    {"optional": "name"}                  copy a column, None on every row if absent
+    {"const": value}                      the same value on every row
+    {"if": cond, "then": v, "else": v}    per-row select between two values
+    {"date": v, "format": "%Y-%m-%d"}     parse a value as a date and format it
+                                          (None where it does not parse)
+    {"float": v, "default": 0.0}          float() of a value, default where it is None
+    {"negate": v, "when": cond}           flip the sign of a number where cond holds
+
+where v is any of the above and cond is one of
+
+    {"contains": ["column", "text"]}      text occurs in str(value)
+    {"missing": "column"}                 value is NA or ""
+    {"present": "column"}                 value is not NA
+    {"all": [cond, ...]} / {"any": [cond, ...]} / {"not": cond}
+
+Any other callable is still accepted and run row-wise, so existing maps keep working.
+
+Usage:
+    from dataextractai.utils.transformation_plan import get_plan
+    plan = get_plan(TRANSFORMATION_MAPS["amazon"])
+    transformed = plan.apply(df, missing="none")
+"""
+
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# Compiled plans by id() of their map; the map is kept so its id is not reused
+_PLANS: Dict[int, tuple] = {}
+
+
+class TransformationPlan:
+    """A transformation map compiled to vectorized column operations."""
+
+    def __init__(self, transformation_map: Dict[str, Any]):
+        self.renames: Dict[str, str] = {}
+        self.operations: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {}
+        for target_col, spec in transformation_map.items():
+            if isinstance(spec, str):
+                self.renames[target_col] = spec
+            else:
+                self.operations[target_col] = _compile_value(spec)
+        self.targets = list(transformation_map)
+
+    def missing_columns(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Renamed source columns absent from df, as {target: source}."""
+        return {t: s for t, s in self.renames.items() if s not in df.columns}
+
+    def apply(
+        self, df: pd.DataFrame, missing: str = "omit", keep_columns: bool = False
+    ) -> pd.DataFrame:
+        """
+        Build the transformed frame.
+
+        Args:
+            df: Parsed source data.
+            missing: What a rename of an absent column produces: "omit" leaves the
+                target out, "none" fills it with None, "raise" raises KeyError.
+            keep_columns: Start from a copy of df (mapped targets overwrite its
+                columns) instead of an empty frame.
+        """
+        result = df.copy() if keep_columns else pd.DataFrame(index=df.index)
+        for target_col in self.targets:
+            source_col = self.renames.get(target_col)
+            if source_col is None:
+                result[target_col] = self.operations[target_col](df)
+            elif source_col in df.columns:
+                result[target_col] = df[source_col]
+            elif missing == "raise":
+                raise KeyError(source_col)
+            elif missing == "none":
+                result[target_col] = None
+        return result
+
+
+def get_plan(transformation_map: Dict[str, Any]) -> TransformationPlan:
+    """Compile a transformation map, reusing the plan on later calls."""
+    cached = _PLANS.get(id(transformation_map))
+    if cached is None or cached[0] is not transformation_map:
+        cached = (transformation_map, TransformationPlan(transformation_map))
+        _PLANS[id(transformation_map)] = cached
+    return cached[1]
+
+
+def _compile_value(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    if isinstance(spec, str):
+        return lambda df: df[spec]
+    if isinstance(spec, dict):
+        if "column" in spec:
+            return lambda df: df[spec["column"]]
+        if "optional" in spec:
+            return lambda df: (
+                df[spec["optional"]]
+                if spec["optional"] in df.columns
+                else pd.Series(None, index=df.index, dtype=object)
+            )
+        if "const" in spec:
+            return lambda df: pd.Series(
+                [spec["const"]] * len(df), index=df.index, dtype=object
+            ).infer_objects()
+        if "if" in spec:
+            return _compile_select(spec)
+        if "date" in spec:
+            return _compile_date(spec)
+        if "float" in spec:
+            return _compile_float(spec)
+        if "negate" in spec:
+            return _compile_negate(spec)
+        raise ValueError(f"Unknown transformation spec: {spec}")
+    if callable(spec):
+        # Compatibility shim for arbitrary row functions
+        return lambda df: df.apply(spec, axis=1)
+    raise ValueError(f"Unknown transformation spec: {spec!r}")
+
+
+def _compile_select(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    condition = _compile_condition(spec["if"])
+    then_value = _compile_value(spec["then"])
+    else_value = _compile_value(spec["else"])
+
+    def select(df):
+        mask = condition(df)
+        chosen = else_value(df).astype(object)
+        if mask.any():
+            chosen = chosen.where(~mask, then_value(df).astype(object))
+        return chosen.infer_objects()
+
+    return select
+
+
+def _compile_date(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    value = _compile_value(spec["date"])
+    fmt = spec.get("format", "%Y-%m-%d")
+
+    def format_dates(df):
+        dates = pd.to_datetime(value(df), errors="coerce")
+        formatted = dates.dt.strftime(fmt).astype(object)
+        return formatted.where(dates.notna(), None)
+
+    return format_dates
+
+
+def _compile_float(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    source = spec["float"]
+    default = spec.get("default", 0.0)
+
+    def to_float(df):
+        if isinstance(source, str) and source not in df.columns:
+            return pd.Series(default, index=df.index, dtype=float)
+        values = _compile_value(source)(df).to_numpy(dtype=object, copy=True)
+        # Like float(v) if v is not None else default: NaN stays NaN
+        is_none = np.array([v is None for v in values], dtype=bool)
+        values[is_none] = default
+        return pd.Series(values.astype(float), index=df.index)
+
+    return to_float
+
+
+def _compile_negate(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    value = _compile_value(spec["negate"])
+    condition = _compile_condition(spec.get("when", {"all": []}))
+
+    def negate(df):
+        numbers = pd.to_numeric(value(df), errors="coerce")
+        return numbers.where(~condition(df), -numbers)
+
+    return negate
+
+
+def _compile_condition(spec) -> Callable[[pd.DataFrame], pd.Series]:
+    if "all" in spec or "any" in spec:
+        parts = [_compile_condition(c) for c in spec.get("all", spec.get("any"))]
+        combine = np.logical_and if "all" in spec else np.logical_or
+        initial = "all" in spec
+
+        def combined(df):
+            mask = pd.Series(initial, index=df.index)
+            for part in parts:
+                mask = combine(mask, part(df))
+            return mask
+
+        return combined
+    if "not" in spec:
+        inner = _compile_condition(spec["not"])
+        return lambda df: ~inner(df)
+    if "contains" in spec:
+        column, text = spec["contains"]
+        # str(NA) never contains the search text, so NA rows are simply False
+        return lambda df: (
+            df[column]
+            .astype(object)
+            .astype(str)
+            .str.contains(text, regex=False, na=False)
+            .astype(bool)
+        )
+    if "missing" in spec:
+        column = spec["missing"]
+        return lambda df: (df[column].isna() | df[column].eq("")).astype(bool)
+    if "present" in spec:
+        column = spec["present"]
+        return lambda df: df[column].notna()
+    raise ValueError(f"Unknown transformation condition: {spec}")
@@ -0,0 +1,188 @@
+"""
+Vision Response Cache
+
+extract_structured_data_from_image() sends a crop and a prompt to the vision model.
+Organizers from the same vendor (UltraTax, Lacerte, Drake) repeat the same form-label
+regions page after page and client after client, and re-runs resend identical crops, so
+the response is cached under a hash of the image bytes, the prompt and the model.
+
+Entries live in a SQLite database (VISION_CACHE_PATH, default
+data/cache/vision_cache.db) shared by every client. Writes and recency updates are
+committed in batches; once the stored responses exceed VISION_CACHE_MAX_MB the least
+recently used ones are deleted. VISION_CACHE_DISABLED=1 turns the cache off.
+
+Images are keyed by their exact bytes only. A perceptual hash such as a 64-bit dHash
+cannot tell apart value crops that differ only in the digits ("$12,345.00" and
+"$98,761.00" hash the same), so it would serve one field's value for another.
+
+Usage:
+    from dataextractai.utils.vision_cache import get_vision_cache
+    cache = get_vision_cache()
+    key = cache.make_key(png_bytes, prompt, model)
+    result = cache.get(key)
+    if result is None:
+        result = call_model(...)
+        cache.put(key, model, result)
+    cache.stats()   # {"hits": ..., "misses": ..., "hit_rate": ..., "entries": ...}
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_VISION_CACHE_PATH = os.getenv(
+    "VISION_CACHE_PATH", os.path.join("data", "cache", "vision_cache.db")
+)
+DEFAULT_MAX_BYTES = int(float(os.getenv("VISION_CACHE_MAX_MB", "256")) * 1024 * 1024)
+DEFAULT_COMMIT_EVERY = int(os.getenv("VISION_CACHE_COMMIT_EVERY", "20"))
+# Bump when the key recipe changes so old entries stop matching
+KEY_FORMAT = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+"""
+
+
+def vision_cache_disabled() -> bool:
+    return os.getenv("VISION_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+class VisionResponseCache:
+    """Vision model responses in SQLite, keyed by image, prompt and model, LRU-evicted."""
+
+    def __init__(self, db_path: str, max_bytes: int = None, commit_every: int = None):
+        self.db_path = db_path
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self.commit_every = max(1, commit_every or DEFAULT_COMMIT_EVERY)
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # Several processes may share a cache file; wait for their write locks
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def make_key(self, img_bytes: bytes, prompt: str, model: str) -> str:
+        image_key = "sha256:" + hashlib.sha256(img_bytes).hexdigest()
+        key_str = "|".join([KEY_FORMAT, image_key, model, prompt])
+        return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE cache_key = ?",
+                (time.time(), cache_key),
+            )
+            self._written()
+        return json.loads(row[0])
+
+    def put(self, cache_key: str, model: str, response: Any):
+        data = json.dumps(response)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, model, data, len(data.encode("utf-8")), now, now),
+            )
+            self._written()
+
+    def _written(self):
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._commit()
+
+    def _commit(self):
+        if self._pending:
+            self._evict()
+            self._conn.commit()
+            self._pending = 0
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT cache_key, size FROM responses ORDER BY last_used"
+        ):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE cache_key = ?", doomed)
+
+    def flush(self):
+        """Commit buffered writes, evicting least recently used entries if over size."""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_vision_cache: Optional[VisionResponseCache] = None
+_vision_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> Optional[VisionResponseCache]:
+    """Return the process-wide vision response cache, or None when disabled."""
+    global _vision_cache
+    if vision_cache_disabled():
+        return None
+    with _vision_cache_lock:
+        if _vision_cache is None:
+            _vision_cache = VisionResponseCache(DEFAULT_VISION_CACHE_PATH)
+            # Commit the last partial batch when the process exits
+            atexit.register(_vision_cache.flush)
+        return _vision_cache
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from dataextractai.parsers_core.batch import map_files, parse_files
+from dataextractai.parsers_core.models import ParserOutput
+
+
+def _square(n):
+    if n == 3:
+        raise ValueError("bad item")
+    if n == 5:
+        time.sleep(30)
+    return n * n
+
+
+def test_map_files_keeps_input_order_and_isolates_failures():
+    """Results come back in input order; failures and timeouts become on_error values."""
+    results = map_files(
+        _square,
+        [4, 1, 3, 2, 5, 0],
+        max_workers=3,
+        timeout=2,
+        on_error=lambda item, message: ("failed", item, message.split(":")[0]),
+    )
+    assert results[:2] == [16, 1]
+    assert results[2] == ("failed", 3, "ValueError")
+    assert results[3] == 4
+    assert results[4][:2] == ("failed", 5)
+    assert "Timed out" in results[4][2]
+    assert results[5] == 0
+
+
+def test_map_files_raises_without_error_handler():
+    with pytest.raises(RuntimeError):
+        map_files(_square, [3], max_workers=1)
+
+
+def test_parse_files_reports_unmatched_files(tmp_path):
+    unknown = tmp_path / "notes.csv"
+    unknown.write_text("foo,bar\n1,2\n")
+    outputs = parse_files([str(unknown)], max_workers=1)
+    assert len(outputs) == 1
+    assert isinstance(outputs[0], ParserOutput)
+    assert outputs[0].transactions == []
+    assert outputs[0].errors
@@ -0,0 +1,116 @@
+import json
+import sqlite3
+
+from dataextractai.agents.classification_cache import (
+    SCHEMA,
+    ClassificationCache,
+    payee_cache_key,
+    split_cache_key,
+)
+
+
+def test_payee_cache_key_drops_reference_numbers():
+    assert payee_cache_key("AMZN Mktp US*2K1AB3") == "amzn mktp us"
+    assert payee_cache_key("SQ *JOES COFFEE #1234") == "sq *joes coffee"
+    assert payee_cache_key("7-ELEVEN 20240115") == "7-eleven"
+
+
+def test_split_cache_key_uses_pass_arity():
+    """Descriptions containing "|" keep it; only the trailing parts are split off."""
+    assert split_cache_key("a|b desc", "payee") == ("a|b desc", None, None)
+    assert split_cache_key("a|b desc|amazon|office", "classification") == (
+        "a|b desc",
+        "amazon",
+        "office",
+    )
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "transaction_cache.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "amzn mktp": {"payee": {"payee": "Amazon"}},
+                "amzn mktp|amazon": {"category": {"category": "Office Supplies"}},
+            }
+        )
+    )
+    db_path = str(tmp_path / "transaction_cache.db")
+
+    cache = ClassificationCache(db_path, legacy_json_path=str(legacy))
+    assert len(cache) == 2
+    assert cache.get("amzn mktp", "payee") == {"payee": "Amazon"}
+    assert cache.get("amzn mktp|amazon", "category")["category"] == "Office Supplies"
+    assert cache.get("amzn mktp", "category") is None
+    assert not legacy.exists()
+    assert (tmp_path / "transaction_cache.json.migrated").exists()
+    cache.close()
+
+    reopened = ClassificationCache(db_path, legacy_json_path=str(legacy))
+    assert len(reopened) == 2
+    reopened.close()
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = ClassificationCache(db_path, commit_every=3)
+
+    def committed():
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    cache.put("a", "payee", {"payee": "A"})
+    cache.put("b", "payee", {"payee": "B"})
+    assert committed() == 0
+    cache.put("c", "payee", {"payee": "C"})
+    assert committed() == 3
+    cache.put("d", "payee", {"payee": "D"})
+    cache.flush()
+    assert committed() == 4
+    cache.close()
+
+
+def test_stored_keys_are_rebuilt_for_a_new_key_recipe(tmp_path):
+    db_path = str(tmp_path / "transaction_cache.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                "pos debit 1234 netflix",
+                "payee",
+                "pos debit 1234 netflix",
+                None,
+                None,
+                json.dumps({"payee": "Netflix (old)"}),
+                1.0,
+            ),
+            (
+                "pos debit 5678 netflix",
+                "payee",
+                "pos debit 5678 netflix",
+                None,
+                None,
+                json.dumps({"payee": "Netflix"}),
+                2.0,
+            ),
+            (
+                "pos debit 5678 netflix|netflix",
+                "category",
+                "pos debit 5678 netflix",
+                "netflix",
+                None,
+                json.dumps({"category": "Subscriptions"}),
+                2.0,
+            ),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    cache = ClassificationCache(db_path)
+    assert len(cache) == 2
+    assert cache.get("netflix", "payee") == {"payee": "Netflix"}
+    assert cache.get("netflix|netflix", "category") == {"category": "Subscriptions"}
+    cache.close()
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from dataextractai.utils.dedup_index import DedupIndex, compute_transaction_hashes
+from dataextractai.utils.normalize_api import compute_transaction_id
+
+
+def test_column_hashes_match_row_wise_transaction_id():
+    df = pd.DataFrame(
+        {
+            "transaction_date": ["2024-01-05", None, "2024-01-07"],
+            "amount": [1.5, np.nan, -20.0],
+            "description": ["SHOP", "RENT", None],
+            "memo": ["a", "b", "c"],
+        }
+    )
+    expected = df.apply(compute_transaction_id, axis=1)
+    assert compute_transaction_hashes(df).tolist() == expected.tolist()
+
+
+def test_index_flags_rows_seen_in_other_sources_only():
+    index = DedupIndex(":memory:")
+    first = index.check(
+        pd.Series(["h1", "h1", "h2"]), pd.Series(["jan.pdf", "jan.pdf", "jan.pdf"])
+    )
+    # Repeated rows inside one statement are real transactions
+    assert first.isna().all()
+    # Re-normalizing the same statement finds nothing
+    assert index.check(pd.Series(["h1", "h1"]), pd.Series(["jan.pdf"] * 2)).isna().all()
+
+    overlap = index.check(
+        pd.Series(["h1", "h1", "h1", "h3"]), pd.Series(["jan.csv"] * 4)
+    )
+    assert overlap.tolist() == ["jan.pdf", "jan.pdf", None, None]
+    assert len(index) == 5
+
+    index.forget(["jan.pdf"])
+    assert index.check(pd.Series(["h2"]), pd.Series(["feb.pdf"])).isna().all()
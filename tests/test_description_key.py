@@ -0,0 +1,63 @@
+import pandas as pd
+
+from dataextractai.utils.description_key import (
+    cache_key,
+    cache_keys,
+    canonical_description,
+    canonical_descriptions,
+)
+
+DESCRIPTIONS = [
+    "POS DEBIT 1234 NETFLIX",
+    "POS DEBIT 5678 NETFLIX",
+    "Purchase authorized on 01/12 WALMART XXXX1234",
+    "SHELL OIL #4411 01/15",
+    "PAYPAL *SPOTIFY REF 99812A",
+    "1099-INT UBER TRIP 12/31/2024",
+    "ACH DEBIT 12345",
+    "CHECK # 1234",
+    "ID: 7-ELEVEN 12",
+    None,
+]
+
+
+def test_noise_is_stripped_but_merchant_kept():
+    assert canonical_description(DESCRIPTIONS[0]) == "netflix"
+    assert canonical_description(DESCRIPTIONS[1]) == "netflix"
+    assert canonical_description(DESCRIPTIONS[2]) == "walmart"
+    assert canonical_description(DESCRIPTIONS[3]) == "shell oil"
+    assert canonical_description(DESCRIPTIONS[4]) == "paypal *spotify"
+    assert canonical_description(DESCRIPTIONS[5]) == "1099-int uber trip"
+    # Nothing but noise: keep the text rather than an empty key
+    assert canonical_description(DESCRIPTIONS[6]) == "ach debit 12345"
+    assert canonical_description(DESCRIPTIONS[8]) == "id: 7-eleven 12"
+
+
+def test_payment_references_do_not_collide():
+    """Check numbers and account suffixes tell distinct payments apart."""
+    pairs = [
+        ("CHECK # 1234", "CHECK 5678"),
+        (
+            "ONLINE TRANSFER TO SAVINGS XXXXXX1234",
+            "ONLINE TRANSFER TO SAVINGS XXXXXX9876",
+        ),
+        ("ACH DEBIT 12345 GUSTO", "ACH DEBIT 67890 GUSTO"),
+        ("ZELLE TO J SMITH CONF# A1B2C3", "ZELLE TO J SMITH CONF# Z9Y8X7"),
+    ]
+    for first, second in pairs:
+        assert canonical_description(first) != canonical_description(second)
+        vectorized = canonical_descriptions(pd.Series([first, second]))
+        assert vectorized[0] != vectorized[1]
+
+
+def test_vectorized_keys_match_scalar_keys():
+    descriptions = pd.Series(DESCRIPTIONS)
+    payees = pd.Series(
+        ["Netflix", None, "Walmart", "", "Spotify", "Uber", "x", "y", "7-Eleven", None]
+    )
+    expected = [cache_key(d, p) for d, p in zip(DESCRIPTIONS, payees)]
+    assert list(cache_keys(descriptions, payees)) == expected
+    assert list(canonical_descriptions(descriptions)) == [
+        canonical_description(d) for d in DESCRIPTIONS
+    ]
+    assert cache_key("POS DEBIT 1 NETFLIX", "Netflix", "Subs") == "netflix|netflix|subs"
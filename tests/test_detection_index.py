@@ -0,0 +1,66 @@
+import pytest
+
+from dataextractai.parsers_core.detection_index import DetectionIndex, _PhraseMatcher
+from dataextractai.parsers_core.document import DocumentText
+
+
+class _CsvA:
+    detection_signature = {"file_types": [".csv"], "headers": ["Date", "Amount"]}
+
+
+class _CsvB:
+    detection_signature = {
+        "file_types": [".csv"],
+        "headers": ["Date", "Amount", "Memo"],
+        "exact_headers": True,
+    }
+
+
+class _NoSignature:
+    pass
+
+
+def test_phrase_matcher_reports_overlapping_phrases():
+    """Phrases sharing a start position are all reported, not just the longest."""
+    matcher = _PhraseMatcher({"wells fargo", "wells fargo business", "fargo"})
+    assert matcher.find("WELLS FARGO BUSINESS card") == {
+        "wells fargo",
+        "wells fargo business",
+        "fargo",
+    }
+    assert matcher.find("nothing here") == set()
+
+
+def test_detection_index_csv_candidates(tmp_path):
+    """Header signatures split files into confirmed, nominated and unindexed."""
+    DocumentText.clear_cache()
+    index = DetectionIndex.build({"a": _CsvA, "b": _CsvB, "legacy": _NoSignature})
+
+    exact = tmp_path / "exact.csv"
+    exact.write_text("Date,Amount,Memo\n01/02/2024,1.00,x\n")
+    confirmed, nominated, unindexed = index.candidates(
+        DocumentText.from_path(str(exact))
+    )
+    assert confirmed == ["a", "b"]
+    assert nominated == []
+    assert unindexed == ["legacy"]
+
+    subset = tmp_path / "subset.csv"
+    subset.write_text("Amount,Date,Other\n1.00,01/02/2024,x\n")
+    confirmed, _, _ = index.candidates(DocumentText.from_path(str(subset)))
+    assert confirmed == ["a"]
+
+
+def test_registry_detection_uses_index(tmp_path):
+    """A unique signature match is returned by the registry without can_parse."""
+    pytest.importorskip("pandas")
+    from dataextractai.parsers_core.autodiscover import autodiscover_parsers
+    from dataextractai.parsers_core.registry import ParserRegistry
+
+    autodiscover_parsers()
+    path = tmp_path / "apple.csv"
+    path.write_text(
+        "Transaction Date,Clearing Date,Description,Merchant,Category,Type,Amount (USD)\n"
+        "01/02/2024,01/03/2024,COFFEE,Cafe,Restaurants,Purchase,4.50\n"
+    )
+    assert ParserRegistry.detect_parser_for_file(str(path)) == "apple_card_csv"
@@ -0,0 +1,46 @@
+import pytest
+
+fitz = pytest.importorskip("fitz", reason="PyMuPDF required to build sample PDFs")
+
+from dataextractai.parsers_core.document import DocumentText, PDFPLUMBER
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_document_text_is_shared_by_content_hash(tmp_path):
+    """Identical files resolve to one DocumentText and each page decodes once."""
+    DocumentText.clear_cache()
+    first = _make_pdf(tmp_path / "a.pdf", ["Wells Fargo page one", "page two"])
+    second = tmp_path / "b.pdf"
+    second.write_bytes((tmp_path / "a.pdf").read_bytes())
+
+    doc = DocumentText.from_path(first)
+    assert DocumentText.from_path(str(second)) is doc
+    assert doc.page_count == 2
+    assert "Wells Fargo" in doc.page_text(0)
+    assert "page two" in doc.text(engine=PDFPLUMBER)
+
+    # Cached page text survives releasing the readers
+    doc.close()
+    assert "Wells Fargo" in doc.page_text(0)
+    assert doc.pages_text(max_pages=1) == [doc.page_text(0)]
+
+
+def test_document_text_distinguishes_changed_content(tmp_path):
+    DocumentText.clear_cache()
+    path = tmp_path / "statement.pdf"
+    _make_pdf(path, ["first version"])
+    before = DocumentText.from_path(str(path))
+    _make_pdf(path, ["second version", "extra page"])
+    after = DocumentText.from_path(str(path))
+    assert after is not before
+    assert after.content_hash != before.content_hash
+    assert after.page_count == 2
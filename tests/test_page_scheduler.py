@@ -0,0 +1,52 @@
+import threading
+import time
+
+from dataextractai.utils import page_scheduler
+from dataextractai.utils.page_scheduler import map_pages
+
+
+def test_pages_overlap_and_results_keep_page_order():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(page):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        # Later pages finish first
+        time.sleep(0.01 * (6 - page))
+        with lock:
+            active[0] -= 1
+        return page * 10
+
+    result = map_pages([1, 2, 3, 4, 5], work, workers=5)
+    assert list(result.items()) == [(1, 10), (2, 20), (3, 30), (4, 40), (5, 50)]
+    assert peak[0] > 1
+
+
+def test_failed_pages_are_retried_then_dropped(monkeypatch):
+    monkeypatch.setattr(page_scheduler, "RETRY_BACKOFF_BASE", 0)
+    attempts = {}
+
+    def work(page):
+        attempts[page] = attempts.get(page, 0) + 1
+        if page == 2 or attempts[page] < 2:
+            raise RuntimeError("timeout")
+        return {"errors": []}
+
+    result = map_pages([1, 2, 3], work, workers=2, retries=2)
+    assert sorted(result) == [1, 3]
+    assert attempts == {1: 2, 2: 3, 3: 2}
+
+
+def test_retry_if_keeps_last_result(monkeypatch):
+    monkeypatch.setattr(page_scheduler, "RETRY_BACKOFF_BASE", 0)
+    calls = []
+    result = map_pages(
+        [1],
+        lambda p: calls.append(p) or {"errors": ["x"]},
+        retries=1,
+        retry_if=lambda r: r["errors"],
+    )
+    assert result == {1: {"errors": ["x"]}}
+    assert len(calls) == 2
@@ -0,0 +1,136 @@
+import importlib.util
+import os
+import sys
+
+from dataextractai.parsers_core.document import DocumentText
+from dataextractai.parsers_core.models import (
+    ParserOutput,
+    StatementMetadata,
+    TransactionRecord,
+)
+from dataextractai.parsers_core import result_cache
+from dataextractai.parsers_core.registry import ParserRegistry
+from dataextractai.parsers_core.result_cache import (
+    ParseResultCache,
+    cached_parse,
+    parser_version,
+)
+
+
+def _output(n=1, filename="a.csv", extra=None):
+    return ParserOutput(
+        transactions=[
+            TransactionRecord(
+                transaction_date="2024-01-02",
+                amount=i,
+                description="x",
+                extra=dict(extra) if extra else None,
+            )
+            for i in range(n)
+        ],
+        metadata=StatementMetadata(original_filename=filename),
+    )
+
+
+def test_cached_parse_skips_reparsing_identical_content(tmp_path):
+    """The same file re-uploaded to another directory is served from the cache."""
+    DocumentText.clear_cache()
+    cache = ParseResultCache(cache_dir=str(tmp_path / "cache"))
+    first = tmp_path / "jan" / "a.csv"
+    second = tmp_path / "feb" / "a.csv"
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_text("Date,Amount\n01/02/2024,1.00\n")
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return _output(2, extra={"file_path": str(first), "source_file": "a.csv"})
+
+    out1 = cached_parse("demo", str(first), parse, cache=cache)
+    out2 = cached_parse("demo", str(second), parse, cache=cache)
+    assert len(calls) == 1
+    assert [t.amount for t in out2.transactions] == [
+        t.amount for t in out1.transactions
+    ]
+    # Per-record paths point at the file actually parsed, not the first upload
+    assert {t.extra["file_path"] for t in out2.transactions} == {str(second)}
+    assert {t.extra["source_file"] for t in out2.transactions} == {"a.csv"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A different parser config is a different entry
+    cached_parse("demo", str(first), parse, config={"x": 1}, cache=cache)
+    assert len(calls) == 2
+
+
+def test_cached_parse_keys_on_filename(tmp_path):
+    """Identical bytes under another name are reparsed: parsers read dates from names."""
+    DocumentText.clear_cache()
+    cache = ParseResultCache(cache_dir=str(tmp_path / "cache"))
+    first = tmp_path / "statement_2024-01-31.csv"
+    first.write_text("Date,Amount\n01/02/2024,1.00\n")
+    second = tmp_path / "statement_2024-02-29.csv"
+    second.write_bytes(first.read_bytes())
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return _output(1)
+
+    cached_parse("demo", str(first), parse, cache=cache)
+    cached_parse("demo", str(second), parse, cache=cache)
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Entries touched least recently are removed first once over max_bytes."""
+    cache = ParseResultCache(cache_dir=str(tmp_path), max_bytes=10**9)
+    for key in ("aa1", "bb2", "cc3"):
+        cache.put(key, _output(20))
+    cache.get("aa1")
+    old = os.path.getmtime(cache._entry_path("aa1")) - 100
+    os.utime(cache._entry_path("bb2"), (old, old))
+    cache.max_bytes = os.path.getsize(cache._entry_path("aa1")) * 2
+    cache.evict()
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+
+
+def _load_parser_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_unversioned_parser_is_keyed_by_its_source(tmp_path, monkeypatch):
+    """Editing a parser without __version__ changes its cache key version."""
+    source = tmp_path / "demo_parser.py"
+    versions = []
+    for body in ("class DemoParser:\n    pass\n", "class DemoParser:\n    x = 1\n"):
+        source.write_text(body)
+        module = _load_parser_module(source, "demo_parser_under_test")
+        monkeypatch.setattr(
+            ParserRegistry, "get_parser", staticmethod(lambda name: module.DemoParser)
+        )
+        monkeypatch.setattr(result_cache, "_source_versions", {})
+        versions.append(parser_version("demo"))
+    monkeypatch.delitem(sys.modules, "demo_parser_under_test")
+    assert all(v.startswith("src-") for v in versions)
+    assert versions[0] != versions[1]
+
+
+def test_put_only_scans_the_cache_when_over_the_limit(tmp_path, monkeypatch):
+    cache = ParseResultCache(cache_dir=str(tmp_path), max_bytes=10**9)
+    cache.put("aa1", _output(5))
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+    cache.put("bb2", _output(5))
+    cache.put("aa1", _output(5))
+    assert scans == []
+    cache.max_bytes = os.path.getsize(cache._entry_path("bb2"))
+    cache.put("cc3", _output(5))
+    assert scans == [1]
+    assert cache._size <= cache.max_bytes
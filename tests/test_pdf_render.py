@@ -0,0 +1,53 @@
+import io
+import os
+
+import fitz
+from PIL import Image
+
+from dataextractai.utils.pdf_render import render_crop_png, render_pages
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Page {i + 1}")
+    doc.save(path)
+    doc.close()
+
+
+def test_renders_each_variant_at_its_dpi(tmp_path):
+    pdf = str(tmp_path / "organizer.pdf")
+    _make_pdf(pdf, 3)
+    paths = render_pages(pdf, str(tmp_path), {"thumb": 36, "page": 144}, workers=1)
+    assert sorted(paths) == [1, 2, 3]
+    assert paths[2]["page"] == os.path.join(str(tmp_path), "page_2.png")
+    # Letter size is 8.5 x 11 inches
+    assert Image.open(paths[2]["thumb"]).size == (306, 396)
+    assert Image.open(paths[2]["page"]).size == (1224, 1584)
+
+
+def test_worker_pool_and_skip_existing(tmp_path):
+    pdf = str(tmp_path / "organizer.pdf")
+    _make_pdf(pdf, 20)
+    paths = render_pages(pdf, str(tmp_path), {"page": 20}, workers=2)
+    assert sorted(paths) == list(range(1, 21))
+    assert all(os.path.exists(p["page"]) for p in paths.values())
+    marker = paths[5]["page"]
+    os.utime(marker, (os.path.getmtime(pdf) + 10,) * 2)
+    before = os.path.getmtime(marker)
+    render_pages(pdf, str(tmp_path), {"page": 20}, page_numbers=[5], skip_existing=True)
+    assert os.path.getmtime(marker) == before
+
+
+def test_crop_render_matches_cropped_page(tmp_path):
+    pdf = str(tmp_path / "organizer.pdf")
+    _make_pdf(pdf, 2)
+    crop = {"left": 0.0, "top": 0.0, "right": 0.5, "bottom": 0.25}
+    with fitz.open(pdf) as doc:
+        png = render_crop_png(doc, 2, crop, 72)
+        full = doc[1].get_pixmap(dpi=72).tobytes("png")
+    region = Image.open(io.BytesIO(png)).convert("RGB")
+    expected = Image.open(io.BytesIO(full)).convert("RGB").crop((0, 0, 306, 198))
+    assert region.size == (306, 198)
+    assert region.tobytes() == expected.tobytes()
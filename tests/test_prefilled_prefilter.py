@@ -0,0 +1,61 @@
+from dataextractai.parsers.prefilled_prefilter import (
+    TemplateStore,
+    detect_vendor,
+    score_page,
+)
+
+BLANK_PAGE = """2023 Tax Organizer
+Form 1099-INT Interest Income
+Payer's name
+Amount
+Page 14A
+"""
+
+
+def test_blank_template_page_is_clearly_empty():
+    features = score_page(BLANK_PAGE)
+    assert features["hits"] == {}
+    assert features["clearly_empty"]
+
+
+def test_user_data_patterns_are_not_empty():
+    for line in (
+        "Taxpayer SSN 123-45-6789",
+        "Prior year 1,234.56",
+        "Phone (415) 555-1212",
+        "Account XK39F02Q",
+        "Mailing ZIP 94110",
+    ):
+        features = score_page(BLANK_PAGE + line)
+        assert not features["clearly_empty"], line
+    assert score_page(BLANK_PAGE + "Chase Bank", include_terms={"chase"})["hits"] == {
+        "include_term": 1
+    }
+
+
+def test_names_with_bare_amounts_are_not_empty_without_template():
+    """Untemplated pages with any non-boilerplate number go to the LLM."""
+    page = (
+        "Dependents\nName Relationship Months lived\nEmily Johnson Daughter 12\n"
+        "Prior year amounts\nCharitable contributions 850\n"
+    )
+    features = score_page(page)
+    assert features["hits"] == {"number": 2}
+    assert not features["clearly_empty"]
+    assert score_page("Form W-2 Wages\nLine 12 Schedule 1\n")["clearly_empty"]
+
+
+def test_template_limits_scoring_to_new_lines():
+    filled = BLANK_PAGE + "First Republic Bank\nWells Fargo Bank Savings\n"
+    assert score_page(filled, template_text=BLANK_PAGE)["novel_chars"] > 40
+    assert not score_page(filled, template_text=BLANK_PAGE)["clearly_empty"]
+    assert score_page(BLANK_PAGE, template_text=BLANK_PAGE)["clearly_empty"]
+
+
+def test_templates_are_learned_once_per_vendor_and_label(tmp_path):
+    assert detect_vendor("Prepared with UltraTax CS") == "ultratax"
+    store = TemplateStore(str(tmp_path))
+    assert store.add("ultratax", "14A", BLANK_PAGE)
+    assert not store.add("ultratax", "14A", "other text")
+    assert TemplateStore(str(tmp_path)).get("ultratax", "14A") == BLANK_PAGE
+    assert TemplateStore(str(tmp_path)).get("lacerte", "14A") is None
@@ -0,0 +1,32 @@
+from dataextractai.agents.row_journal import RowJournal
+
+
+def test_replay_cuts_torn_tail_and_continues(tmp_path):
+    path = str(tmp_path / "run_journal.jsonl")
+    fingerprint = RowJournal.fingerprint(["NETFLIX", "SHELL OIL"], "fast")
+    journal = RowJournal(path, fingerprint, sync_every=100)
+    journal.record(0, "payee", {"payee": "Netflix"})
+    journal.record(1, "payee", {"payee": "Shell"})
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"row": 0, "pass": "categ')  # crash mid-write
+
+    resumed = RowJournal(path, fingerprint)
+    assert resumed.get(1, "payee") == {"payee": "Shell"}
+    assert not resumed.contains(0, "category")
+    resumed.record(0, "category", {"category": "Subscriptions"})
+    resumed.close()
+    assert len(RowJournal(path, fingerprint)) == 3
+
+
+def test_changed_rows_or_completed_run_start_fresh(tmp_path):
+    path = str(tmp_path / "run_journal.jsonl")
+    journal = RowJournal(path, RowJournal.fingerprint(["NETFLIX"], "fast"))
+    journal.record(0, "payee", {"payee": "Netflix"})
+    journal.close()
+
+    assert len(RowJournal(path, RowJournal.fingerprint(["NETFLIX"], "precise"))) == 0
+
+    journal = RowJournal(path, RowJournal.fingerprint(["NETFLIX"], "fast"))
+    journal.close(completed=True)
+    assert not (tmp_path / "run_journal.jsonl").exists()
@@ -0,0 +1,107 @@
+import pandas as pd
+
+from dataextractai.agents import rule_engine
+from dataextractai.agents.rule_engine import RuleEngine
+
+
+def test_fields_resolve_independently_in_rule_order():
+    engine = RuleEngine.from_specs(
+        [
+            {"name": "adp", "pattern": r"\badp\b", "payee": "ADP"},
+            {
+                "name": "payroll",
+                "pattern": r"\b(?:adp|gusto)\b",
+                "payee": "Payroll Provider",
+                "category": "Payroll",
+                "classification": "Business",
+            },
+            {"name": "cafe", "keywords": ["blue bottle"], "category": "Meals"},
+        ]
+    )
+    descriptions = pd.Series(
+        ["ADP PAYROLL FEES 0423", "GUSTO NET PAY", "BLUE BOTTLE COFFEE", "RANDOM", None]
+    )
+
+    matches = engine.match(descriptions)
+
+    assert matches["payee"].fillna("").tolist()[:3] == ["ADP", "Payroll Provider", ""]
+    assert matches.at[0, "payee_rule"] == "adp"
+    assert matches.at[0, "category_rule"] == "payroll"
+    assert matches.at[2, "category"] == "Meals"
+    assert matches.loc[3:].isna().all().all()
+
+
+def test_keywords_match_whole_words_only():
+    engine = RuleEngine.from_specs(
+        [{"name": "mint", "keywords": ["mint"], "classification": "Business"}]
+    )
+    matches = engine.match(pd.Series(["MINT.COM", "PEPPERMINT TEA"]))
+    assert matches["classification"].fillna("").tolist() == ["Business", ""]
+
+
+def test_client_rules_override_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client_dir = tmp_path / "data" / "clients" / "acme"
+    client_dir.mkdir(parents=True)
+    (client_dir / "classification_rules.yaml").write_text(
+        "rules:\n"
+        "  - name: dropbox\n"
+        "    pattern: dropbox\n"
+        "    payee: Dropbox Family\n"
+        "    classification: Personal\n"
+        "  - name: slack\n"
+        "    enabled: false\n"
+    )
+    monkeypatch.setattr(
+        rule_engine,
+        "CLASSIFICATION_RULES",
+        [
+            {"name": "dropbox", "pattern": "dropbox", "payee": "Dropbox"},
+            {"name": "slack", "pattern": "slack", "payee": "Slack"},
+        ],
+    )
+
+    matches = RuleEngine.for_client("acme").match(
+        pd.Series(["DROPBOX*ABC", "SLACK T123"])
+    )
+
+    assert matches["payee"].fillna("").tolist() == ["Dropbox Family", ""]
+    assert matches.at[0, "classification"] == "Personal"
+
+
+def test_default_rules_do_not_classify_generic_descriptions():
+    """Transfers, deposits, wages and the like are left to the LLM, not forced."""
+    matches = RuleEngine.from_specs(rule_engine.CLASSIFICATION_RULES).match(
+        pd.Series(
+            [
+                "ONLINE TRANSFER TO BUSINESS CHECKING",
+                "DEPOSIT CLIENT INVOICE",
+                "ZELLE PAYMENT TO CONTRACTOR",
+                "CHECKCARD GOOGLE *ADS",
+                "ATM WITHDRAWAL 0412",
+                "BLUE CROSS HEALTH PREMIUM",
+                "GUSTO PAYROLL DIRECT DEP",
+            ]
+        )
+    )
+    assert matches["classification"].isna().all()
+
+
+def test_unsafe_client_patterns_are_isolated_or_skipped():
+    """Backreferences and named groups keep their meaning; bad rules are skipped."""
+    engine = RuleEngine.from_specs(
+        [
+            {"name": "broken", "pattern": "(unclosed", "payee": "X"},
+            {"name": "flags", "pattern": "(?i)later flag", "payee": "X"},
+            {"name": "repeat", "pattern": r"\b(\w+) \1\b", "payee": "Repeated"},
+            {"name": "a", "pattern": r"(?P<shop>acme)", "category": "Supplies"},
+            {"name": "b", "pattern": r"(?P<shop>zenith)", "category": "Rent"},
+            {"name": "slack", "pattern": r"\bslack\b", "payee": "Slack"},
+        ]
+    )
+    assert [r.name for r in engine.rules] == ["repeat", "a", "b", "slack"]
+
+    matches = engine.match(pd.Series(["SYNC SYNC LLC", "ZENITH LLC", "SLACK T1"]))
+
+    assert matches["payee"].fillna("").tolist() == ["Repeated", "", "Slack"]
+    assert matches.at[1, "category"] == "Rent"
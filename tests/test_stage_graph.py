@@ -0,0 +1,83 @@
+from dataextractai.utils.stage_graph import StageGraph
+
+
+def _graph(tmp_path, calls, config=None):
+    source = tmp_path / "input.pdf"
+    if not source.exists():
+        source.write_bytes(b"%PDF-1.4 organizer")
+
+    def split(pages):
+        calls.extend(("split", p) for p in pages)
+        out = {}
+        for p in pages:
+            path = tmp_path / f"page_{p}.txt"
+            path.write_text(f"page {p}")
+            out[p] = {"path": str(path)}
+        return out
+
+    def text(pages, split):
+        calls.extend(("text", p) for p in pages)
+        return {p: open(split[p]["path"]).read().upper() for p in pages}
+
+    def manifest(text):
+        calls.append(("manifest", tuple(sorted(text))))
+        return [text[p] for p in sorted(text)]
+
+    graph = StageGraph(str(source), str(tmp_path), page_numbers=[1, 2, 3])
+    graph.add("split", split, per_page=True, files=lambda a: [a["path"]])
+    graph.add("text", text, deps=["split"], per_page=True, config=config)
+    graph.add("manifest", manifest, deps=["text"])
+    return graph
+
+
+def test_page_subset_then_full_run_computes_each_page_once(tmp_path):
+    calls = []
+    assert _graph(tmp_path, calls).run("text", pages=[2]) == {2: "PAGE 2"}
+    calls.clear()
+    # A new graph (next run) reuses page 2 from disk and computes only 1 and 3
+    result = _graph(tmp_path, calls).run("manifest")
+    assert result == ["PAGE 1", "PAGE 2", "PAGE 3"]
+    assert sorted(c for c in calls if c[0] == "split") == [("split", 1), ("split", 3)]
+    calls.clear()
+    _graph(tmp_path, calls).run("manifest")
+    assert calls == []
+
+
+def test_config_change_and_missing_files_invalidate(tmp_path):
+    calls = []
+    _graph(tmp_path, calls, config={"v": 1}).run("text")
+    calls.clear()
+    _graph(tmp_path, calls, config={"v": 2}).run("text")
+    assert sorted(calls) == [("text", 1), ("text", 2), ("text", 3)]
+    calls.clear()
+    (tmp_path / "page_3.txt").unlink()
+    _graph(tmp_path, calls, config={"v": 2}).run("text")
+    assert calls == [("split", 3), ("text", 3)]
+
+
+def test_uncacheable_artifacts_are_recomputed(tmp_path):
+    source = tmp_path / "input.pdf"
+    source.write_bytes(b"%PDF-1.4")
+    calls = []
+
+    def build():
+        graph = StageGraph(str(source), str(tmp_path), page_numbers=[1])
+        graph.add(
+            "labels",
+            lambda pages: calls.extend(pages)
+            or {p: {"errors": ["timeout"]} for p in pages},
+            per_page=True,
+            cache_if=lambda a: not a["errors"],
+        )
+        return graph
+
+    build().run("labels")
+    build().run("labels")
+    assert calls == [1, 1]
+
+
+def test_whole_stage_is_keyed_by_requested_pages(tmp_path):
+    calls = []
+    assert _graph(tmp_path, calls).run("manifest") == ["PAGE 1", "PAGE 2", "PAGE 3"]
+    assert _graph(tmp_path, calls).run("manifest", pages=[2]) == ["PAGE 2"]
+    assert _graph(tmp_path, calls).run("manifest") == ["PAGE 1", "PAGE 2", "PAGE 3"]
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from dataextractai.utils import table_store
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "transaction_date": ["2024-01-05", "2024-01-06", None],
+            "description": ["SHOP", "RENT", "FEE"],
+            "amount": [1.5, -900.0, None],
+            "normalized_date": pd.to_datetime(["2024-01-05", "2024-01-06", None]),
+            "transaction_id": [1, 2, 3],
+            "memo": [{"ref": 1}, None, "x"],
+        }
+    )
+
+
+def test_schema_derives_from_transaction_record():
+    dtypes = table_store.transaction_dtypes()
+    assert dtypes["transaction_date"] == "string"
+    assert dtypes["amount"] == "float64"
+    assert dtypes["posted_date"] == "string"
+    assert "extra" not in dtypes
+    assert dtypes["transaction_id"] == "Int64"
+
+
+def test_as_text_matches_csv_round_trip(tmp_path):
+    df = _frame()
+    path = tmp_path / "t.csv"
+    df.to_csv(path, index=False)
+    expected = pd.read_csv(path, dtype=str)
+    typed = table_store._typed(df)
+    assert str(typed["amount"].dtype) == "float64"
+    assert str(typed["transaction_id"].dtype) == "Int64"
+    text = table_store._as_text(typed.drop(columns=["memo"]))
+    for col in text.columns:
+        assert text[col].fillna("").tolist() == expected[col].fillna("").tolist()
+
+
+def test_csv_storage_is_the_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(table_store, "STORAGE_FORMAT", "csv")
+    path = str(tmp_path / "bank_output.csv")
+    assert table_store.write_table(_frame(), path) == path
+    (tmp_path / "notes.csv").write_text("a\n1\n")
+    assert table_store.list_tables(str(tmp_path), "_output") == ["bank_output.csv"]
+    subset = table_store.read_table(path, columns=["description", "missing"])
+    assert list(subset.columns) == ["description"]
+
+
+def test_parquet_storage_round_trip(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(table_store, "STORAGE_FORMAT", "parquet")
+    path = str(tmp_path / "acme_normalized_transactions.csv")
+    written = table_store.write_table(_frame(), path, export_csv=True)
+    assert written.endswith(".parquet")
+    assert table_store.resolve_table(path) == written
+    typed = table_store.read_table(path, columns=["amount", "normalized_date"])
+    assert list(typed.columns) == ["amount", "normalized_date"]
+    assert pd.api.types.is_datetime64_any_dtype(typed["normalized_date"])
+    as_text = table_store.read_table(path, as_text=True)
+    from_csv = pd.read_csv(path, dtype=str)
+    assert as_text["amount"].tolist()[:2] == from_csv["amount"].tolist()[:2]
@@ -0,0 +1,81 @@
+"""Tests for fast-first cascade routing of transactions."""
+
+from dataextractai.agents import transaction_agents
+from dataextractai.agents.transaction_agents import CascadeRouter, process_transaction
+
+CLIENT_CONTEXT = {"client_name": "acme", "business_type": "Consulting"}
+
+
+def _fake_agents(confidences, calls):
+    def run(model_type, description, client_context):
+        calls.append((model_type, description))
+        conf = confidences[description] if model_type == "fast" else 0.95
+        result = {
+            "payee": "Netflix",
+            "category": "Subscriptions",
+            "classification": "Business Expense",
+            "normalization_confidence": conf,
+            "classification_confidence": conf,
+            "overall_confidence": conf,
+            "needs_review": conf < transaction_agents.CONFIDENCE_THRESHOLD,
+            "model_type": model_type,
+            "latency": 2.0 if model_type == "precise" else 0.1,
+        }
+        return result, result
+
+    return run
+
+
+def test_only_unsure_fast_results_escalate(monkeypatch):
+    calls = []
+    confidences = {"NETFLIX": 0.95, "SQ *CAFE": 0.4}
+    monkeypatch.setattr(
+        transaction_agents, "_run_agents", _fake_agents(confidences, calls)
+    )
+    router = CascadeRouter(escalation_budget=1.0)
+
+    sure = process_transaction("NETFLIX", CLIENT_CONTEXT, router=router)
+    unsure = process_transaction("SQ *CAFE", CLIENT_CONTEXT, router=router)
+
+    assert sure["model_type"] == "fast" and not sure["precise_review_used"]
+    assert unsure["model_type"] == "precise" and unsure["precise_review_used"]
+    assert unsure["escalation_reason"] == "low_confidence"
+    assert calls == [("fast", "NETFLIX"), ("fast", "SQ *CAFE"), ("precise", "SQ *CAFE")]
+    stats = router.stats("acme")
+    assert stats["escalation_rate"] == 0.5
+    assert stats["latency_saved"] == 2.0
+
+
+def test_escalation_budget_is_per_client(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        transaction_agents, "_run_agents", _fake_agents({"SQ *CAFE": 0.4}, calls)
+    )
+    router = CascadeRouter(escalation_budget=0.5)
+
+    results = [
+        process_transaction("SQ *CAFE", CLIENT_CONTEXT, router=router) for _ in range(4)
+    ]
+    other = process_transaction("SQ *CAFE", {"client_name": "globex"}, router=router)
+
+    assert [r["precise_review_used"] for r in results] == [True, False, True, False]
+    assert results[1]["needs_review"]
+    assert other["precise_review_used"]
+    assert router.stats("acme")["over_budget"] == 2
+
+
+def test_transactions_are_counted_when_escalation_is_off(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        transaction_agents, "_run_agents", _fake_agents({"SQ *CAFE": 0.4}, calls)
+    )
+    router = CascadeRouter(escalation_budget=1.0)
+
+    result = process_transaction(
+        "SQ *CAFE", CLIENT_CONTEXT, use_precise_for_review=False, router=router
+    )
+
+    assert not result["precise_review_used"]
+    assert calls == [("fast", "SQ *CAFE")]
+    stats = router.stats("acme")
+    assert (stats["transactions"], stats["escalated"]) == (1, 0)
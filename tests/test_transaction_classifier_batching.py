@@ -0,0 +1,295 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import openai
+
+import pandas as pd
+import pytest
+
+from dataextractai.agents.classification_cache import ClassificationCache
+from dataextractai.agents.row_journal import RowJournal
+from dataextractai.agents.rule_engine import RuleEngine
+from dataextractai.agents.transaction_classifier import (
+    PAYEE_SCHEMA,
+    TransactionClassifier,
+    batch_schema,
+)
+from dataextractai.utils.llm_dispatcher import LLMDispatcher
+from dataextractai.utils.single_flight import SingleFlight
+
+
+class _FakeResponses:
+    """Returns queued structured outputs and records each request's prompt."""
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.prompts = []
+
+    async def create(self, **kwargs):
+        self.prompts.append(kwargs["input"][-1]["content"])
+        return SimpleNamespace(output_text=json.dumps(self.outputs.pop(0)))
+
+
+def _classifier(outputs, batch_size=10):
+    classifier = TransactionClassifier.__new__(TransactionClassifier)
+    classifier.client = SimpleNamespace(responses=_FakeResponses(outputs))
+    classifier.dispatcher = LLMDispatcher(max_concurrency=1, client=classifier.client)
+    classifier.business_context = "Business Type: Test"
+    classifier.model_type = "fast"
+    classifier.batch_size = batch_size
+    classifier.cache = ClassificationCache(":memory:")
+    classifier.payee_cache = ClassificationCache(":memory:")
+    classifier.flights = SingleFlight()
+    return classifier
+
+
+def _payee(row_id, payee, confidence="high"):
+    return {"id": row_id, "payee": payee, "confidence": confidence, "reasoning": "r"}
+
+
+def test_batch_schema_adds_required_id():
+    schema = batch_schema(PAYEE_SCHEMA)
+    item = schema["properties"]["results"]["items"]
+    assert item["required"][0] == "id"
+    assert "id" not in PAYEE_SCHEMA["properties"]
+
+
+def test_prefetch_requeues_only_failed_items():
+    """Invalid or missing items are re-sent alone; valid ones are kept."""
+    classifier = _classifier(
+        [
+            {
+                "results": [
+                    _payee(0, "Walmart"),
+                    _payee(1, "Target", confidence="very sure"),
+                ]
+            },
+            {"results": [_payee(1, "Target"), _payee(2, "Costco")]},
+        ]
+    )
+    df = pd.DataFrame({"description": ["WALMART #1", "TARGET 22", "COSTCO 9"]})
+    classifier.cache.put("costco 9", "payee", {"payee": "Costco"})
+
+    results = classifier._prefetch("payee", df, range(3))
+
+    assert {k: v.payee for k, v in results.items()} == {0: "Walmart", 1: "Target"}
+    prompts = classifier.client.responses.prompts
+    assert len(prompts) == 2
+    assert "id 0: WALMART #1" in prompts[0] and "COSTCO" not in prompts[0]
+    assert "id 1: TARGET 22" in prompts[1] and "id 0" not in prompts[1]
+
+
+def test_shared_payee_cache_spans_clients():
+    """Confident payees are shared; another client's lookup skips the LLM."""
+    first = _classifier([])
+    first._cache_result(
+        "amzn mktp us*2k1ab3",
+        "payee",
+        {"payee": "Amazon", "confidence": "high", "reasoning": "r"},
+    )
+    first._cache_result(
+        "sq *joes", "payee", {"payee": "Joe", "confidence": "low", "reasoning": "r"}
+    )
+
+    second = _classifier([])
+    second.payee_cache = first.payee_cache
+    df = pd.DataFrame({"description": ["AMZN MKTP US*7Q9ZZ1"]})
+    assert second._prefetch("payee", df, range(1)) == {}
+    assert second._get_cached_result("amzn mktp us*7q9zz1", "payee")["payee"] == (
+        "Amazon"
+    )
+    assert second.cache.contains("amzn mktp us*7q9zz1", "payee")
+    assert second._get_cached_result("sq *joes", "payee") is None
+
+
+def test_rule_matched_rows_skip_the_llm():
+    """Fields set by a rule are never sent to the model."""
+    classifier = _classifier([{"results": [_payee(1, "Corner Shop")]}])
+    engine = RuleEngine.from_specs(
+        [{"name": "adp", "pattern": r"\badp\b", "payee": "ADP"}]
+    )
+    df = pd.DataFrame({"description": ["ADP PAYROLL", "CORNER SHOP 12"]})
+    rule_matches = engine.match(df["description"])
+    rows = classifier._llm_rows("payee", rule_matches, range(2))
+
+    assert rows == [1]
+    assert classifier._rule_response("payee", rule_matches, 0).payee == "ADP"
+    assert classifier._rule_response("payee", rule_matches, 1) is None
+    assert classifier._prefetch("payee", df, rows)[1].payee == "Corner Shop"
+    assert len(classifier.client.responses.prompts) == 1
+
+
+def test_dispatcher_retries_rate_limited_calls(monkeypatch):
+    """Rate-limit errors are retried, honoring Retry-After."""
+    monkeypatch.setattr("dataextractai.utils.llm_dispatcher.BACKOFF_BASE", 0.001)
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise openai.RateLimitError(
+                "slow down", response=_rate_limited_response(), body=None
+            )
+        return "ok"
+
+    dispatcher = LLMDispatcher(
+        client=SimpleNamespace(responses=SimpleNamespace(create=create))
+    )
+    assert dispatcher.call_sync("responses.create", model="m", input="hi") == "ok"
+    assert len(calls) == 2
+    assert dispatcher.stats["rate_limited"] == 1
+    dispatcher.close()
+
+
+def _rate_limited_response():
+    return SimpleNamespace(status_code=429, headers={"retry-after": "0"}, request=None)
+
+
+class _PassResponses:
+    """Answers each request by its pass, like the model would, in any order."""
+
+    def __init__(self):
+        self.passes = []
+
+    async def create(self, **kwargs):
+        pass_type = kwargs["text"]["format"]["name"].split("_")[0]
+        self.passes.append(pass_type)
+        prompt = kwargs["input"][-1]["content"]
+        output = {"confidence": "high", "reasoning": "r"}
+        if pass_type == "payee":
+            output["payee"] = "Netflix" if "NETFLIX" in prompt else "Shell"
+        elif pass_type == "category":
+            output.update(
+                category="Subscriptions" if "Netflix" in prompt else "Fuel",
+                suggested_new_category="",
+                new_category_reasoning="",
+            )
+        else:
+            output.update(classification="business", tax_implications="")
+        return SimpleNamespace(output_text=json.dumps(output))
+
+
+def test_pipeline_classifies_rows_and_writes_pass_files(tmp_path, monkeypatch):
+    """Rows flow through all three passes and every checkpoint file is written."""
+    monkeypatch.chdir(tmp_path)
+    classifier = _classifier([], batch_size=1)
+    classifier.client = SimpleNamespace(responses=_PassResponses())
+    classifier.dispatcher = LLMDispatcher(max_concurrency=4, client=classifier.client)
+    classifier.client_name = "acme"
+    classifier.stage_workers = 3
+    classifier.rule_engine = RuleEngine.from_specs([])
+    df = pd.DataFrame({"description": ["NETFLIX.COM", "SHELL OIL 123", "NETFLIX 2"]})
+
+    result = classifier.process_transactions(df)
+
+    assert list(result["payee"]) == ["Netflix", "Shell", "Netflix"]
+    assert list(result["category"]) == ["Subscriptions", "Fuel", "Subscriptions"]
+    assert list(result["classification"]) == ["Business"] * 3
+    assert sorted(classifier.client.responses.passes).count("classification") == 3
+    output_dir = tmp_path / "data" / "clients" / "acme" / "output"
+    for suffix in ("payee_pass", "category_pass", "final"):
+        assert (output_dir / f"acme_classified_transactions_{suffix}.csv").exists()
+
+    # Resuming at pass 3 reuses the stored payees and categories
+    resumed = classifier.process_transactions(result, resume_from_pass=3)
+    assert list(resumed["category"]) == ["Subscriptions", "Fuel", "Subscriptions"]
+
+
+def test_interrupted_run_resumes_from_journal(tmp_path, monkeypatch):
+    """Row results journaled before a crash are not requested again."""
+    monkeypatch.chdir(tmp_path)
+    classifier = _classifier([], batch_size=1)
+    classifier.client = SimpleNamespace(responses=_PassResponses())
+    classifier.dispatcher = LLMDispatcher(max_concurrency=4, client=classifier.client)
+    classifier.client_name = "acme"
+    classifier.stage_workers = 2
+    classifier.rule_engine = RuleEngine.from_specs([])
+    df = pd.DataFrame({"description": ["NETFLIX.COM", "SHELL OIL 123"]})
+    journal = RowJournal(
+        classifier.journal_path(df),
+        RowJournal.fingerprint(df["description"], classifier.model_type),
+    )
+    journal.record(0, "payee", {"payee": "Netflix", "payee_confidence": "high"})
+    journal.record(0, "category", {"category": "Streaming"})
+    journal.close()
+
+    result = classifier.process_transactions(df)
+
+    assert list(result["category"]) == ["Streaming", "Fuel"]
+    assert sorted(classifier.client.responses.passes) == [
+        "category",
+        "classification",
+        "classification",
+        "payee",
+    ]
+    assert not (tmp_path / classifier.journal_path(df)).exists()
+
+
+def test_pipeline_worker_failure_is_raised_not_hung(tmp_path, monkeypatch):
+    """An error outside the LLM call stops the pipeline and reaches the caller."""
+    monkeypatch.chdir(tmp_path)
+    classifier = _classifier([], batch_size=1)
+    classifier.client = SimpleNamespace(responses=_PassResponses())
+    classifier.dispatcher = LLMDispatcher(max_concurrency=4, client=classifier.client)
+    classifier.client_name = "acme"
+    classifier.stage_workers = 2
+    classifier.rule_engine = RuleEngine.from_specs([])
+    df = pd.DataFrame({"description": ["NETFLIX.COM", "SHELL OIL 123", "UBER"]})
+    record = RowJournal.record
+
+    def failing_record(self, row_idx, pass_type, values):
+        if pass_type == "category":
+            raise OSError("disk full")
+        record(self, row_idx, pass_type, values)
+
+    monkeypatch.setattr(RowJournal, "record", failing_record)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(classifier.process_transactions, df)
+        with pytest.raises(OSError, match="disk full"):
+            future.result(timeout=30)
+    # The unfinished run keeps its journal for the next attempt
+    assert (tmp_path / classifier.journal_path(df)).exists()
+
+
+def test_duplicate_descriptions_share_one_request():
+    """Rows with the same cache key are requested once and all get the result."""
+    classifier = _classifier([{"results": [_payee(0, "Netflix"), _payee(1, "Shell")]}])
+    df = pd.DataFrame({"description": ["NETFLIX.COM", "SHELL 1", "netflix.com "]})
+
+    results = classifier._prefetch("payee", df, range(3))
+
+    assert {k: v.payee for k, v in results.items()} == {
+        0: "Netflix",
+        1: "Shell",
+        2: "Netflix",
+    }
+    assert "id 2" not in classifier.client.responses.prompts[0]
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "Netflix"
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flights.do, "netflix", slow)
+        started.wait()
+        followers = [pool.submit(flights.do, "netflix", slow) for _ in range(2)]
+        while flights.stats()["coalesced"] < 2:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in [leader] + followers]
+
+    assert results == ["Netflix"] * 3
+    assert calls == [1]
+    assert flights.stats() == {"calls": 1, "coalesced": 2}
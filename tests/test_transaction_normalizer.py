@@ -0,0 +1,184 @@
+import pandas as pd
+
+from dataextractai.utils.transaction_normalizer import TransactionNormalizer
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "transaction_date": [
+                "2024-01-05",
+                "01/06/2024",
+                "13/01/2024",
+                "Jan 7, 2024",
+                "2024-02-30",
+                "garbage",
+                None,
+                "2024-03-01",
+                "  ",
+            ],
+            "description": [
+                "SHOP",
+                "SHOP",
+                "SHOP",
+                "INTEREST CREDIT",
+                "SHOP",
+                "SHOP",
+                "INTEREST CREDIT",
+                None,
+                "SHOP",
+            ],
+            "amount": ["1.00", "$2.00", "3", "4.5", "5", "6", "7", "8", "abc"],
+            "statement_end_date": ["2024-01-31"] * 9,
+        },
+        dtype=str,
+    )
+
+
+def test_column_wise_dates_match_row_wise_normalize_date():
+    normalizer = TransactionNormalizer.__new__(TransactionNormalizer)
+    df = _frame()
+    expected = df.apply(
+        lambda row: normalizer.normalize_date(row["transaction_date"], row), axis=1
+    )
+    result = normalizer.normalize_dates(df)
+    assert result.tolist() == expected.tolist()
+
+
+def test_column_wise_validation_matches_is_valid_row():
+    normalizer = TransactionNormalizer.__new__(TransactionNormalizer)
+    df = _frame()
+    expected = [
+        normalizer._is_valid_row(row)[1] for row in df.to_dict(orient="records")
+    ]
+    assert normalizer.invalid_reasons(df).tolist() == expected
+
+
+def _write_output(output_dir, name, rows):
+    pd.DataFrame(rows, columns=["transaction_date", "description", "amount"]).to_csv(
+        output_dir / f"{name}_output.csv", index=False
+    )
+
+
+def test_incremental_run_only_normalizes_changed_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "data" / "clients" / "acme" / "output"
+    output_dir.mkdir(parents=True)
+    _write_output(
+        output_dir,
+        "bank_a",
+        [["2024-01-05", "SHOP", "1.00"], ["2024-01-06", "RENT", "-900.00"]],
+    )
+    _write_output(output_dir, "bank_b", [["2024-01-07", "COFFEE", "4.50"]])
+
+    full = TransactionNormalizer("acme").normalize_transactions()
+    ids = dict(zip(full["description"], full["transaction_id"]))
+    assert sorted(ids.values()) == [1, 2, 3]
+
+    # bank_a gains a row, bank_b is unchanged, bank_c is new
+    _write_output(
+        output_dir,
+        "bank_a",
+        [
+            ["2024-01-05", "SHOP", "1.00"],
+            ["2024-01-06", "RENT", "-900.00"],
+            ["2024-02-01", "SHOP", "2.00"],
+        ],
+    )
+    _write_output(output_dir, "bank_c", [["2024-02-03", "FUEL", "30.00"]])
+    normalizer = TransactionNormalizer("acme", incremental=True)
+    loaded = []
+    original = normalizer._normalize_file
+    monkeypatch.setattr(
+        normalizer,
+        "_normalize_file",
+        lambda file: loaded.append(file) or original(file),
+    )
+    merged = normalizer.normalize_transactions()
+
+    assert loaded == ["bank_a_output.csv", "bank_c_output.csv"]
+    assert len(merged) == 5
+    by_key = dict(
+        zip(
+            zip(merged["description"], merged["normalized_amount"]),
+            merged["transaction_id"],
+        )
+    )
+    assert by_key[("SHOP", 1.0)] == ids["SHOP"]
+    assert by_key[("RENT", -900.0)] == ids["RENT"]
+    assert by_key[("COFFEE", 4.5)] == ids["COFFEE"]
+    assert {by_key[("SHOP", 2.0)], by_key[("FUEL", 30.0)]} == {4, 5}
+    on_disk = pd.read_csv(output_dir / "acme_normalized_transactions.csv")
+    assert on_disk["transaction_id"].tolist() == merged["transaction_id"].tolist()
+
+    # Nothing changed: the consolidated file is returned as is
+    loaded.clear()
+    assert len(normalizer.normalize_transactions()) == 5
+    assert loaded == []
+
+
+def test_overlapping_statements_are_deduplicated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "data" / "clients" / "acme" / "output"
+    output_dir.mkdir(parents=True)
+    columns = [
+        "transaction_date",
+        "description",
+        "amount",
+        "file_path",
+        "account_number",
+    ]
+    pd.DataFrame(
+        [
+            ["01/05/2024", "COFFEE", "4.5", "jan.csv", "1234"],
+            ["2024-01-09", "RENT", "-900", "jan.csv", "1234"],
+            ["2024-01-10", "FUEL", "30", "jan.csv", "1234"],
+            ["2024-01-05", "COFFEE", "4.50", "jan.pdf", "1234"],
+            ["2024-01-05", "COFFEE", "4.50", "jan.pdf", "1234"],
+            ["2024-01-09", "RENT", "-900.00", "jan.pdf", "1234"],
+        ],
+        columns=columns,
+    ).to_csv(output_dir / "bank_output.csv", index=False)
+
+    normalizer = TransactionNormalizer("acme", dedup_mode="drop")
+    result = normalizer.normalize_transactions()
+    # The CSV export is seen first: the PDF repeats its coffee and rent, and only its
+    # second coffee is new
+    assert sorted(result["description"]) == ["COFFEE", "COFFEE", "FUEL", "RENT"]
+    reasons = [reason for _, reason in normalizer.problem_rows]
+    assert len(reasons) == 2
+    assert all("duplicate of a transaction in jan.csv" == r for r in reasons)
+
+    flagged = TransactionNormalizer("acme", dedup_mode="flag").normalize_transactions()
+    assert len(flagged) == 6
+    assert flagged["duplicate_of"].notna().sum() == 2
+
+
+def _write_card_charges(output_dir, accounts):
+    pd.DataFrame(
+        {
+            "date": ["2024-01-05", "2024-01-05"],
+            "merchant_name_or_transaction_description": ["NETFLIX.COM"] * 2,
+            "amount": ["-15.99", "-15.99"],
+            "file_path": ["card_1111_jan.pdf", "card_2222_jan.pdf"],
+            "account_number": accounts,
+        }
+    ).to_csv(output_dir / "chase_visa_output.csv", index=False)
+
+
+def test_same_charge_on_two_cards_is_not_dropped(tmp_path, monkeypatch):
+    """Account identity is part of the dedup key; without it rows are only flagged."""
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "data" / "clients" / "acme" / "output"
+    output_dir.mkdir(parents=True)
+
+    _write_card_charges(output_dir, [None, None])
+    normalizer = TransactionNormalizer("acme", dedup_mode="drop")
+    result = normalizer.normalize_transactions()
+    assert len(result) == 2 and normalizer.problem_rows == []
+    assert result["duplicate_of"].tolist() == [None, "card_1111_jan.pdf"]
+
+    _write_card_charges(output_dir, ["1111", "2222"])
+    result = TransactionNormalizer("acme", dedup_mode="drop").normalize_transactions()
+    assert len(result) == 2
+    assert "duplicate_of" not in result or result["duplicate_of"].isna().all()
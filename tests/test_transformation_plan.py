@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+
+from dataextractai.utils.config import TRANSFORMATION_MAPS
+from dataextractai.utils.transformation_plan import TransformationPlan, get_plan
+
+
+def _legacy_apply(transform_map, df):
+    """The row-wise loop transformation maps were evaluated with before compilation."""
+    transformed = pd.DataFrame(index=df.index)
+    for target_col, source_col in transform_map.items():
+        if callable(source_col):
+            transformed[target_col] = df.apply(source_col, axis=1)
+        elif source_col in df.columns:
+            transformed[target_col] = df[source_col]
+    return transformed
+
+
+LEGACY_FIRST_REPUBLIC = {
+    "transaction_date": lambda row: (
+        row["statement_end_date"]
+        if "INTEREST CREDIT" in str(row["description"])
+        and (pd.isna(row["transaction_date"]) or row["transaction_date"] == "")
+        else row["transaction_date"]
+    ),
+    "description": lambda x: x["description"],
+    "amount": lambda x: x["amount"],
+    "statement_end_date": lambda x: x["statement_end_date"],
+}
+
+
+def _first_republic_frame():
+    return pd.DataFrame(
+        {
+            "transaction_date": ["2024-01-05", None, "", None, "2024-01-09"],
+            "description": [
+                "SHOP",
+                "INTEREST CREDIT",
+                "INTEREST CREDIT",
+                None,
+                "INTEREST CREDIT",
+            ],
+            "amount": [1.5, 2.0, None, 4.0, 5.0],
+            "statement_end_date": ["2024-01-31"] * 5,
+            "transaction_type": ["debit"] * 5,
+            "statement_start_date": ["2024-01-01"] * 5,
+            "account_number": ["123"] * 5,
+            "file_path": ["a.pdf"] * 5,
+        }
+    )
+
+
+def test_declarative_select_matches_legacy_lambda():
+    df = _first_republic_frame()
+    plan = TransformationPlan(TRANSFORMATION_MAPS["first_republic_bank"])
+    compiled = plan.apply(df)[list(LEGACY_FIRST_REPUBLIC)]
+    legacy = _legacy_apply(LEGACY_FIRST_REPUBLIC, df)
+    pd.testing.assert_frame_equal(
+        compiled.astype(object), legacy.astype(object), check_dtype=False
+    )
+
+
+def test_constants_floats_and_callable_shim():
+    df = pd.DataFrame(
+        {
+            "merchant_name_or_transaction_description": ["A", "B", "C"],
+            "amount": pd.Series(["1.25", None, float("nan")], dtype=object),
+            "normalized_date": pd.to_datetime(["2024-01-02", None, "2024-03-04"]),
+            "date_of_transaction": ["2024-01-02", "2024-02-03", None],
+            "file_path": ["f.pdf"] * 3,
+        }
+    )
+    out = get_plan(TRANSFORMATION_MAPS["chase_checking"]).apply(df)
+    assert out["source"].tolist() == ["chase_checking"] * 3
+    assert out["transaction_type"].tolist() == ["Debit/Check"] * 3
+    assert out["amount"].iloc[:2].tolist() == [1.25, 0.0]
+    assert pd.isna(out["amount"].iloc[2])
+    # transaction_date is still a row function, run through the shim
+    assert out["transaction_date"].tolist() == [
+        "2024-01-02",
+        "2024-02-03",
+        "2024-03-04",
+    ]
+    assert "account_number" not in out.columns
+
+
+def test_missing_columns_policies_and_plan_reuse():
+    transform_map = {"description": "memo", "source": {"const": "bank"}}
+    df = pd.DataFrame({"other": [1, 2]})
+    plan = get_plan(transform_map)
+    assert get_plan(transform_map) is plan
+    assert plan.missing_columns(df) == {"description": "memo"}
+    assert list(plan.apply(df).columns) == ["source"]
+    assert plan.apply(df, missing="none")["description"].isna().all()
+    kept = plan.apply(df, missing="none", keep_columns=True)
+    assert list(kept.columns) == ["other", "description", "source"]
+    with pytest.raises(KeyError):
+        plan.apply(df, missing="raise")
+
+    optional = TransformationPlan({"account_number": {"optional": "account_number"}})
+    assert optional.apply(df, missing="raise")["account_number"].isna().all()
+    with_account = df.assign(account_number=["1111", "2222"])
+    assert optional.apply(with_account)["account_number"].tolist() == ["1111", "2222"]
+
+
+def test_date_and_sign_rules():
+    plan = TransformationPlan(
+        {
+            "transaction_date": {"date": "posted", "format": "%m/%d/%Y"},
+            "amount": {
+                "negate": "amount",
+                "when": {"contains": ["type", "debit"]},
+            },
+        }
+    )
+    df = pd.DataFrame(
+        {
+            "posted": ["2024-01-05", "not a date"],
+            "amount": ["10.5", "3"],
+            "type": ["debit", "credit"],
+        }
+    )
+    out = plan.apply(df)
+    assert out["transaction_date"].tolist() == ["01/05/2024", None]
+    assert out["amount"].tolist() == [-10.5, 3.0]
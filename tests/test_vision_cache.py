@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+from dataextractai.utils.vision_cache import VisionResponseCache
+
+
+def test_hits_require_same_image_prompt_and_model(tmp_path):
+    cache = VisionResponseCache(str(tmp_path / "vision.db"))
+    key = cache.make_key(b"crop-1", "Extract the Form_Label", "gpt-4o")
+    assert cache.get(key) is None
+    cache.put(key, "gpt-4o", {"Form_Label": "5A"})
+    assert cache.get(key) == {"Form_Label": "5A"}
+    assert key != cache.make_key(b"crop-2", "Extract the Form_Label", "gpt-4o")
+    assert key != cache.make_key(b"crop-1", "Extract the Title", "gpt-4o")
+    assert key != cache.make_key(b"crop-1", "Extract the Form_Label", "gpt-4.1")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_responses_survive_reopen(tmp_path):
+    db = str(tmp_path / "vision.db")
+    cache = VisionResponseCache(db, commit_every=100)
+    key = cache.make_key(b"crop", "p", "m")
+    cache.put(key, "m", {"Form_Label": "14A"})
+    cache.close()
+    assert VisionResponseCache(db).get(key) == {"Form_Label": "14A"}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = VisionResponseCache(str(tmp_path / "vision.db"), max_bytes=100)
+    keys = [cache.make_key(bytes([i]), "p", "m") for i in range(3)]
+    for key in keys:
+        cache.put(key, "m", {"value": "x" * 30})
+    # Touch the oldest entry so the second one is evicted instead
+    cache.get(keys[0])
+    cache.put(cache.make_key(b"new", "p", "m"), "m", {"value": "x" * 30})
+    cache.flush()
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
+
+
+def test_value_crops_differing_only_in_digits_do_not_share_an_entry(tmp_path):
+    """Near-identical renders of different amounts must never serve each other."""
+    Image = pytest.importorskip("PIL.Image")
+    ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+    def crop(text):
+        img = Image.new("L", (200, 30), 255)
+        ImageDraw.Draw(img).text((5, 8), text, fill=0)
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+
+    cache = VisionResponseCache(str(tmp_path / "vision.db"))
+    key = cache.make_key(crop("$12,345.00"), "Extract the Value", "gpt-4o")
+    cache.put(key, "gpt-4o", {"Value": "12345.00"})
+    other = cache.make_key(crop("$98,761.00"), "Extract the Value", "gpt-4o")
+    assert other != key
+    assert cache.get(other) is None